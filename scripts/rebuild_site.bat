@@ -19,13 +19,10 @@ echo ================================================== >> "%LOGFILE%"
 
 call .venv\Scripts\activate.bat
 
-REM Paso 1: Extraer epicas de Jira
-echo [%date% %time%] Extrayendo epicas de Jira... >> "%LOGFILE%"
-python src/extract_epics.py >> "%LOGFILE%" 2>&1
-
-REM Paso 1b: Extraer todos los issues de Jira
-echo [%date% %time%] Extrayendo todos los issues... >> "%LOGFILE%"
-python src/extract_all_issues.py >> "%LOGFILE%" 2>&1
+REM Paso 1: Extraer epicas e issues de Jira en un solo crawl
+REM (delta desde la ultima sync)
+echo [%date% %time%] Extrayendo epicas e issues de Jira... >> "%LOGFILE%"
+python src/extract.py --incremental >> "%LOGFILE%" 2>&1
 
 if %ERRORLEVEL% NEQ 0 (
     echo [%date% %time%] ERROR en extraccion de Jira, codigo %ERRORLEVEL% >> "%LOGFILE%"
@@ -0,0 +1,204 @@
+"""Publicación de archivos en docs/.
+
+``SiteWriter`` escribe cada archivo del sitio:
+
+- con el hash del contenido en el nombre si se pide (``dashboard.3f2a1b9c0d.js``),
+  así se puede cachear indefinidamente y un cambio siempre cambia la URL;
+- junto a sus variantes ``.gz`` y ``.br`` (brotli sólo si está instalado);
+- sólo si el contenido cambió: lo idéntico no se toca, para que el commit de
+  rebuild_site.bat no arrastre archivos sin cambios.
+
+Al final ``prune()`` borra las versiones anteriores de los assets con hash.
+``add_stream()`` publica texto que llega por partes (``template.generate()``)
+sin armarlo entero en memoria.
+"""
+
+import filecmp
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+from collections.abc import Iterable
+from contextlib import ExitStack
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # opcional: sin brotli sólo se generan los .gz
+    brotli = None
+
+HASH_LENGTH = 10
+STREAM_BUFFER = 1 << 16  # bytes acumulados antes de escribir/comprimir
+# Sólo se borran archivos con estas extensiones que el build ya no produce
+PRUNE_SUFFIXES = {".js", ".json", ".gz", ".br"}
+_HASHED = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}(\.|$)")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name: str, data: bytes) -> str:
+    """'data/scm.json' -> 'data/scm.<hash>.json'"""
+    stem, dot, suffix = name.rpartition(".")
+    return f"{stem}.{content_hash(data)}.{suffix}" if dot else f"{name}.{content_hash(data)}"
+
+
+def is_hashed(name: str) -> bool:
+    """True si ``name`` salió de ``hashed_name`` (se puede cachear para siempre)."""
+    return _HASHED.search(name) is not None
+
+
+_VARIANT_EXTS = (".gz", ".br") if brotli is not None else (".gz",)
+
+
+def compressed_variants(data: bytes) -> dict[str, bytes]:
+    """Variantes precomprimidas (deterministas: gzip sin mtime)."""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Escribe ``data`` de forma atómica salvo que ``path`` ya lo contenga."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp crea el archivo con 0600
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+def _replace_if_changed(tmp: Path, path: Path) -> bool:
+    """Mueve ``tmp`` a ``path`` salvo que tengan el mismo contenido."""
+    if path.exists() and filecmp.cmp(tmp, path, shallow=False):
+        os.unlink(tmp)
+        return False
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+    return True
+
+
+class _StreamTarget:
+    """Archivo temporal junto a ``path`` con su compresor (o ninguno)."""
+
+    def __init__(self, path: Path, ext: str, stack: ExitStack) -> None:
+        self.path = path.with_name(path.name + ext)
+        fd, tmp = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", suffix=".tmp", dir=path.parent,
+        )
+        self.tmp = Path(tmp)
+        stack.callback(self.tmp.unlink, missing_ok=True)
+        self.fh = stack.enter_context(os.fdopen(fd, "wb"))
+        self._gzip = self._brotli = None
+        if ext == ".gz":
+            self._gzip = stack.enter_context(gzip.GzipFile(
+                filename="", mode="wb", fileobj=self.fh, compresslevel=9, mtime=0,
+            ))
+        elif ext == ".br":
+            self._brotli = brotli.Compressor(quality=11)
+
+    def write(self, data: bytes) -> None:
+        if self._gzip:
+            self._gzip.write(data)
+        elif self._brotli:
+            self.fh.write(self._brotli.process(data))
+        else:
+            self.fh.write(data)
+
+    def close(self) -> None:
+        if self._gzip:
+            self._gzip.close()
+        elif self._brotli:
+            self.fh.write(self._brotli.finish())
+        self.fh.close()
+
+
+class SiteWriter:
+    """Escribe archivos del sitio y recuerda cuáles forman parte del build."""
+
+    def __init__(self, site_dir: Path) -> None:
+        self.site_dir = site_dir
+        self.outputs: set[Path] = set()
+        self.written: list[Path] = []
+
+    def add(self, name: str, data: bytes, hashed: bool = False) -> str:
+        """Publica ``data`` como ``name`` (relativo a docs/); retorna el nombre final."""
+        if hashed:
+            name = hashed_name(name, data)
+        path = self.site_dir / name
+        variants = [path.with_name(path.name + ext) for ext in _VARIANT_EXTS]
+        if hashed and all(p.exists() for p in [path, *variants]):
+            # Ya publicado con este contenido: no hace falta ni comprimir
+            self.outputs.update([path, *variants])
+            return name
+        files = {path: data}
+        files.update({
+            path.with_name(path.name + ext): blob
+            for ext, blob in compressed_variants(data).items()
+        })
+        for target, blob in files.items():
+            self.outputs.add(target)
+            # Un nombre con hash ya existente tiene, por definición, el mismo contenido
+            if hashed and target.exists():
+                continue
+            if write_if_changed(target, blob):
+                self.written.append(target)
+        return name
+
+    def add_stream(self, name: str, chunks: Iterable[str]) -> str:
+        """Como ``add`` (sin hash) para texto UTF-8 que llega por partes.
+
+        El contenido y sus variantes comprimidas se escriben a la vez en
+        archivos temporales que reemplazan a los publicados sólo si cambiaron.
+        """
+        path = self.site_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        exts = ["", *_VARIANT_EXTS]
+        with ExitStack() as stack:
+            targets = [_StreamTarget(path, ext, stack) for ext in exts]
+            buffer, size = [], 0
+            for chunk in chunks:
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= STREAM_BUFFER:
+                    data = "".join(buffer).encode("utf-8")
+                    for target in targets:
+                        target.write(data)
+                    buffer, size = [], 0
+            data = "".join(buffer).encode("utf-8")
+            for target in targets:
+                target.write(data)
+                target.close()
+                self.outputs.add(target.path)
+                if _replace_if_changed(target.tmp, target.path):
+                    self.written.append(target.path)
+        return name
+
+    def prune(self) -> list[Path]:
+        """Borra assets de builds anteriores (hashes viejos, dominios que ya no existen)."""
+        removed = []
+        for path in self.site_dir.rglob("*"):
+            if (
+                path.is_file()
+                and path.suffix in PRUNE_SUFFIXES
+                and path not in self.outputs
+            ):
+                path.unlink()
+                removed.append(path)
+        return removed
+
+    def size(self, name: str) -> int:
+        return (self.site_dir / name).stat().st_size
@@ -0,0 +1,145 @@
+"""Benchmark de extracción contra el Jira local de mock_jira.py.
+
+Levanta el servidor en este mismo proceso y, para cada cantidad de workers,
+corre ``fetch_all_issues``, ``fetch_all_epics`` y el crawl único de
+extract.py (``crawl``) con un ``JiraClient`` que apunta a él. Reporta
+issues/s, MB/s (cuerpo JSON, lo que cuenta JiraClient, y lo que viajó
+comprimido por la red), peticiones y reintentos. Sirve para ver el efecto de la concurrencia, del límite de
+página y de los 429/503 sin depender de la red ni del Jira real.
+
+El resultado va a reports/benchmark_extract.json.
+
+Uso:
+    python src/bench_extract.py                                  # 10k issues, 1/4/8 workers
+    python src/bench_extract.py --issues 50000 --latency 80 --workers 1 8 16
+    python src/bench_extract.py --error-rate 0.05 --retry-after 0
+    python src/bench_extract.py --dataset crawl --no-description
+"""
+
+import argparse
+import io
+import json
+import socket
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+import extract
+import mock_jira
+from extract_all_issues import fetch_all_issues
+from extract_epics import fetch_all_epics
+from jira_client import JiraClient
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = ROOT / "reports" / "benchmark_extract.json"
+
+
+def _crawl(client: JiraClient, description: bool) -> list[dict]:
+    """Lo que pide extract.py en una extracción completa."""
+    if description:
+        extract.epic_descriptions(client)
+    return client.search_all(extract.JQL, extract.FIELDS, label="issues")
+
+
+FETCHERS = {
+    "crawl": _crawl,
+    "epics": fetch_all_epics,
+    "issues": lambda client, description: fetch_all_issues(client),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure(
+    jira: mock_jira.MockJira, base_url: str, dataset: str, workers: int,
+    description: bool = True,
+) -> dict:
+    """Corre un fetcher completo y retorna sus métricas."""
+    client = JiraClient({"JIRA_URL": base_url, "JIRA_COOKIE": "mock"}, workers=workers)
+    sent_before = jira.bytes_sent
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):  # sin el "Fetched x/y" de cada página
+        issues = FETCHERS[dataset](client, description)
+    elapsed = time.perf_counter() - start
+    wire = jira.bytes_sent - sent_before
+    return {
+        "dataset": dataset,
+        "workers": workers,
+        "issues": len(issues),
+        "seconds": round(elapsed, 3),
+        "requests": client.requests,
+        "retries": client.retries,
+        "issues_per_s": round(len(issues) / elapsed, 1),
+        "json_mb_per_s": round(client.bytes / elapsed / 2**20, 2),
+        "wire_mb_per_s": round(wire / elapsed / 2**20, 2),
+        "json_mb": round(client.bytes / 2**20, 2),
+        "wire_mb": round(wire / 2**20, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de extracción contra un Jira local")
+    mock_jira.add_server_args(parser)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument(
+        "--dataset", choices=sorted(FETCHERS), nargs="+", default=["epics", "issues"],
+    )
+    parser.add_argument(
+        "--no-description", dest="description", action="store_false",
+        help="no pedir description (como los extractores con --no-description)",
+    )
+    parser.add_argument("--out", type=Path, default=REPORT_PATH)
+    args = parser.parse_args()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"Generando {args.issues:,} issues sintéticos...")
+    jira = mock_jira.from_args(args, base_url)
+    server = mock_jira.serve(jira, port=port)
+
+    print(
+        f"Mock Jira en {base_url}: latencia {args.latency:g} ms, "
+        f"maxResults <= {args.max_results}, errores {args.error_rate:.0%}"
+    )
+    print(
+        f"  {'dataset':<8} {'workers':>7}  {'issues':>8}  {'s':>7}  {'issues/s':>9}"
+        f"  {'JSON MB/s':>9}  {'red MB/s':>8}  {'pet.':>5}  {'reint.':>6}"
+    )
+    results = []
+    try:
+        for dataset in args.dataset:
+            for workers in args.workers:
+                r = measure(jira, base_url, dataset, workers, args.description)
+                results.append(r)
+                print(
+                    f"  {dataset:<8} {workers:>7}  {r['issues']:>8,}  {r['seconds']:>7.2f}"
+                    f"  {r['issues_per_s']:>9,.0f}  {r['json_mb_per_s']:>9.2f}"
+                    f"  {r['wire_mb_per_s']:>8.2f}  {r['requests']:>5}  {r['retries']:>6}",
+                    flush=True,
+                )
+    finally:
+        server.shutdown()
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "server": {
+            "issues": len(jira.issues), "latency_ms": args.latency,
+            "max_results": args.max_results, "error_rate": args.error_rate,
+            "retry_after": args.retry_after,
+        },
+        "description": args.description,
+        "runs": results,
+    }, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nOK {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Benchmark del build sobre datos sintéticos (ver synthetic.py).
+
+Para cada escenario (cantidad de issues × cantidad de dominios):
+
+1. arma un árbol temporal con una copia de src/ y templates/ y genera ahí
+   data/epics.json y data/all_issues.json;
+2. corre ``build.py --force`` en ese árbol, en un proceso aparte (así la
+   memoria de un escenario no contamina al siguiente y data/, docs/ y
+   .build_cache/ del repo no se tocan);
+3. junta el tiempo de cada etapa de reports/build_profile.json, el RSS
+   máximo del proceso, la memoria pico de tracemalloc (con ``--memory``) y
+   el tamaño de lo publicado en docs/.
+
+El resultado se acumula en reports/benchmark.json (un escenario se
+reemplaza al volver a medirlo con el mismo motor y workers) y la tabla
+muestra la variación de tiempo respecto de la medición anterior.
+
+Uso:
+    python src/benchmark.py                          # 10k/100k/1M × 5/25/100
+    python src/benchmark.py --issues 10000 --domains 5 25
+    python src/benchmark.py --engine pandas --workers 4 --memory
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import synthetic
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORT_PATH = ROOT / "reports" / "benchmark.json"
+
+DEFAULT_ISSUES = [10_000, 100_000, 1_000_000]
+DEFAULT_DOMAINS = [5, 25, 100]
+# Etapas de primer nivel que se muestran en la tabla
+TABLE_STAGES = ["metrics", "payloads", "render"]
+
+
+def _dir_bytes(path: Path, pattern: str) -> int:
+    return sum(f.stat().st_size for f in path.glob(pattern) if f.is_file())
+
+
+def _prepare_tree(root: Path) -> None:
+    ignore = shutil.ignore_patterns("__pycache__")
+    shutil.copytree(ROOT / "src", root / "src", ignore=ignore)
+    shutil.copytree(ROOT / "templates", root / "templates", ignore=ignore)
+
+
+def run_scenario(
+    n_issues: int, n_domains: int, args: argparse.Namespace,
+) -> dict:
+    """Genera los datos, corre el build y retorna las mediciones del escenario."""
+    root = Path(tempfile.mkdtemp(prefix="camdp-bench-"))
+    try:
+        _prepare_tree(root)
+        start = time.perf_counter()
+        counts = synthetic.write_dataset(root / "data", n_issues, n_domains, args.seed)
+        generate_s = time.perf_counter() - start
+
+        cmd = [
+            sys.executable, str(root / "src" / "build.py"), "--force",
+            "--engine", args.engine, "--workers", str(args.workers),
+        ]
+        if not args.memory:
+            cmd.append("--no-memory")
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(
+                f"build.py falló ({n_issues} issues, {n_domains} dominios):\n"
+                f"{proc.stdout}\n{proc.stderr}"
+            )
+
+        profile = json.loads(
+            (root / "reports" / "build_profile.json").read_text(encoding="utf-8")
+        )
+        docs = root / "docs"
+        result = {
+            "issues": n_issues,
+            "domains": n_domains,
+            "engine": args.engine,
+            "workers": args.workers,
+            "seed": args.seed,
+            "epics": counts["epics"],
+            "input_mb": round(_dir_bytes(root / "data", "*.json") / 2**20, 1),
+            "generate_s": round(generate_s, 2),
+            "process_s": round(elapsed, 2),
+            "wall_s": profile["wall_s"],
+            "max_rss_mb": profile.get("max_rss_mb"),
+            "stages": {
+                s["name"]: {k: s[k] for k in ("wall_s", "cpu_s", "peak_mb") if k in s}
+                for s in profile["stages"]
+            },
+            "output": {
+                "index_html": _dir_bytes(docs, "index.html"),
+                "data_json": _dir_bytes(docs / "data", "*.json"),
+                "data_gz": _dir_bytes(docs / "data", "*.json.gz"),
+            },
+        }
+        if "peak_mb" in profile:
+            result["peak_mb"] = profile["peak_mb"]
+        return result
+    finally:
+        if args.keep:
+            print(f"   árbol conservado en {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def _scenario_id(r: dict) -> tuple:
+    return r["issues"], r["domains"], r["engine"], r["workers"]
+
+
+def load_previous(path: Path = REPORT_PATH) -> dict[tuple, dict]:
+    try:
+        report = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return {_scenario_id(r): r for r in report.get("scenarios", [])}
+
+
+def format_row(r: dict, previous: dict | None) -> str:
+    stages = "".join(
+        f"  {r['stages'].get(name, {}).get('wall_s', 0):>9.2f}" for name in TABLE_STAGES
+    )
+    rss = f"{r['max_rss_mb']:>8.0f}" if r["max_rss_mb"] is not None else f"{'-':>8}"
+    out_mb = r["output"]["data_json"] / 2**20
+    delta = ""
+    if previous:
+        pct = (r["wall_s"] - previous["wall_s"]) / previous["wall_s"] * 100
+        delta = f"  ({pct:+.0f}% vs anterior)"
+    return (
+        f"  {r['issues']:>9,} {r['domains']:>5}  {r['wall_s']:>8.2f}{stages}"
+        f"  {rss}  {out_mb:>8.1f}{delta}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del build con datos sintéticos")
+    parser.add_argument("--issues", type=int, nargs="+", default=DEFAULT_ISSUES)
+    parser.add_argument("--domains", type=int, nargs="+", default=DEFAULT_DOMAINS)
+    parser.add_argument("--engine", choices=["python", "pandas"], default="python")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--memory", action="store_true",
+        help="medir memoria pico por etapa con tracemalloc (mucho más lento)",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="no borrar los árboles temporales",
+    )
+    parser.add_argument("--out", type=Path, default=REPORT_PATH)
+    args = parser.parse_args()
+
+    previous = load_previous(args.out)
+    header = "".join(f"  {name:>9}" for name in TABLE_STAGES)
+    print(f"Benchmark del build (motor {args.engine}, {args.workers} workers; tiempos en s)")
+    print(f"  {'issues':>9} {'dom.':>5}  {'total':>8}{header}  {'RSS MB':>8}  {'data MB':>8}")
+
+    results = []
+    for n_issues in args.issues:
+        for n_domains in args.domains:
+            r = run_scenario(n_issues, n_domains, args)
+            results.append(r)
+            print(format_row(r, previous.get(_scenario_id(r))), flush=True)
+
+    merged = previous | {_scenario_id(r): r for r in results}
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "scenarios": sorted(merged.values(), key=_scenario_id),
+    }, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nOK {args.out}")
+
+
+if __name__ == "__main__":
+    main()
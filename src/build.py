@@ -1,44 +1,281 @@
 """Genera el sitio estático en docs/.
 
-Renderiza index.html con Jinja2 y copia assets.
+Renderiza index.html con Jinja2 (en streaming, ver templating.py) y publica assets. index.html es sólo el
+esqueleto (cabecera, pestañas y la vista General); los issues, el Gantt de
+cada pestaña y el HTML de cada dominio van en docs/data/ (ver payload.py) y
+dashboard.js los pide al abrir la pestaña; el índice de los buscadores
+(search_index.py) lo pide con la primera búsqueda. dashboard.js y los datos
+llevan el hash del contenido en el nombre y todo se publica con variantes
+.gz/.br sin reescribir lo que no cambió (ver assets.py).
+
+Cada ejecución deja en reports/build_profile.json el tiempo de reloj, CPU y
+memoria pico de cada etapa (y de cada dominio dentro de las métricas, también
+con ``--workers``). Si el sitio estaba al día el perfil sólo tiene la huella
+y ``"skipped": "fresh"``.
+
+Con ``--workers N`` las métricas de cada dominio (motor Python) y el HTML de
+cada pestaña de dominio se calculan en un pool de N procesos; el sitio
+generado es idéntico byte a byte al del modo secuencial.
+
+Los procesos de larga vida (build_daemon.py) pasan un ``MetricsMemo``: si
+desde el build anterior sólo cambiaron plantillas, se reutiliza el contexto
+de métricas sin volver a leer los datos.
+
+Uso:
+    python src/build.py                   # motor de métricas Python
+    python src/build.py --engine pandas   # motor vectorizado (metrics_pandas)
+    python src/build.py --cprofile        # además reports/build_profile.prof
+    python src/build.py --no-memory       # sin tracemalloc (más rápido)
+    python src/build.py --force           # aunque nada haya cambiado
+    python src/build.py --workers 0       # un proceso por núcleo
+    python src/build.py --compile-templates   # precompila las plantillas y sale
 """
 
-import shutil
+import argparse
+import multiprocessing
+import os
+import sys
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import date, datetime
 from pathlib import Path
 
-from jinja2 import Environment, FileSystemLoader
-
-from metrics import compute_all_metrics
+import build_cache
+import metrics
+import search_index
+import templating
+from assets import SiteWriter
+from payload import tab_payloads, to_bytes
+from profiling import BuildProfile, stage
 
 ROOT = Path(__file__).resolve().parent.parent
 TEMPLATE_DIR = ROOT / "templates"
 SITE_DIR = ROOT / "docs"
+DATA_DIR = SITE_DIR / "data"
+# "pandas" (metrics_pandas) se importa al usarlo: pandas/pyarrow tardan en cargar
+ENGINES = ("python", "pandas")
+
+
+class MetricsMemo:
+    """Contexto de métricas del último build, para reutilizarlo en memoria.
+
+    Se indexa por motor y ``build_cache.data_fingerprint()`` (datos, filtros
+    y fecha de hoy): cambios en plantillas o assets no lo invalidan. Guarda
+    también lo que se deriva del contexto (los payloads ya serializados),
+    que se descarta cuando cambia el contexto.
+    """
+
+    def __init__(self) -> None:
+        self._key: tuple[str, str] | None = None
+        self._ctx: dict | None = None
+        self._derived: dict[str, tuple[object, object]] = {}
+
+    def get(self, key: tuple[str, str]) -> dict | None:
+        if key != self._key:
+            return None
+        return dict(self._ctx, generated_at=datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+    def put(self, key: tuple[str, str], ctx: dict) -> None:
+        self._key, self._ctx = key, ctx
+        self._derived = {}
+
+    def derived(self, name: str, key: object, compute: Callable[[], object]) -> object:
+        """``compute()`` sobre el contexto guardado, reutilizado mientras ``key`` no cambie."""
+        hit = self._derived.get(name)
+        if hit is None or hit[0] != key:
+            hit = self._derived[name] = (key, compute())
+        return hit[1]
+
+
+def build(
+    engine: str = "python",
+    memory: bool = True,
+    cprofile: bool = False,
+    force: bool = False,
+    workers: int = 1,
+    memo: MetricsMemo | None = None,
+) -> None:
+    """Renderiza index.html y copia assets al directorio docs/.
+
+    Si las entradas no cambiaron desde el último build (ver build_cache.py)
+    no hace nada, salvo con ``force``. ``workers`` > 1 reparte los dominios
+    en un pool de procesos (0 = uno por núcleo). Con ``memo`` se reutilizan
+    las métricas del build anterior si los datos no cambiaron.
+    """
+    # metrics.TODAY se fija al importar; un proceso que sigue vivo al día
+    # siguiente debe calcular cycle/lead time y el Gantt con la fecha nueva
+    metrics.TODAY = date.today()
+    with BuildProfile(memory=memory, cprofile=cprofile) as profile:
+        with stage("fingerprint"):
+            fp = build_cache.fingerprint()
+        fresh = not force and build_cache.is_fresh(fp, SITE_DIR)
+        if not fresh:
+            _build(engine, fp, workers or os.cpu_count() or 1, memo)
+
+    if fresh:
+        # El perfil se escribe igual: queda el tiempo de la huella
+        profile.write(engine=engine, skipped="fresh")
+        print("Sin cambios en datos, plantillas ni código: el sitio está al día.")
+        return
+
+    print("\nPerfil del build:")
+    print(profile.summary())
+    print(f"   total: {profile.wall_s:.2f} s")
+    print(f"   {profile.write(engine=engine)}")
+    prof_path = profile.dump_cprofile()
+    if prof_path:
+        print(f"   {prof_path} (python -m pstats {prof_path.name})")
+    print(f"\nOK Sitio generado en {SITE_DIR}")
+    html_bytes = (SITE_DIR / "index.html").stat().st_size
+    data_bytes = sum(f.stat().st_size for f in DATA_DIR.glob("*.json"))
+    print(f"   index.html: {html_bytes:,} bytes (+ data/: {data_bytes:,} bytes, sin comprimir)")
+
+
+def _render_domain_tab(dom: dict) -> str:
+    """HTML de la pestaña de un dominio (se ejecuta también en los workers)."""
+    return templating.environment().get_template("_domain_tab.html").render(dom=dom)
+
+
+def _warm_up() -> None:
+    templating.environment().get_template("_domain_tab.html")
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor | nullcontext:
+    if workers <= 1:
+        return nullcontext()
+    # spawn en todas las plataformas: igual que en Windows, y los workers no
+    # heredan el tracemalloc ni el perfil del proceso principal
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    # Arranca los workers ya (importan metrics y cargan la plantilla) mientras
+    # el proceso principal lee y enriquece los datos
+    for _ in range(workers):
+        pool.submit(_warm_up)
+    return pool
+
+
+def _build(engine: str, fp: str, workers: int, memo: MetricsMemo | None = None) -> None:
+    with _process_pool(workers) as pool:
+        return _build_site(engine, fp, pool, workers, memo)
 
 
-def build() -> None:
-    """Renderiza index.html y copia assets al directorio docs/."""
-    print("Calculando metricas...")
-    ctx = compute_all_metrics()
+def _compute_metrics(engine: str, pool: ProcessPoolExecutor | None) -> dict:
+    if engine == "python":
+        return metrics.compute_all_metrics(pool)
+    # El motor pandas ya agrega por columnas en un solo proceso
+    import metrics_pandas
+
+    return metrics_pandas.compute_all_metrics()
+
+
+def _payloads(ctx: dict, domain_html: dict[str, str]) -> dict[str, bytes]:
+    """Archivos de docs/data/ ya serializados, por nombre."""
+    payloads = tab_payloads(ctx, domain_html)
+    with stage("search_index"):
+        payloads["search"] = search_index.build_index(ctx)
+    return {name: to_bytes(payload) for name, payload in payloads.items()}
+
+
+def _build_site(
+    engine: str, fp: str, pool: ProcessPoolExecutor | None, workers: int,
+    memo: MetricsMemo | None = None,
+) -> None:
+    key = (engine, build_cache.data_fingerprint()) if memo else None
+    ctx = memo.get(key) if memo else None
+    if ctx is not None:
+        print("Métricas en memoria: los datos no cambiaron desde el último build")
+    else:
+        mode = f", {workers} procesos" if pool else ""
+        print(f"Calculando metricas (motor {engine}{mode})...")
+        with stage("metrics"):
+            ctx = _compute_metrics(engine, pool)
+        if memo:
+            memo.put(key, ctx)
 
     print(f"  {ctx['total_epics']} epicas filtradas de {ctx['total_raw']} totales")
     print(f"  {len(ctx['active_epics'])} en progreso, {len(ctx['blocked_epics'])} bloqueadas")
     print(f"  {ctx['total_all_issues']} issues totales, {len(ctx['domains'])} dominios")
 
-    env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)), autoescape=True)
-    template = env.get_template("index.html")
-    html = template.render(**ctx)
+    site = SiteWriter(SITE_DIR)
+    env = templating.environment()
 
-    SITE_DIR.mkdir(exist_ok=True)
-    output = SITE_DIR / "index.html"
-    output.write_text(html, encoding="utf-8")
+    with stage("payloads"):
+        fragments = build_cache.FragmentCache(TEMPLATE_DIR / "_domain_tab.html")
+        if memo:
+            digests = memo.derived(
+                "digests", None, lambda: build_cache.context_digests(ctx["domains"]),
+            )
+            domain_html = fragments.render_all(
+                ctx["domains"], _render_domain_tab, pool, digests,
+            )
+            # Con el mismo contexto sólo puede haber cambiado el HTML de dominios
+            payloads = memo.derived(
+                "payloads", domain_html, lambda: _payloads(ctx, domain_html),
+            )
+        else:
+            domain_html = fragments.render_all(ctx["domains"], _render_domain_tab, pool)
+            payloads = _payloads(ctx, domain_html)
+        data_files = {
+            name: site.add(f"data/{name}.json", data, hashed=True)
+            for name, data in payloads.items()
+        }
 
-    # Copy JS assets
-    for js_file in TEMPLATE_DIR.glob("*.js"):
-        shutil.copy2(js_file, SITE_DIR / js_file.name)
+    with stage("assets"):
+        assets = {
+            js_file.name: site.add(js_file.name, js_file.read_bytes(), hashed=True)
+            for js_file in sorted(TEMPLATE_DIR.glob("*.js"))
+        }
 
-    print(f"\nOK Sitio generado en {SITE_DIR}")
-    print(f"   index.html: {len(html):,} bytes")
+    with stage("render"):
+        template = env.get_template("index.html")
+        site.add_stream(
+            "index.html", template.generate(**ctx, assets=assets, data_files=data_files),
+        )
+
+    with stage("write"):
+        removed = site.prune()
+
+    fragments.save()
+    build_cache.save_state(fp, SITE_DIR, site.outputs)
+    print(f"  {fragments.misses} dominios renderizados, {fragments.hits} desde caché")
+    print(f"  {len(site.written)} archivos escritos, {len(removed)} obsoletos borrados")
 
 
 if __name__ == "__main__":
-    build()
+    parser = argparse.ArgumentParser(description="Genera el sitio en docs/")
+    parser.add_argument(
+        "--engine", choices=sorted(ENGINES), default="python",
+        help="motor de métricas (ambos producen el mismo resultado)",
+    )
+    parser.add_argument(
+        "--no-memory", dest="memory", action="store_false",
+        help="no medir memoria pico con tracemalloc",
+    )
+    parser.add_argument(
+        "--cprofile", action="store_true",
+        help="guardar un perfil cProfile en reports/build_profile.prof",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="reconstruir aunque las entradas no hayan cambiado",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("BUILD_WORKERS") or 1),
+        help="procesos para métricas y render por dominio (1 = secuencial, 0 = uno por núcleo)",
+    )
+    parser.add_argument(
+        "--compile-templates", action="store_true",
+        help="precompilar las plantillas en .build_cache/compiled/ y salir",
+    )
+    args = parser.parse_args()
+    if args.compile_templates:
+        print(f"OK Plantillas precompiladas en {templating.compile_templates()}")
+        raise SystemExit
+    try:
+        with build_cache.build_lock(wait=False):
+            build(
+                args.engine, memory=args.memory, cprofile=args.cprofile,
+                force=args.force, workers=args.workers,
+            )
+    except build_cache.BuildLocked:
+        sys.exit("ERROR: hay otro build o extracción en curso (build_daemon.py, scheduler.py...)")
@@ -0,0 +1,270 @@
+"""Caché del build: huella de las entradas y fragmentos HTML por dominio.
+
+``fingerprint()`` resume en un hash todo lo que determina el sitio: los datos
+(JSON o almacén SQLite), las plantillas, el código de métricas/build, las
+constantes de filtro de metrics.py y la fecha de hoy (cycle/lead time y el
+Gantt dependen de ella). Si coincide con la del último build y los archivos
+publicados siguen en docs/, build.py no hace nada.
+
+Si algo cambió, cada dominio se vuelve a renderizar sólo si cambió su
+contexto; si no, se reutiliza el HTML guardado en .build_cache/.
+
+``build_lock()`` es el lock entre procesos que impide correr dos builds (o
+una extracción y un build) a la vez: lo toman build.py, extract.py,
+scheduler.py y build_daemon.py.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from pathlib import Path
+
+import metrics
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT / "src"
+DATA_DIR = ROOT / "data"
+TEMPLATE_DIR = ROOT / "templates"
+CACHE_DIR = ROOT / ".build_cache"
+STATE_PATH = CACHE_DIR / "state.json"
+FRAGMENTS_PATH = CACHE_DIR / "fragments.json"
+LOCK_PATH = CACHE_DIR / "build.lock"
+CACHE_VERSION = 1
+
+DATA_INPUTS = (
+    "epics.json", "all_issues.json", "camdp.db", "camdp.db-wal",
+    # Snapshot Parquet: lo lee el motor pandas (metrics_pandas.load_issues)
+    "issues.parquet", "issues_tags.parquet", "epics.parquet", "epics_tags.parquet",
+)
+# Además de lo que importa build.py (ver code_inputs): define qué campos
+# trae la extracción y, con eso, los datos que carga el build
+EXTRA_CODE_INPUTS = ("profiles.py",)
+
+
+# (ruta, mtime_ns, tamaño) -> sha256 del contenido. En un proceso de larga
+# vida (build_daemon.py) sólo se vuelven a leer los archivos que cambiaron.
+_DIGESTS: dict[tuple[str, int, int], str] = {}
+
+
+def _file_digest(path: Path) -> str:
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if key not in _DIGESTS:
+        h = hashlib.sha256()
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        _DIGESTS[key] = h.hexdigest()
+    return _DIGESTS[key]
+
+
+def _hash_file(h, path: Path) -> None:
+    h.update(path.name.encode())
+    h.update(_file_digest(path).encode())
+
+
+def code_inputs() -> list[str]:
+    """build.py y los módulos de src/ que importa, directa o indirectamente.
+
+    Se leen los ``import`` de cada archivo (sin ejecutarlo), así que un módulo
+    nuevo del build entra solo en la huella.
+    """
+    pending, seen = ["build.py", *EXTRA_CODE_INPUTS], set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        tree = ast.parse((SRC_DIR / name).read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                modules = [node.module]
+            else:
+                continue
+            for module in modules:
+                path = SRC_DIR / f"{module.partition('.')[0]}.py"
+                if path.exists():
+                    pending.append(path.name)
+    return sorted(seen)
+
+
+def data_fingerprint() -> str:
+    """Hash de lo que determina el contexto de métricas: datos, filtros y fecha."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for name in DATA_INPUTS:
+        if (DATA_DIR / name).exists():
+            _hash_file(h, DATA_DIR / name)
+    h.update(json.dumps([
+        metrics.CUTOFF_DATE,
+        metrics.ISSUES_UPDATED_SINCE,
+        metrics.TODAY.isoformat(),
+    ]).encode())
+    return h.hexdigest()
+
+
+def fingerprint() -> str:
+    """Hash de las entradas del build (ver docstring del módulo)."""
+    h = hashlib.sha256(data_fingerprint().encode())
+    for path in sorted(TEMPLATE_DIR.iterdir()):
+        if path.is_file():
+            _hash_file(h, path)
+    for name in code_inputs():
+        _hash_file(h, SRC_DIR / name)
+    return h.hexdigest()
+
+
+class BuildLocked(RuntimeError):
+    """Otro proceso tiene tomado el lock del build."""
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(fh, wait: bool) -> None:
+        fh.seek(0)
+        while True:
+            try:
+                msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                if not wait:
+                    raise BuildLocked(f"{LOCK_PATH} está tomado") from None
+                time.sleep(1)
+
+    def _unlock(fh) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock(fh, wait: bool) -> None:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+        except BlockingIOError:
+            raise BuildLocked(f"{LOCK_PATH} está tomado") from None
+
+    def _unlock(fh) -> None:
+        fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+@contextmanager
+def build_lock(wait: bool = True) -> Iterator[None]:
+    """Lock exclusivo entre procesos sobre .build_cache/build.lock.
+
+    Es un lock del sistema operativo: si el proceso muere se libera solo, sin
+    archivos huérfanos. Con ``wait=False`` lanza BuildLocked en vez de esperar.
+    No es reentrante: quien lo tiene no debe volver a pedirlo.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with LOCK_PATH.open("a+b") as fh:
+        _lock(fh, wait)
+        try:
+            yield
+        finally:
+            _unlock(fh)
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return data if data.get("version") == CACHE_VERSION else {}
+
+
+def is_fresh(fp: str, site_dir: Path) -> bool:
+    """True si el último build tuvo la misma huella y sus salidas siguen ahí."""
+    state = _read_json(STATE_PATH)
+    if state.get("fingerprint") != fp:
+        return False
+    return all((site_dir / name).exists() for name in state.get("outputs", []))
+
+
+def last_fingerprint() -> str | None:
+    """Huella del último build terminado (None si nunca hubo uno)."""
+    return _read_json(STATE_PATH).get("fingerprint")
+
+
+def save_state(fp: str, site_dir: Path, outputs: set[Path]) -> None:
+    _write_json(STATE_PATH, {
+        "version": CACHE_VERSION,
+        "fingerprint": fp,
+        "outputs": sorted(str(p.relative_to(site_dir)) for p in outputs),
+    })
+
+
+def context_digests(domains: list[dict]) -> dict[str, str]:
+    """Hash del contexto de cada dominio, por slug."""
+    return {
+        dom["slug"]: hashlib.sha256(
+            json.dumps(dom, ensure_ascii=False, sort_keys=True).encode()
+        ).hexdigest()
+        for dom in domains
+    }
+
+
+class FragmentCache:
+    """HTML renderizado por dominio, indexado por hash de su contexto."""
+
+    def __init__(self, template_path: Path) -> None:
+        self._template_hash = hashlib.sha256(template_path.read_bytes()).hexdigest()
+        self._old = _read_json(FRAGMENTS_PATH).get("fragments", {})
+        self._new: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, digest: str) -> str:
+        return hashlib.sha256((self._template_hash + digest).encode()).hexdigest()
+
+    def render_all(
+        self,
+        domains: list[dict],
+        render: Callable[[dict], str],
+        pool: Executor | None = None,
+        digests: dict[str, str] | None = None,
+    ) -> dict[str, str]:
+        """HTML de cada dominio por slug; sólo se renderizan los que cambiaron.
+
+        Con ``pool`` los dominios pendientes se renderizan en paralelo
+        (``render`` debe poder enviarse a otro proceso). ``digests`` son los
+        ``context_digests(domains)`` si ya se calcularon.
+        """
+        digests = digests or context_digests(domains)
+        keys = {dom["slug"]: self._key(digests[dom["slug"]]) for dom in domains}
+        html = {}
+        pending = []
+        for dom in domains:
+            cached = self._old.get(dom["slug"])
+            if cached and cached["key"] == keys[dom["slug"]]:
+                html[dom["slug"]] = cached["html"]
+            else:
+                pending.append(dom)
+        rendered = pool.map(render, pending) if pool else map(render, pending)
+        for dom, fragment in zip(pending, rendered):
+            html[dom["slug"]] = fragment
+        self.hits = len(domains) - len(pending)
+        self.misses = len(pending)
+        self._new = {
+            slug: {"key": keys[slug], "html": html[slug]} for slug in keys
+        }
+        return html
+
+    def save(self) -> None:
+        """Guarda sólo los dominios de este build."""
+        _write_json(FRAGMENTS_PATH, {"version": CACHE_VERSION, "fragments": self._new})
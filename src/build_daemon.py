@@ -0,0 +1,405 @@
+"""Daemon de build: extracción y build() en un proceso de larga vida.
+
+Lanza un build cuando:
+
+* cambia algún archivo de data/ o templates/ (se comparan mtime y tamaño
+  cada ``--poll`` segundos). No cuentan los -wal/-shm de SQLite, las marcas
+  de agua (*.sync.json) ni lo que escribió la extracción del propio daemon;
+* llega una de las horas de ``--at``: extracción incremental (extract.py) y
+  build, como scheduler.py pero extrayendo;
+* se pide por HTTP en 127.0.0.1 (``POST /build``; ``GET /status`` devuelve el
+  estado en JSON) o con ``python src/build_daemon.py trigger``.
+
+Los pedidos en ráfaga (una extracción reescribe varios archivos, un editor
+guarda dos veces) se juntan: el build arranca cuando pasan ``--debounce``
+segundos sin pedidos nuevos, y los que llegan durante un build se juntan en
+el siguiente. Cada corrida toma ``build_cache.build_lock()``, el mismo lock
+que build.py, extract.py y scheduler.py, así que nunca corren dos a la vez.
+
+Entre builds el proceso conserva el entorno de Jinja (templating.py), los
+hashes de los archivos de entrada (build_cache.py) y el contexto de métricas
+del último build (build.MetricsMemo): si sólo cambiaron plantillas, el sitio
+se vuelve a renderizar sin leer ni recalcular los datos.
+
+Uso:
+    python src/build_daemon.py                          # vigila data/ y templates/
+    python src/build_daemon.py --at 08:00 12:00 17:00   # + extracción a esas horas
+    python src/build_daemon.py --engine pandas --workers 4
+    python src/build_daemon.py trigger                  # pide un build al daemon
+    python src/build_daemon.py trigger --extract --force
+    curl -X POST "http://127.0.0.1:8766/build?extract=1"
+    curl http://127.0.0.1:8766/status
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from fnmatch import fnmatch
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+import schedule
+
+import build
+import build_cache
+import extract
+
+DEFAULT_PORT = 8766
+WATCHED_DIRS = (build_cache.DATA_DIR, build_cache.TEMPLATE_DIR)
+# Cambian con sólo leer la base (-wal/-shm) o con cada extracción (marca de
+# agua); no son datos nuevos para el build
+IGNORED = ("*.db-wal", "*.db-shm", "*.db-journal", "*.sync.json")
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def log(message: str) -> None:
+    print(f"[{_now()}] {message}", flush=True)
+
+
+def snapshot(dirs: tuple[Path, ...], pattern: str = "*") -> dict[str, tuple[int, int]]:
+    """``{ruta: (mtime_ns, tamaño)}`` de los archivos de ``dirs`` que cumplen ``pattern``.
+
+    Se ignoran los archivos ocultos (los temporales de las escrituras
+    atómicas, que aparecen y desaparecen durante una extracción) y los de
+    ``IGNORED``.
+    """
+    files = {}
+    for directory in dirs:
+        if not directory.is_dir():
+            continue
+        for path in directory.rglob(pattern):
+            if path.name.startswith(".") or any(fnmatch(path.name, p) for p in IGNORED):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:  # borrado mientras se recorría
+                continue
+            if path.is_file():
+                files[str(path)] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+@dataclass
+class Job:
+    """Pedidos de build juntados en una sola corrida."""
+
+    reasons: list[str] = field(default_factory=list)
+    extract: bool = False
+    force: bool = False
+
+    def merge(self, reason: str, extract: bool, force: bool) -> None:
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+        self.extract |= extract
+        self.force |= force
+
+
+class BuildDaemon:
+    """Cola de un solo pedido con debounce y un hilo que corre los builds."""
+
+    def __init__(
+        self, engine: str = "python", workers: int = 1, debounce: float = 2.0,
+        on_done: Callable[[dict], None] | None = None,
+    ) -> None:
+        self.engine = engine
+        self.workers = workers
+        self.debounce = debounce
+        self.on_done = on_done  # recibe ``last`` al terminar cada corrida
+        self.memo = build.MetricsMemo()
+        self.stopped = threading.Event()
+        # Activo mientras el daemon extrae; al terminar, ``_extracted`` tiene
+        # el estado de data/ que dejó la extracción (ver ``own_change``)
+        self.extracting = threading.Event()
+        self._extracted: dict[str, tuple[int, int]] | None = None
+        self._cond = threading.Condition()
+        self._pending: Job | None = None
+        self._running: Job | None = None
+        self._last_request = 0.0
+        self.runs = 0
+        self.last: dict | None = None
+
+    def request(self, reason: str, extract: bool = False, force: bool = False) -> None:
+        """Agrega un pedido; se junta con los que todavía no arrancaron."""
+        with self._cond:
+            if self._pending is None:
+                self._pending = Job()
+            self._pending.merge(reason, extract, force)
+            self._last_request = time.monotonic()
+            self._cond.notify()
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "state": "running" if self._running else "idle",
+                "running": asdict(self._running) if self._running else None,
+                "pending": asdict(self._pending) if self._pending else None,
+                "runs": self.runs,
+                "last": self.last,
+            }
+
+    def stop(self) -> None:
+        self.stopped.set()
+        with self._cond:
+            self._cond.notify()
+
+    def _next_job(self) -> Job | None:
+        """Espera un pedido y ``debounce`` segundos sin pedidos nuevos."""
+        with self._cond:
+            while not self.stopped.is_set():
+                if self._pending is None:
+                    self._cond.wait()
+                    continue
+                quiet = time.monotonic() - self._last_request
+                if quiet < self.debounce:
+                    self._cond.wait(self.debounce - quiet)
+                    continue
+                self._running, self._pending = self._pending, None
+                return self._running
+        return None
+
+    def run_forever(self) -> None:
+        while (job := self._next_job()) is not None:
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        log(f"Build pedido por: {', '.join(job.reasons)}")
+        start = time.perf_counter()
+        error = None
+        try:
+            with ExitStack() as stack:
+                try:
+                    stack.enter_context(build_cache.build_lock(wait=False))
+                except build_cache.BuildLocked:
+                    log("Hay otro build o extracción en curso: esperando el lock...")
+                    stack.enter_context(build_cache.build_lock())
+                if job.extract:
+                    self.extracting.set()
+                    try:
+                        self._extract()
+                    finally:
+                        self._extracted = snapshot((build_cache.DATA_DIR,))
+                        self.extracting.clear()
+                build.build(
+                    self.engine, memory=False, force=job.force,
+                    workers=self.workers, memo=self.memo,
+                )
+        # SystemExit: load_config() sale así si falta .env; el daemon sigue
+        except (Exception, SystemExit) as exc:  # noqa: BLE001
+            error = str(exc) or type(exc).__name__
+        seconds = time.perf_counter() - start
+        with self._cond:
+            self._running = None
+            self.runs += 1
+            self.last = {
+                "finished_at": _now(),
+                "seconds": round(seconds, 2),
+                **asdict(job),
+                "error": error,
+            }
+        if error:
+            log(f"ERROR en build ({seconds:.1f} s): {error}")
+        else:
+            log(f"Build terminado en {seconds:.1f} s")
+        if self.on_done:
+            self.on_done(self.last)
+
+    def own_change(self, path: str, state: tuple[int, int] | None) -> bool:
+        """True si ``path`` de data/ está como lo dejó la última extracción del daemon."""
+        own = self._extracted
+        return (
+            own is not None
+            and Path(path).parent == build_cache.DATA_DIR
+            and own.get(path) == state
+        )
+
+    @staticmethod
+    def _extract() -> None:
+        args = extract.parse_args(
+            "Extracción incremental del daemon", ["--incremental"],
+        )
+        n_issues, n_epics = extract.run(args)
+        log(f"Extracción: {n_epics} épicas, {n_issues} issues")
+
+
+def watch(
+    stopped: threading.Event, dirs: tuple[Path, ...], poll: float,
+    on_change: Callable[[list[str]], None], pattern: str = "*",
+    hold: threading.Event | None = None,
+    ignore: Callable[[str, tuple[int, int] | None], bool] | None = None,
+) -> None:
+    """Llama a ``on_change(nombres)`` cada vez que cambian archivos de ``dirs``.
+
+    Mientras ``hold`` está activo no compara: lo que cambie se ve junto al
+    soltarlo. ``ignore(ruta, estado)`` descarta cambios puntuales (p. ej. los
+    que hizo la extracción del propio daemon, ``BuildDaemon.own_change``).
+    """
+    before = snapshot(dirs, pattern)
+    while not stopped.wait(poll):
+        if hold is not None and hold.is_set():
+            continue
+        after = snapshot(dirs, pattern)
+        if after != before:
+            changed = {p for p, _ in set(before.items()) ^ set(after.items())}
+            if ignore is not None:
+                changed = {p for p in changed if not ignore(p, after.get(p))}
+            if changed:
+                on_change(sorted({Path(p).name for p in changed}))
+            before = after
+
+
+def changes_reason(names: list[str]) -> str:
+    more = f" y {len(names) - 3} más" if len(names) > 3 else ""
+    return f"cambios en {', '.join(names[:3])}{more}"
+
+
+def make_handler(daemon: BuildDaemon) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            pass
+
+        def _send(self, status: int, body: object) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802
+            if urlsplit(self.path).path == "/status":
+                self._send(200, daemon.status())
+            else:
+                self._send(404, {"error": "usa GET /status o POST /build"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            url = urlsplit(self.path)
+            if url.path != "/build":
+                self._send(404, {"error": "usa GET /status o POST /build"})
+                return
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            flag = lambda name: params.get(name, "0") not in ("0", "", "false")  # noqa: E731
+            daemon.request("HTTP", extract=flag("extract"), force=flag("force"))
+            self._send(202, daemon.status())
+
+    return Handler
+
+
+def serve(daemon: BuildDaemon, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Endpoint de disparo en un hilo de fondo (sólo en 127.0.0.1)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(daemon))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def trigger(port: int, extract: bool, force: bool) -> dict:
+    """Pide un build al daemon que escucha en ``port``; retorna su estado."""
+    r = requests.post(
+        f"http://127.0.0.1:{port}/build",
+        params={"extract": int(extract), "force": int(force)},
+        timeout=10,
+    )
+    r.raise_for_status()
+    return r.json()
+
+
+def _valid_time(value: str) -> str:
+    try:
+        datetime.strptime(value, "%H:%M")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' no es un horario válido (usa HH:MM)") from None
+    return value
+
+
+def run_daemon(args: argparse.Namespace) -> None:
+    daemon = BuildDaemon(args.engine, args.workers, args.debounce)
+    try:
+        server = serve(daemon, args.port)
+    except OSError as exc:
+        sys.exit(f"ERROR: no se pudo escuchar en 127.0.0.1:{args.port} ({exc}); ¿ya hay un daemon?")
+
+    runner = threading.Thread(target=daemon.run_forever, name="build")
+    runner.start()
+    threading.Thread(
+        target=watch, name="watch", daemon=True,
+        args=(daemon.stopped, WATCHED_DIRS, args.poll,
+              lambda names: daemon.request(changes_reason(names)), "*",
+              daemon.extracting, daemon.own_change),
+    ).start()
+    for t in args.at:
+        schedule.every().day.at(t).do(daemon.request, f"horario {t}", extract=True)
+
+    log(f"Daemon activo en http://127.0.0.1:{args.port} (motor {args.engine})")
+    print(f"  vigilando: {', '.join(str(d) for d in WATCHED_DIRS)}")
+    if args.at:
+        print(f"  extracción + build a las {', '.join(args.at)}")
+    print("  Ctrl+C para detener.\n")
+    daemon.request("inicio", extract=args.extract_now)
+
+    try:
+        while not daemon.stopped.is_set():
+            schedule.run_pending()
+            # Duerme hasta el próximo horario (o un minuto, sin horarios)
+            idle = schedule.idle_seconds()
+            daemon.stopped.wait(60 if idle is None else min(max(idle, 0.1), 60))
+    except KeyboardInterrupt:
+        log("Deteniendo (se termina el build en curso)...")
+    finally:
+        daemon.stop()
+        server.shutdown()
+        runner.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Daemon de extracción y build")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sub = parser.add_subparsers(dest="command")
+    trig = sub.add_parser("trigger", help="pedir un build al daemon en marcha")
+    trig.add_argument("--port", type=int, default=DEFAULT_PORT)
+    trig.add_argument("--extract", action="store_true", help="extraer antes del build")
+    trig.add_argument("--force", action="store_true", help="construir aunque nada cambie")
+
+    parser.add_argument(
+        "--at", nargs="*", type=_valid_time, default=[], metavar="HH:MM",
+        help="horas de extracción incremental + build",
+    )
+    parser.add_argument(
+        "--extract-now", action="store_true", help="extraer también en el build inicial",
+    )
+    parser.add_argument("--engine", choices=sorted(build.ENGINES), default="python")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="procesos para métricas y render por dominio (como build.py)",
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=2.0,
+        help="segundos sin pedidos nuevos antes de arrancar un build",
+    )
+    parser.add_argument(
+        "--poll", type=float, default=1.0, help="segundos entre revisiones de data/ y templates/",
+    )
+    args = parser.parse_args()
+
+    if args.command == "trigger":
+        try:
+            status = trigger(args.port, args.extract, args.force)
+        except requests.ConnectionError:
+            sys.exit(f"ERROR: no hay un daemon escuchando en 127.0.0.1:{args.port}")
+        print(json.dumps(status, ensure_ascii=False, indent=2))
+    else:
+        run_daemon(args)
+
+
+if __name__ == "__main__":
+    main()
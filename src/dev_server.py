@@ -0,0 +1,273 @@
+"""Servidor local de desarrollo: sirve docs/ y recarga el navegador al reconstruir.
+
+Sirve el sitio como lo serviría un hosting estático bien configurado:
+
+* assets con hash en el nombre (dashboard.<hash>.js, data/*.<hash>.json):
+  ``Cache-Control: immutable`` por un año;
+* el resto (index.html): ``no-cache`` con ETag, así que se revalida y un
+  archivo sin cambios responde 304;
+* las variantes .br/.gz que ya publica assets.py según ``Accept-Encoding``.
+
+Vigila templates/ y data/ con el BuildDaemon de build_daemon.py: un cambio
+dispara ``build()`` con las métricas en memoria (build.MetricsMemo), así que
+editar una plantilla o dashboard.js sólo vuelve a renderizar. Al terminar
+cada build la página recibe un evento por /__livereload (Server-Sent Events)
+y se recarga. Si cambia algún .py de src/, el proceso servidor se reinicia
+(el código nuevo no se puede recargar en caliente) y la página se recarga
+al reconectarse.
+
+Uso:
+    python src/dev_server.py                  # http://127.0.0.1:8000
+    python src/dev_server.py --port 9000 --open
+    python src/dev_server.py --engine pandas
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import subprocess
+import sys
+import threading
+import webbrowser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import build
+import build_cache
+from assets import is_hashed
+from build_daemon import BuildDaemon, changes_reason, log, watch
+
+DEFAULT_PORT = 8000
+SITE_DIR = build.SITE_DIR
+SRC_DIR = build_cache.SRC_DIR
+WATCHED_DIRS = (build_cache.TEMPLATE_DIR, build_cache.DATA_DIR)
+LIVE_RELOAD_PATH = "/__livereload"
+# Código de salida del proceso servidor para que el supervisor lo reinicie
+RESTART_CODE = 3
+CHILD_ENV = "CAMDP_DEV_SERVER_CHILD"
+
+# Se inserta en index.html sólo al servirlo desde aquí (no queda en docs/)
+LIVE_RELOAD_JS = f"""<script>
+(() => {{
+  let version = null;
+  const events = new EventSource('{LIVE_RELOAD_PATH}');
+  events.addEventListener('version', (e) => {{
+    if (version !== null && e.data !== version) location.reload();
+    version = e.data;
+  }});
+  events.addEventListener('build-error', (e) => console.error('[build]', e.data));
+}})();
+</script>
+"""
+
+
+class LiveReload:
+    """Versión del sitio (huella del último build) que esperan las páginas abiertas."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self.version = build_cache.last_fingerprint() or ""
+        self.error: str | None = None
+
+    def publish(self, last: dict) -> None:
+        """Callback del BuildDaemon al terminar cada corrida."""
+        with self._cond:
+            self.error = last["error"]
+            if not self.error:
+                self.version = build_cache.last_fingerprint() or ""
+            self._cond.notify_all()
+
+    def wait(self, version: str, error: str | None, timeout: float) -> tuple[str, str | None]:
+        """Espera hasta ``timeout`` s a que cambie la versión o el error."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: (self.version, self.error) != (version, error), timeout,
+            )
+            return self.version, self.error
+
+
+def _etag(path: Path) -> str:
+    st = path.stat()
+    return '"' + hashlib.sha1(f"{st.st_mtime_ns}-{st.st_size}".encode()).hexdigest()[:16] + '"'
+
+
+def _content_type(path: Path) -> str:
+    ctype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if ctype.startswith("text/") or ctype in ("application/json", "application/javascript"):
+        ctype += "; charset=utf-8"
+    return ctype
+
+
+def make_handler(live: LiveReload) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            pass
+
+        def _accepts(self, encoding: str) -> bool:
+            return encoding in self.headers.get("Accept-Encoding", "")
+
+        def _send(self, status: int, body: bytes, headers: dict[str, str]) -> None:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802
+            url_path = unquote(urlsplit(self.path).path)
+            if url_path == LIVE_RELOAD_PATH:
+                self._events()
+                return
+            if url_path.endswith("/"):
+                url_path += "index.html"
+            path = (SITE_DIR / url_path.lstrip("/")).resolve()
+            if not path.is_relative_to(SITE_DIR) or not path.is_file():
+                self._send(404, b"404", {"Content-Type": "text/plain; charset=utf-8"})
+                return
+
+            etag = _etag(path)
+            headers = {
+                "Content-Type": _content_type(path),
+                "ETag": etag,
+                "Vary": "Accept-Encoding",
+                "Cache-Control": (
+                    "public, max-age=31536000, immutable" if is_hashed(path.name)
+                    else "no-cache"
+                ),
+            }
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, b"", headers)
+                return
+
+            if path == SITE_DIR / "index.html":
+                html = path.read_text(encoding="utf-8")
+                body = html.replace("</body>", LIVE_RELOAD_JS + "</body>", 1).encode("utf-8")
+                if self._accepts("gzip"):
+                    body = gzip.compress(body, compresslevel=6)
+                    headers["Content-Encoding"] = "gzip"
+                self._send(200, body, headers)
+                return
+
+            for encoding, ext in (("br", ".br"), ("gzip", ".gz")):
+                variant = path.with_name(path.name + ext)
+                if self._accepts(encoding) and variant.is_file():
+                    headers["Content-Encoding"] = encoding
+                    path = variant
+                    break
+            self._send(200, path.read_bytes(), headers)
+
+        def _events(self) -> None:
+            """Stream SSE: la versión actual al conectar y cada versión nueva."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            version, error = None, None
+            try:
+                while True:
+                    current, current_error = live.wait(version, error, timeout=15)
+                    if current != version:
+                        self.wfile.write(f"event: version\ndata: {current}\n\n".encode())
+                    if current_error and current_error != error:
+                        data = json.dumps(current_error, ensure_ascii=False)
+                        self.wfile.write(f"event: build-error\ndata: {data}\n\n".encode())
+                    if (current, current_error) == (version, error):
+                        self.wfile.write(b": ping\n\n")  # detecta pestañas cerradas
+                    self.wfile.flush()
+                    version, error = current, current_error
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return Handler
+
+
+def run_server(args: argparse.Namespace) -> int:
+    """Proceso servidor; retorna RESTART_CODE si cambió el código de src/."""
+    live = LiveReload()
+    daemon = BuildDaemon(args.engine, args.workers, args.debounce, on_done=live.publish)
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(live))
+    except OSError as exc:
+        sys.exit(f"ERROR: no se pudo escuchar en 127.0.0.1:{args.port} ({exc})")
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    restart = threading.Event()
+
+    def code_changed(names: list[str]) -> None:
+        log(f"{changes_reason(names)}: reiniciando el servidor...")
+        restart.set()
+        daemon.stop()
+
+    runner = threading.Thread(target=daemon.run_forever, name="build")
+    runner.start()
+    threading.Thread(
+        target=watch, name="watch", daemon=True,
+        args=(daemon.stopped, WATCHED_DIRS, args.poll,
+              lambda names: daemon.request(changes_reason(names))),
+    ).start()
+    threading.Thread(
+        target=watch, name="watch-src", daemon=True,
+        args=(daemon.stopped, (SRC_DIR,), args.poll, code_changed, "*.py"),
+    ).start()
+    # Forzado aunque el sitio esté al día: deja las métricas en memoria y la
+    # primera edición de una plantilla ya no las recalcula
+    daemon.request("inicio", force=True)
+
+    url = f"http://127.0.0.1:{args.port}/"
+    log(f"Sirviendo {SITE_DIR} en {url} (Ctrl+C para detener)")
+    if args.open and not os.environ.get(CHILD_ENV + "_RESTARTED"):
+        webbrowser.open(url)
+    try:
+        daemon.stopped.wait()
+    except KeyboardInterrupt:
+        daemon.stop()
+    finally:
+        runner.join()
+        server.shutdown()
+        server.server_close()
+    return RESTART_CODE if restart.is_set() else 0
+
+
+def supervise() -> int:
+    """Corre el servidor en un proceso hijo y lo relanza cuando pide reinicio."""
+    env = {**os.environ, CHILD_ENV: "1"}
+    while True:
+        try:
+            code = subprocess.call([sys.executable, __file__, *sys.argv[1:]], env=env)
+        except KeyboardInterrupt:  # el hijo también recibe Ctrl+C y termina solo
+            return 0
+        if code != RESTART_CODE:
+            return code
+        env[CHILD_ENV + "_RESTARTED"] = "1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local de docs/ con recarga automática")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--open", action="store_true", help="abrir el navegador al arrancar")
+    parser.add_argument("--engine", choices=sorted(build.ENGINES), default="python")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="procesos para métricas y render por dominio (como build.py)",
+    )
+    parser.add_argument(
+        "--debounce", type=float, default=0.2,
+        help="segundos sin cambios nuevos antes de reconstruir",
+    )
+    parser.add_argument(
+        "--poll", type=float, default=0.25, help="segundos entre revisiones de archivos",
+    )
+    args = parser.parse_args()
+    if os.environ.get(CHILD_ENV):
+        sys.exit(run_server(args))
+    sys.exit(supervise())
+
+
+if __name__ == "__main__":
+    main()
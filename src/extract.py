@@ -0,0 +1,208 @@
+"""Extrae épicas e issues CAMDP de Jira en un solo crawl.
+
+Pide ``project = CAMDP`` una vez con la unión de los campos de los perfiles
+de épicas e issues (profiles.py), sin ``description``, y reparte cada issue
+crudo entre ``clean_issue`` (todos) y ``clean_epic`` (sólo épicas). La
+description, que sólo guardan las épicas, se pide aparte y sólo para ellas. Escribe
+data/epics.json, data/all_issues.json, el almacén SQLite (store.py) y el
+snapshot Parquet (snapshot.py) desde la misma respuesta.
+
+Uso:
+    python src/extract.py                # extracción completa
+    python src/extract.py --incremental  # sólo lo cambiado
+    python src/extract.py --workers 1    # páginas en secuencia
+    python src/extract.py --no-description   # sin description de épicas
+"""
+
+import argparse
+import json
+import sys
+from contextlib import ExitStack, closing
+from pathlib import Path
+
+import build_cache
+import extract_all_issues
+import extract_epics
+import profiles
+import store
+from extract_all_issues import clean_issue, parse_args
+from extract_epics import clean_epic
+from incremental import (
+    KEY_BATCH,
+    Watermark,
+    apply_delta,
+    fetch_delta,
+    full_sync_state,
+    key_in_jql,
+    load_state,
+    save_state,
+)
+from jira_client import JiraClient, JiraError, load_config
+from json_stream import JsonArrayWriter
+from snapshot import SnapshotWriter
+from store import DatasetWriter
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "data"
+EPICS_PATH = DATA_DIR / "epics.json"
+ISSUES_PATH = DATA_DIR / "all_issues.json"
+
+JQL = extract_all_issues.JQL
+FIELDS = profiles.union_fields("issues", "epics", description=False)
+EPIC_TYPES = {"Epic", "Épica"}
+
+
+def is_epic(issue: dict) -> bool:
+    issuetype = issue["fields"].get("issuetype") or {}
+    return issuetype.get("name") in EPIC_TYPES
+
+
+def _descriptions(client: JiraClient, jql: str) -> dict[str, str | None]:
+    return {
+        i["key"]: i["fields"].get("description")
+        for i in client.search_all(jql, "description", label="descripciones")
+    }
+
+
+def epic_descriptions(client: JiraClient, keys: list[str] | None = None) -> dict:
+    """description de las épicas indicadas (``None`` = todas las del proyecto)."""
+    if keys is None:
+        return _descriptions(client, extract_epics.JQL)
+    found: dict[str, str | None] = {}
+    for start in range(0, len(keys), KEY_BATCH):
+        found |= _descriptions(client, key_in_jql(keys[start:start + KEY_BATCH]))
+    return found
+
+
+def _add_descriptions(raw: list[dict], descriptions: dict) -> None:
+    for issue in raw:
+        if is_epic(issue):
+            issue["fields"]["description"] = descriptions.get(issue["key"])
+
+
+def _load(path: Path) -> list[dict]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _update_store(
+    raw: list[dict], gone: set[str], issues: list[dict], epics: list[dict],
+    was_current: bool,
+) -> None:
+    """Aplica el delta al almacén SQLite como upserts/borrados por key.
+
+    ``was_current``: ambos datasets estaban al día con los JSON antes de
+    reescribirlos (``store.current``); si no, se cargan completos.
+    """
+    if not was_current:
+        for dataset, records in (("issues", issues), ("epics", epics)):
+            with DatasetWriter(dataset) as out:
+                out.write_all(records)
+        return
+    not_epics = {i["key"] for i in raw if not is_epic(i)}
+    with closing(store.connect()) as conn, conn:
+        store.delete(conn, "issues", gone)
+        store.upsert(conn, "issues", [clean_issue(i) for i in raw])
+        store.delete(conn, "epics", gone | not_epics)
+        store.upsert(conn, "epics", [clean_epic(i) for i in raw if is_epic(i)])
+        for dataset in ("issues", "epics"):
+            store.mark_written(conn, dataset)
+
+
+def extract(client: JiraClient, args: argparse.Namespace) -> tuple[int, int, dict]:
+    """Escribe ambos datasets; retorna ``(n issues, n épicas, estado de sync)``.
+
+    En la extracción completa cada página se limpia y se escribe a disco a
+    medida que llega, sin acumular el proyecto en memoria.
+    """
+    state = load_state(ISSUES_PATH)
+    has_previous = (
+        state.get("watermark") and ISSUES_PATH.exists() and EPICS_PATH.exists()
+    )
+    if args.incremental and has_previous:
+        print("Sincronizando épicas e issues CAMDP de Jira (incremental)...")
+        issues = _load(ISSUES_PATH)
+        raw, gone, state = fetch_delta(
+            state, JQL,
+            lambda jql, fields: client.search_all(jql, fields, label="issues"),
+            FIELDS, {r["key"] for r in issues},
+            force_reconcile=args.reconcile,
+        )
+        if args.description:
+            keys = [i["key"] for i in raw if is_epic(i)]
+            _add_descriptions(raw, epic_descriptions(client, keys) if keys else {})
+        issues = apply_delta(issues, raw, clean_issue, gone)
+        epics = apply_delta(_load(EPICS_PATH), raw, clean_epic, gone, keep=is_epic)
+        was_current = store.current("issues") and store.current("epics")
+        for path, records in ((ISSUES_PATH, issues), (EPICS_PATH, epics)):
+            with JsonArrayWriter(path) as out:
+                out.write_all(records)
+        for dataset, records in (("issues", issues), ("epics", epics)):
+            with SnapshotWriter(dataset) as out:
+                out.write_all(records)
+        _update_store(raw, gone, issues, epics, was_current)
+        return len(issues), len(epics), state
+
+    if args.incremental:
+        print("  Sin sync previa, se hace extracción completa.")
+    print("Extrayendo épicas e issues CAMDP de Jira...")
+    mark = Watermark()
+    descriptions = epic_descriptions(client) if args.description else {}
+    with ExitStack() as stack:
+        # Ambos datasets en una sola transacción: dos conexiones escribiendo
+        # a la vez se bloquean entre sí ("database is locked"). La base y
+        # los snapshots se abren antes que los JSON para cerrarse después:
+        # store.is_current y snapshot.is_current comparan contra el JSON
+        conn = stack.enter_context(closing(store.connect()))
+        stack.enter_context(conn)
+        issues_db = stack.enter_context(DatasetWriter("issues", conn=conn))
+        epics_db = stack.enter_context(DatasetWriter("epics", conn=conn))
+        issues_pq = stack.enter_context(SnapshotWriter("issues"))
+        epics_pq = stack.enter_context(SnapshotWriter("epics"))
+        issues_out = stack.enter_context(JsonArrayWriter(ISSUES_PATH))
+        epics_out = stack.enter_context(JsonArrayWriter(EPICS_PATH))
+        for page in client.iter_search(JQL, FIELDS, label="issues"):
+            mark.see(page)
+            _add_descriptions(page, descriptions)
+            for raw in page:
+                issue = clean_issue(raw)
+                for out in (issues_out, issues_db, issues_pq):
+                    out.write(issue)
+                if is_epic(raw):
+                    epic = clean_epic(raw)
+                    for out in (epics_out, epics_db, epics_pq):
+                        out.write(epic)
+    return issues_out.count, epics_out.count, full_sync_state(mark.value())
+
+
+def run(args: argparse.Namespace) -> tuple[int, int]:
+    """Extrae con las opciones de ``parse_args`` y guarda la marca de agua.
+
+    Retorna ``(n issues, n épicas)``; los errores de Jira se propagan
+    (JiraError). build_daemon.py lo llama en su propio proceso.
+    """
+    client = JiraClient(load_config(), workers=args.workers)
+    n_issues, n_epics, state = extract(client, args)
+    print(f"  Jira: {client.summary()}")
+
+    # Misma marca de agua para ambos: los extractores sueltos pueden
+    # seguir en incremental a partir de aquí
+    save_state(ISSUES_PATH, state)
+    save_state(EPICS_PATH, state)
+    return n_issues, n_epics
+
+
+def main() -> None:
+    args = parse_args("Extrae épicas e issues CAMDP de Jira en un solo crawl.")
+    try:
+        with build_cache.build_lock(wait=False):
+            n_issues, n_epics = run(args)
+    except build_cache.BuildLocked:
+        sys.exit("ERROR: hay otro build o extracción en curso (build_daemon.py, scheduler.py...)")
+    except JiraError as exc:
+        sys.exit(f"ERROR: {exc}")
+    print(f"\n{n_epics} épicas guardadas en {EPICS_PATH}")
+    print(f"{n_issues} issues guardados en {ISSUES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,64 @@
 """Extrae TODOS los issues de CAMDP (no solo épicas) con paginación.
 
-Guarda datos limpios en data/all_issues.json.
+Guarda datos limpios en data/all_issues.json, en el almacén SQLite y
+en el snapshot Parquet.
+
+Uso:
+    python src/extract_all_issues.py                # extracción completa
+    python src/extract_all_issues.py --incremental  # sólo lo cambiado
+    python src/extract_all_issues.py --workers 1    # páginas en secuencia
 """
 
-import json
+import argparse
 import sys
+from collections import Counter
 from pathlib import Path
 
-import requests
 from dotenv import dotenv_values
 
+import profiles
+import store
+from incremental import Watermark, full_sync_state, save_state, sync_incremental
+from jira_client import DEFAULT_WORKERS, JiraClient, JiraError, load_config
+from json_stream import JsonArrayWriter
+from snapshot import SnapshotWriter
+from store import DatasetWriter
+
 ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "data"
+OUTPUT_PATH = DATA_DIR / "all_issues.json"
 config = dotenv_values(ROOT / ".env")
 
+JQL = "project = CAMDP ORDER BY created DESC"
+FIELDS = profiles.fields_for("issues")
 
-def build_session() -> requests.Session:
-    """Sesion autenticada contra Jira via cookie."""
-    session = requests.Session()
-    cookie = config.get("JIRA_COOKIE", "")
-    if not cookie:
-        sys.exit("ERROR: JIRA_COOKIE no configurada en .env")
-    session.headers["Cookie"] = cookie
-    return session
-
-
-def fetch_all_issues(session: requests.Session) -> list[dict]:
-    """Pagina sobre /rest/api/2/search para traer todos los issues."""
-    base_url = config["JIRA_URL"].rstrip("/")
-    url = f"{base_url}/rest/api/2/search"
-    jql = "project = CAMDP ORDER BY created DESC"
-    fields = (
-        "summary,status,issuetype,assignee,created,updated,"
-        "priority,labels,components,resolution,resolutiondate,"
-        "duedate,customfield_10400,customfield_11805,"
-        "customfield_10007"  # Epic Link
-    )
-
-    all_issues: list[dict] = []
-    start_at = 0
-    page_size = 100
 
-    while True:
-        params = {
-            "jql": jql,
-            "startAt": start_at,
-            "maxResults": page_size,
-            "fields": fields,
-        }
-        r = session.get(url, params=params, timeout=30)
-        if r.status_code != 200:
-            sys.exit(f"Jira error {r.status_code}: {r.text[:300]}")
+def fetch_all_issues(client: JiraClient) -> list[dict]:
+    """Trae todos los issues del proyecto CAMDP."""
+    return client.search_all(JQL, FIELDS, label="issues")
 
-        data = r.json()
-        issues = data.get("issues", [])
-        all_issues.extend(issues)
-        total = data.get("total", 0)
-        print(f"  Fetched {len(all_issues)}/{total} issues...")
 
-        if len(all_issues) >= total or not issues:
-            break
-        start_at += page_size
-
-    return all_issues
+def parse_args(description: str, argv: list[str] | None = None) -> argparse.Namespace:
+    """Opciones comunes de los extractores (``argv`` = None lee sys.argv)."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--workers", type=int,
+        default=int(config.get("JIRA_WORKERS") or DEFAULT_WORKERS),
+        help="peticiones concurrentes a Jira (1 = secuencial)",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="traer sólo lo actualizado desde la última sync",
+    )
+    parser.add_argument(
+        "--reconcile", action="store_true",
+        help="forzar la reconciliación de keys en modo incremental",
+    )
+    parser.add_argument(
+        "--no-description", dest="description", action="store_false",
+        help="no pedir description a Jira (las épicas quedan sin ella)",
+    )
+    return parser.parse_args(argv)
 
 
 def clean_issue(issue: dict) -> dict:
@@ -90,7 +86,7 @@ def clean_issue(issue: dict) -> dict:
         "resolution_date": (f.get("resolutiondate") or "")[:10],
         "labels": f.get("labels", []),
         "components": [c["name"] for c in f.get("components", [])],
-        "description": (f.get("description") or "")[:200],
+        "description": (f.get("description") or "")[:profiles.description_chars("issues")],
         "url": f"{config['JIRA_URL'].rstrip('/')}/browse/{issue['key']}",
         "start_date": (f.get("customfield_11805") or "")[:10],
         "planned_done_date": (f.get("customfield_10400") or "")[:10],
@@ -99,26 +95,63 @@ def clean_issue(issue: dict) -> dict:
     }
 
 
-def main() -> None:
-    print("Extrayendo TODOS los issues CAMDP de Jira...")
-    session = build_session()
-    raw_issues = fetch_all_issues(session)
+def extract(client: JiraClient, args: argparse.Namespace) -> tuple[Counter, dict]:
+    """Escribe data/all_issues.json y retorna (conteo por tipo, estado de sync).
+
+    Incremental si se pidió y hay sync previa; si no, extracción completa
+    limpiando y escribiendo cada página a medida que llega.
+    """
+    type_counts: Counter = Counter()
+    if args.incremental:
+        print("Sincronizando issues CAMDP de Jira (incremental)...")
+        synced = sync_incremental(
+            OUTPUT_PATH, JQL,
+            lambda jql, fields: client.search_all(jql, fields, label="issues"),
+            FIELDS, clean_issue, force_reconcile=args.reconcile,
+        )
+        if synced is not None:
+            issues, changed, gone, state = synced
+            was_current = store.current("issues")
+            for writer in (JsonArrayWriter(OUTPUT_PATH), SnapshotWriter("issues")):
+                with writer as out:
+                    out.write_all(issues)
+            store.apply_changes("issues", changed, gone, issues, was_current)
+            type_counts.update(i["issuetype"] for i in issues)
+            return type_counts, state
+        print("  Sin sync previa, se hace extracción completa.")
 
-    issues = [clean_issue(issue) for issue in raw_issues]
+    print("Extrayendo TODOS los issues CAMDP de Jira...")
+    mark = Watermark()
+    # Base y snapshot antes que el JSON: se cierran después, con el JSON ya
+    # en su lugar (store.is_current y snapshot.is_current comparan contra él)
+    with (
+        DatasetWriter("issues") as db,
+        SnapshotWriter("issues") as pq,
+        JsonArrayWriter(OUTPUT_PATH) as out,
+    ):
+        for page in client.iter_search(JQL, FIELDS, label="issues"):
+            mark.see(page)
+            for raw in page:
+                issue = clean_issue(raw)
+                for writer in (out, db, pq):
+                    writer.write(issue)
+                type_counts[issue["issuetype"]] += 1
+    return type_counts, full_sync_state(mark.value())
 
-    # Conteo por tipo
-    type_counts: dict[str, int] = {}
-    for iss in issues:
-        t = iss["issuetype"]
-        type_counts[t] = type_counts.get(t, 0) + 1
 
-    output_path = DATA_DIR / "all_issues.json"
-    output_path.write_text(
-        json.dumps(issues, indent=2, ensure_ascii=False), encoding="utf-8",
-    )
-    print(f"\n{len(issues)} issues guardados en {output_path}")
+def main() -> None:
+    args = parse_args("Extrae todos los issues CAMDP de Jira.")
+    client = JiraClient(load_config(), workers=args.workers)
+    try:
+        type_counts, state = extract(client, args)
+    except JiraError as exc:
+        sys.exit(f"ERROR: {exc}")
+    print(f"  Jira: {client.summary()}")
+    save_state(OUTPUT_PATH, state)
+
+    print(f"\n{type_counts.total()} issues guardados en {OUTPUT_PATH}")
     print("Distribucion por tipo:")
-    for t, c in sorted(type_counts.items(), key=lambda x: -x[1]):
+    for t, c in type_counts.most_common():
         print(f"  {t}: {c}")
 
 
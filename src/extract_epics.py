@@ -1,67 +1,43 @@
 """Extrae TODAS las épicas CAMDP de Jira (con paginación).
 
-Guarda los datos limpios en data/epics.json.
+Guarda los datos limpios en data/epics.json, en el almacén SQLite y
+en el snapshot Parquet.
+
+Uso:
+    python src/extract_epics.py                # extracción completa
+    python src/extract_epics.py --incremental  # sólo lo cambiado
+    python src/extract_epics.py --workers 1    # páginas en secuencia
 """
 
-import json
+import argparse
 import sys
 from pathlib import Path
 
-import requests
 from dotenv import dotenv_values
 
+import profiles
+import store
+from extract_all_issues import parse_args
+from incremental import Watermark, full_sync_state, save_state, sync_incremental
+from jira_client import JiraClient, JiraError, load_config
+from json_stream import JsonArrayWriter
+from snapshot import SnapshotWriter
+from store import DatasetWriter
+
 ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "data"
+OUTPUT_PATH = DATA_DIR / "epics.json"
 config = dotenv_values(ROOT / ".env")
 
+JQL = "project = CAMDP AND issuetype = Epic ORDER BY created DESC"
+FIELDS = profiles.fields_for("epics")
 
-def build_session() -> requests.Session:
-    """Sesion autenticada contra Jira via cookie."""
-    session = requests.Session()
-    cookie = config.get("JIRA_COOKIE", "")
-    if not cookie:
-        sys.exit("ERROR: JIRA_COOKIE no configurada en .env")
-    session.headers["Cookie"] = cookie
-    return session
-
-
-def fetch_all_epics(session: requests.Session) -> list[dict]:
-    """Pagina sobre /rest/api/2/search para traer todas las épicas."""
-    base_url = config["JIRA_URL"].rstrip("/")
-    url = f"{base_url}/rest/api/2/search"
-    jql = "project = CAMDP AND issuetype = Epic ORDER BY created DESC"
-    fields = (
-        "summary,status,assignee,created,updated,priority,"
-        "labels,description,resolution,resolutiondate,components,"
-        "duedate,customfield_10400,customfield_11805"
-    )
-
-    all_issues: list[dict] = []
-    start_at = 0
-    page_size = 100
-
-    while True:
-        params = {
-            "jql": jql,
-            "startAt": start_at,
-            "maxResults": page_size,
-            "fields": fields,
-        }
-        r = session.get(url, params=params, timeout=30)
-        if r.status_code != 200:
-            sys.exit(f"Jira error {r.status_code}: {r.text[:300]}")
-
-        data = r.json()
-        issues = data.get("issues", [])
-        all_issues.extend(issues)
-        total = data.get("total", 0)
-        print(f"  Fetched {len(all_issues)}/{total} epics...")
 
-        if len(all_issues) >= total or not issues:
-            break
-        start_at += page_size
-
-    return all_issues
+def fetch_all_epics(client: JiraClient, description: bool = True) -> list[dict]:
+    """Trae todas las épicas del proyecto CAMDP."""
+    return client.search_all(
+        JQL, profiles.fields_for("epics", description), label="epics",
+    )
 
 
 def clean_epic(issue: dict) -> dict:
@@ -87,7 +63,7 @@ def clean_epic(issue: dict) -> dict:
         "resolution_date": (f.get("resolutiondate") or "")[:10],
         "labels": f.get("labels", []),
         "components": [c["name"] for c in f.get("components", [])],
-        "description": (f.get("description") or "")[:300],
+        "description": (f.get("description") or "")[:profiles.description_chars("epics")],
         "url": f"{config['JIRA_URL'].rstrip('/')}/browse/{issue['key']}",
         "start_date": (f.get("customfield_11805") or "")[:10],
         "planned_done_date": (f.get("customfield_10400") or "")[:10],
@@ -95,18 +71,59 @@ def clean_epic(issue: dict) -> dict:
     }
 
 
-def main() -> None:
+def extract(client: JiraClient, args: argparse.Namespace) -> tuple[int, dict]:
+    """Escribe data/epics.json y retorna (cantidad de épicas, estado de sync).
+
+    Incremental si se pidió y hay sync previa; si no, extracción completa
+    limpiando y escribiendo cada página a medida que llega.
+    """
+    fields = profiles.fields_for("epics", args.description)
+    if args.incremental:
+        print("Sincronizando épicas CAMDP de Jira (incremental)...")
+        synced = sync_incremental(
+            OUTPUT_PATH, JQL,
+            lambda jql, fields: client.search_all(jql, fields, label="epics"),
+            fields, clean_epic, force_reconcile=args.reconcile,
+        )
+        if synced is not None:
+            epics, changed, gone, state = synced
+            was_current = store.current("epics")
+            for writer in (JsonArrayWriter(OUTPUT_PATH), SnapshotWriter("epics")):
+                with writer as out:
+                    out.write_all(epics)
+            store.apply_changes("epics", changed, gone, epics, was_current)
+            return len(epics), state
+        print("  Sin sync previa, se hace extracción completa.")
+
     print("Extrayendo épicas CAMDP de Jira...")
-    session = build_session()
-    raw_issues = fetch_all_epics(session)
+    mark = Watermark()
+    # Base y snapshot antes que el JSON: se cierran después, con el JSON ya
+    # en su lugar (store.is_current y snapshot.is_current comparan contra él)
+    with (
+        DatasetWriter("epics") as db,
+        SnapshotWriter("epics") as pq,
+        JsonArrayWriter(OUTPUT_PATH) as out,
+    ):
+        for page in client.iter_search(JQL, fields, label="epics"):
+            mark.see(page)
+            for raw in page:
+                epic = clean_epic(raw)
+                for writer in (out, db, pq):
+                    writer.write(epic)
+        count = out.count
+    return count, full_sync_state(mark.value())
 
-    epics = [clean_epic(issue) for issue in raw_issues]
 
-    output_path = DATA_DIR / "epics.json"
-    output_path.write_text(
-        json.dumps(epics, indent=2, ensure_ascii=False), encoding="utf-8"
-    )
-    print(f"\n{len(epics)} épicas guardadas en {output_path}")
+def main() -> None:
+    args = parse_args("Extrae las épicas CAMDP de Jira.")
+    client = JiraClient(load_config(), workers=args.workers)
+    try:
+        count, state = extract(client, args)
+    except JiraError as exc:
+        sys.exit(f"ERROR: {exc}")
+    print(f"  Jira: {client.summary()}")
+    save_state(OUTPUT_PATH, state)
+    print(f"\n{count} épicas guardadas en {OUTPUT_PATH}")
 
 
 if __name__ == "__main__":
@@ -1,33 +1,28 @@
 """Fetch reference page and CAMDP epics from Jira."""
 
 import json
-import sys
 from pathlib import Path
 
 import requests
-from dotenv import dotenv_values
+
+from jira_client import JiraClient, JiraError, load_config
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "data"
-config = dotenv_values(ROOT / ".env")
-
 
-def build_session() -> requests.Session:
-    """Sesion autenticada contra Jira via cookie."""
-    session = requests.Session()
-    cookie = config.get("JIRA_COOKIE", "")
-    if not cookie:
-        sys.exit("ERROR: JIRA_COOKIE no configurada en .env")
-    session.headers["Cookie"] = cookie
-    return session
 
+def fetch_reference(config: dict[str, str]) -> None:
+    """Descarga la pagina de referencia.
 
-def fetch_reference(session: requests.Session) -> None:
-    """Descarga la pagina de referencia."""
+    No usa la sesión de JiraClient: no es un host de Jira y no debe recibir
+    el token; sólo se reenvía la cookie, si la hay.
+    """
     print("=== Fetching reference page ===")
+    cookie = config.get("JIRA_COOKIE")
     try:
-        r = session.get(
+        r = requests.get(
             "https://gecgithub01.walmart.com/pages/l0c0k21/presentacion-fabrica/",
+            headers={"Cookie": cookie} if cookie else None,
             timeout=10,
         )
         print(f"Status: {r.status_code}, Length: {len(r.text)}")
@@ -37,11 +32,10 @@ def fetch_reference(session: requests.Session) -> None:
         print(f"Could not fetch reference: {e}")
 
 
-def fetch_epics(session: requests.Session) -> None:
+def fetch_epics(client: JiraClient) -> None:
     """Descarga epicas CAMDP desde Jira."""
     print("\n=== Fetching CAMDP epics from Jira ===")
     jql = "project = CAMDP AND issuetype = Epic ORDER BY created DESC"
-    url = f"{config['JIRA_URL'].rstrip('/')}/rest/api/2/search"
     params = {
         "jql": jql,
         "maxResults": 100,
@@ -52,30 +46,28 @@ def fetch_epics(session: requests.Session) -> None:
         ),
     }
 
-    r = session.get(url, params=params, timeout=30)
-    print(f"Status: {r.status_code}")
+    try:
+        data = client.get_json("/rest/api/2/search", params=params)
+    except JiraError as exc:
+        print(f"Error: {exc}")
+        return
 
-    if r.status_code == 200:
-        data = r.json()
-        print(f"Total epics found: {data.get('total', 0)}")
-        (DATA_DIR / "epics_raw.json").write_text(
-            json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
-        print("Saved to data/epics_raw.json")
-        for issue in data.get("issues", []):
-            key = issue["key"]
-            summary = issue["fields"]["summary"]
-            status = issue["fields"]["status"]["name"]
-            print(f"  {key}: [{status}] {summary}")
-    else:
-        print(f"Error: {r.status_code}")
-        print(r.text[:500])
+    print(f"Total epics found: {data.get('total', 0)}")
+    (DATA_DIR / "epics_raw.json").write_text(
+        json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8"
+    )
+    print("Saved to data/epics_raw.json")
+    for issue in data.get("issues", []):
+        key = issue["key"]
+        summary = issue["fields"]["summary"]
+        status = issue["fields"]["status"]["name"]
+        print(f"  {key}: [{status}] {summary}")
 
 
 def main() -> None:
-    session = build_session()
-    fetch_reference(session)
-    fetch_epics(session)
+    config = load_config()
+    fetch_reference(config)
+    fetch_epics(JiraClient(config))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,233 @@
+"""Sincronización incremental de datasets de Jira (delta por ``updated``).
+
+Junto a cada archivo de salida (p. ej. data/all_issues.json) se guarda un
+estado ``<nombre>.sync.json`` con la marca de agua de la última sync:
+
+    {"watermark": "2026-03-11 08:15", "last_reconcile": "2026-03-11T08:16:02"}
+
+En modo incremental el JQL se acota con ``AND updated >= "<watermark>"`` y los
+issues cambiados se fusionan por ``key`` con el dataset existente. Cada
+``RECONCILE_HOURS`` se hace además una pasada barata que sólo pide las keys
+del JQL completo para detectar issues borrados o movidos de proyecto.
+
+La marca de agua es el inicio del crawl menos ``SAFETY_MARGIN``, no el mayor
+``updated`` visto: un issue editado mientras se paginaba (después de que se
+pidió su página) queda con un ``updated`` posterior a ese inicio y el
+siguiente delta lo vuelve a traer (ver ``Watermark``).
+"""
+
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+RECONCILE_HOURS = 24
+KEY_BATCH = 100
+# Holgura por desfase entre el reloj local y el de Jira
+SAFETY_MARGIN = timedelta(minutes=5)
+
+
+def state_path(output_path: Path) -> Path:
+    """data/all_issues.json -> data/all_issues.sync.json"""
+    return output_path.with_suffix(".sync.json")
+
+
+def load_state(output_path: Path) -> dict:
+    path = state_path(output_path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_state(output_path: Path, state: dict) -> None:
+    state_path(output_path).write_text(
+        json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8",
+    )
+
+
+def delta_jql(jql: str, watermark: str) -> str:
+    """Inserta ``AND updated >= "<watermark>"`` antes del ORDER BY."""
+    base, sep, order = jql.partition(" ORDER BY ")
+    return f'{base} AND updated >= "{watermark}"{sep}{order}'
+
+
+def key_in_jql(keys: list[str]) -> str:
+    return f"key in ({','.join(keys)})"
+
+
+def max_updated(raw_issues: list[dict], default: str = "") -> str:
+    """Mayor ``fields.updated`` crudo, en formato JQL ``YYYY-MM-DD HH:MM``.
+
+    Se trunca al minuto: el siguiente delta vuelve a traer los issues de ese
+    minuto, lo que es inocuo porque la fusión es por key.
+    """
+    stamps = [
+        (i.get("fields") or {}).get("updated") or "" for i in raw_issues
+    ]
+    latest = max(stamps, default="")
+    if not latest:
+        return default
+    return f"{latest[:10]} {latest[11:16]}"
+
+
+class Watermark:
+    """Marca de agua de un crawl; crearla antes de la primera petición.
+
+    ``value()`` es el inicio del crawl menos ``SAFETY_MARGIN``, en la zona
+    horaria de los ``updated`` que devuelve Jira (la del usuario de la API,
+    con la que Jira interpreta también el ``updated >=`` del JQL). Si no llegó
+    ningún ``updated`` del que sacar la zona, cae a ``max_updated``.
+    """
+
+    def __init__(self) -> None:
+        self.started = datetime.now().astimezone()
+        self._latest = ""
+        self._tz = None
+
+    def see(self, raw_issues: list[dict]) -> None:
+        """Registra una página de issues crudos."""
+        self._latest = max(self._latest, max_updated(raw_issues))
+        if self._tz is not None:
+            return
+        for issue in raw_issues:
+            stamp = (issue.get("fields") or {}).get("updated")
+            try:
+                self._tz = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%f%z").tzinfo
+                return
+            except (TypeError, ValueError):
+                continue
+
+    def value(self, default: str = "") -> str:
+        if self._tz is None:
+            return self._latest or default
+        return (self.started - SAFETY_MARGIN).astimezone(self._tz).strftime("%Y-%m-%d %H:%M")
+
+
+def _key_number(record: dict) -> int:
+    _, _, num = record["key"].rpartition("-")
+    return int(num) if num.isdigit() else 0
+
+
+def merge_by_key(existing: list[dict], changed: list[dict]) -> list[dict]:
+    """Reemplaza/agrega ``changed`` sobre ``existing`` usando ``key``.
+
+    Los issues existentes conservan su lugar (el orden created DESC del JQL);
+    los nuevos se anteponen en orden de key descendente, que dentro de un
+    mismo proyecto equivale a los más recientes primero.
+    """
+    by_key = {r["key"]: r for r in changed}
+    merged = [by_key.pop(r["key"], r) for r in existing]
+    new = sorted(by_key.values(), key=_key_number, reverse=True)
+    return new + merged
+
+
+def needs_reconcile(state: dict, hours: int = RECONCILE_HOURS) -> bool:
+    last = state.get("last_reconcile")
+    if not last:
+        return True
+    return datetime.now() - datetime.fromisoformat(last) >= timedelta(hours=hours)
+
+
+def fetch_delta(
+    state: dict,
+    jql: str,
+    search: Callable[[str, str], list[dict]],
+    fields: str,
+    local_keys: set[str],
+    force_reconcile: bool = False,
+) -> tuple[list[dict], set[str], dict]:
+    """Pide a Jira lo cambiado desde la marca de agua de ``state``.
+
+    ``search(jql, fields)`` debe devolver los issues crudos de un JQL.
+    Si toca reconciliar, compara las keys remotas con ``local_keys``: las
+    que faltan se piden completas y las que sobran se reportan como borradas.
+    Retorna ``(issues crudos cambiados, keys borradas, nuevo estado)``.
+    """
+    watermark = state["watermark"]
+    state = dict(state)
+
+    print(f"  Delta desde {watermark}...")
+    mark = Watermark()
+    raw = search(delta_jql(jql, watermark), fields)
+    print(f"  {len(raw)} issues cambiados")
+
+    gone: set[str] = set()
+    if force_reconcile or needs_reconcile(state):
+        print("  Reconciliando keys...")
+        remote = {i["key"] for i in search(jql, "key")}
+        known = local_keys | {i["key"] for i in raw}
+        gone = known - remote
+        missing = sorted(remote - known)
+        fetched: list[dict] = []
+        for start in range(0, len(missing), KEY_BATCH):
+            batch = missing[start:start + KEY_BATCH]
+            fetched.extend(search(key_in_jql(batch), fields))
+        print(f"  {len(gone)} eliminados, {len(fetched)} recuperados")
+        state["last_reconcile"] = datetime.now().isoformat(timespec="seconds")
+        raw = raw + fetched
+
+    mark.see(raw)
+    state["watermark"] = mark.value(default=watermark)
+    return raw, gone, state
+
+
+def apply_delta(
+    records: list[dict],
+    raw: list[dict],
+    clean: Callable[[dict], dict],
+    gone: set[str] | None = None,
+    keep: Callable[[dict], bool] | None = None,
+) -> list[dict]:
+    """Fusiona los issues crudos ``raw`` sobre ``records`` ya limpios.
+
+    ``keep`` filtra qué issues pertenecen al dataset (p. ej. sólo épicas);
+    un issue cambiado que ya no pasa el filtro se quita, igual que ``gone``.
+    """
+    gone = set(gone or ())
+    if keep is not None:
+        gone |= {i["key"] for i in raw if not keep(i)}
+        raw = [i for i in raw if keep(i)]
+    records = [r for r in records if r["key"] not in gone]
+    return merge_by_key(records, [clean(i) for i in raw])
+
+
+def sync_incremental(
+    output_path: Path,
+    jql: str,
+    search: Callable[[str, str], list[dict]],
+    fields: str,
+    clean: Callable[[dict], dict],
+    force_reconcile: bool = False,
+) -> tuple[list[dict], list[dict], set[str], dict] | None:
+    """Aplica un delta sobre el dataset de ``output_path``.
+
+    Retorna ``(registros limpios fusionados, registros cambiados, keys
+    borradas, nuevo estado)``, o None si no
+    hay dataset o marca de agua previa (hay que hacer una extracción
+    completa). El estado se guarda con ``save_state`` después de escribir
+    el dataset, para no avanzar la marca de agua si la escritura falla.
+    """
+    state = load_state(output_path)
+    if not state.get("watermark") or not output_path.exists():
+        return None
+    records = json.loads(output_path.read_text(encoding="utf-8"))
+
+    raw, gone, state = fetch_delta(
+        state, jql, search, fields, {r["key"] for r in records},
+        force_reconcile=force_reconcile,
+    )
+    merged = apply_delta(records, raw, clean, gone)
+    by_key = {r["key"]: r for r in merged}
+    changed = [by_key[i["key"]] for i in raw if i["key"] in by_key]
+    return merged, changed, gone, state
+
+
+def full_sync_state(watermark: str) -> dict:
+    """Estado tras una extracción completa (equivale a reconciliar).
+
+    ``watermark`` es el ``Watermark.value()`` del crawl.
+    """
+    return {
+        "watermark": watermark,
+        "last_reconcile": datetime.now().isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,228 @@
+"""Cliente Jira compartido por los extractores.
+
+Una sola Session con pool de conexiones keep-alive y gzip, reintentos con
+backoff exponencial (respetando ``Retry-After`` en 429/503) y contadores de
+peticiones, bytes y latencia. Lee credenciales desde .env:
+
+    JIRA_URL=https://jira.example.com
+    JIRA_EMAIL=... + JIRA_TOKEN=...   # auth básica
+    JIRA_COOKIE=...                   # o cookie de sesión
+    JIRA_WORKERS=8                    # peticiones concurrentes (opcional)
+"""
+
+import random
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from pathlib import Path
+
+import requests
+from dotenv import dotenv_values
+from requests.adapters import HTTPAdapter
+
+ROOT = Path(__file__).resolve().parent.parent
+ENV_PATH = ROOT / ".env"
+
+DEFAULT_WORKERS = 8
+PAGE_SIZE = 100
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0  # segundos; se duplica en cada reintento
+BACKOFF_MAX = 60.0
+RETRY_STATUS = {429, 502, 503, 504}
+
+
+class JiraError(RuntimeError):
+    """Respuesta no recuperable de Jira (o reintentos agotados)."""
+
+
+def load_config() -> dict[str, str]:
+    """Carga variables desde .env y valida que haya credenciales."""
+    if not ENV_PATH.exists():
+        sys.exit(f"ERROR: No se encontró {ENV_PATH}")
+
+    config = dotenv_values(ENV_PATH)
+    if not config.get("JIRA_URL"):
+        sys.exit("ERROR: JIRA_URL está vacía en .env")
+
+    has_basic = config.get("JIRA_EMAIL") and config.get("JIRA_TOKEN")
+    has_cookie = config.get("JIRA_COOKIE")
+
+    if not has_basic and not has_cookie:
+        sys.exit(
+            "ERROR: Necesitas JIRA_EMAIL+JIRA_TOKEN o JIRA_COOKIE en .env"
+        )
+
+    return config
+
+
+def build_session(
+    config: dict[str, str], pool_size: int = DEFAULT_WORKERS,
+) -> requests.Session:
+    """Session autenticada con pool de conexiones del tamaño de los workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 4))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+
+    if config.get("JIRA_EMAIL") and config.get("JIRA_TOKEN"):
+        session.auth = (config["JIRA_EMAIL"], config["JIRA_TOKEN"])
+    else:
+        session.headers["Cookie"] = config["JIRA_COOKIE"]
+
+    return session
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """Segundos indicados por ``Retry-After`` (entero o fecha HTTP)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class JiraClient:
+    """Acceso a la REST API de Jira con reintentos y métricas."""
+
+    def __init__(
+        self, config: dict[str, str], workers: int = DEFAULT_WORKERS,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self.base_url = config["JIRA_URL"].rstrip("/")
+        self.workers = max(workers, 1)
+        self.max_retries = max_retries
+        self.session = build_session(config, pool_size=self.workers)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @classmethod
+    def from_env(cls, workers: int | None = None) -> "JiraClient":
+        config = load_config()
+        if workers is None:
+            workers = int(config.get("JIRA_WORKERS") or DEFAULT_WORKERS)
+        return cls(config, workers=workers)
+
+    def browse_url(self, key: str) -> str:
+        return f"{self.base_url}/browse/{key}"
+
+    def _record(self, response: requests.Response, elapsed: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes += len(response.content)
+            self.seconds += elapsed
+
+    def get(
+        self, path: str, params: dict | None = None, timeout: int = 30,
+    ) -> requests.Response:
+        """GET con backoff exponencial ante 429/5xx y errores de red.
+
+        Lanza JiraError si la respuesta no es 200 o se agotan los reintentos
+        (``max_retries``); si fue un error de red, queda en ``__cause__``.
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            wait = min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX)
+            wait += random.uniform(0, wait / 4)
+            start = time.perf_counter()
+            try:
+                r = self.session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt == self.max_retries:
+                    raise JiraError(f"Sin respuesta de Jira: {exc}") from exc
+            else:
+                self._record(r, time.perf_counter() - start)
+                if r.status_code == 200:
+                    return r
+                if r.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                    raise JiraError(f"Jira error {r.status_code}: {r.text[:300]}")
+                retry_after = _retry_after(r)
+                if retry_after is not None:
+                    wait = retry_after
+            with self._lock:
+                self.retries += 1
+            time.sleep(wait)
+        raise JiraError(f"Reintentos agotados para {url}")
+
+    def get_json(self, path: str, params: dict | None = None, timeout: int = 30):
+        return self.get(path, params=params, timeout=timeout).json()
+
+    def _search_page(self, jql: str, fields: str, start_at: int) -> dict:
+        params = {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": PAGE_SIZE,
+            "fields": fields,
+        }
+        return self.get_json("/rest/api/2/search", params=params)
+
+    def iter_search(
+        self, jql: str, fields: str, label: str = "issues",
+    ) -> Iterator[list[dict]]:
+        """Itera las páginas de un JQL de /rest/api/2/search, en orden.
+
+        La primera página da el ``total``; el resto de offsets ``startAt`` se
+        piden en paralelo con un pool de ``workers`` hilos, con a lo sumo
+        ``2 * workers`` páginas en vuelo para que la memoria no dependa del
+        tamaño del proyecto. Con ``workers=1`` pagina secuencialmente.
+        """
+        first = self._search_page(jql, fields, 0)
+        page = first.get("issues", [])
+        total = first.get("total", 0)
+        done = len(page)
+        print(f"  Fetched {done}/{total} {label}...")
+
+        # Si algo se creó a mitad del crawl, una página puede repetir issues
+        seen: set[str] = set()
+
+        def unique(issues: list[dict]) -> list[dict]:
+            fresh = [i for i in issues if i["key"] not in seen]
+            seen.update(i["key"] for i in fresh)
+            return fresh
+
+        yield unique(page)
+
+        # Jira puede limitar maxResults por debajo de PAGE_SIZE
+        step = len(page) or PAGE_SIZE
+        offsets = iter(range(step, total, step) if page else ())
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending: deque[Future] = deque(
+                pool.submit(self._search_page, jql, fields, start)
+                for start in islice(offsets, 2 * self.workers)
+            )
+            while pending:
+                issues = pending.popleft().result().get("issues", [])
+                for start in islice(offsets, 1):
+                    pending.append(pool.submit(self._search_page, jql, fields, start))
+                done += len(issues)
+                print(f"  Fetched {done}/{total} {label}...")
+                yield unique(issues)
+
+    def search_all(self, jql: str, fields: str, label: str = "issues") -> list[dict]:
+        """Todos los resultados de un JQL, en el orden del JQL."""
+        return [i for page in self.iter_search(jql, fields, label) for i in page]
+
+    def summary(self) -> str:
+        """Resumen de tráfico para los logs del build."""
+        avg_ms = self.seconds / self.requests * 1000 if self.requests else 0
+        return (
+            f"{self.requests} peticiones ({self.retries} reintentos), "
+            f"{self.bytes / 1024:,.0f} KB, latencia media {avg_ms:,.0f} ms"
+        )
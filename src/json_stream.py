@@ -0,0 +1,60 @@
+"""Escritura incremental de arrays JSON con reemplazo atómico.
+
+``JsonArrayWriter`` escribe registro a registro en un archivo temporal junto
+al destino y al cerrar lo renombra con ``os.replace``. El resultado es
+idéntico a ``json.dumps(records, indent=2, ensure_ascii=False)`` sin tener la
+lista completa (ni el string) en memoria. Si hay una excepción se borra el
+temporal y el archivo anterior queda intacto.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from types import TracebackType
+
+
+class JsonArrayWriter:
+    """Context manager: ``with JsonArrayWriter(path) as out: out.write(rec)``."""
+
+    def __init__(self, path: Path, indent: int = 2) -> None:
+        self.path = Path(path)
+        self.indent = indent
+        self.count = 0
+        self._fh = None
+        self._tmp = ""
+
+    def __enter__(self) -> "JsonArrayWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(
+            prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent,
+        )
+        self._fh = os.fdopen(fd, "w", encoding="utf-8")
+        self._fh.write("[")
+        return self
+
+    def write(self, record: dict) -> None:
+        pad = " " * self.indent
+        body = json.dumps(record, indent=self.indent, ensure_ascii=False)
+        self._fh.write("," if self.count else "")
+        self._fh.write(f"\n{pad}" + body.replace("\n", f"\n{pad}"))
+        self.count += 1
+
+    def write_all(self, records) -> None:
+        for record in records:
+            self.write(record)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self._fh.write("\n]" if self.count else "]")
+        self._fh.close()
+        if exc_type is None:
+            os.chmod(self._tmp, 0o644)  # mkstemp crea el archivo con 0600
+            os.replace(self._tmp, self.path)
+        else:
+            os.unlink(self._tmp)
@@ -8,8 +8,18 @@ Genera métricas por dominio: servicios, cycle time, lead time.
 import json
 import re
 from collections import Counter, defaultdict
+from concurrent.futures import Executor
+from contextlib import closing
 from datetime import date, datetime
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+import store
+from profiling import measured_call, record, stage, tracing_memory
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 ROOT = Path(__file__).resolve().parent.parent
 CUTOFF_DATE = "2026-01-15"
@@ -107,17 +117,17 @@ def _avg(values: list[int]) -> float:
     return round(sum(values) / len(values), 1) if values else 0
 
 
-def _time_by_service(issues: list[dict], time_fn) -> dict[str, float]:
-    """Promedio de tiempo (cycle/lead) agrupado por servicio."""
+def _time_by_service(issues: list[dict], field: str) -> dict[str, float]:
+    """Promedio de tiempo (``cycle_time``/``lead_time``) agrupado por servicio.
+
+    Usa los campos que ya calculó ``enrich_issue``.
+    """
     buckets: dict[str, list[int]] = defaultdict(list)
     for iss in issues:
-        days = time_fn(iss)
+        days = iss[field]
         if days is None:
             continue
-        services = _get_by_prefix(iss.get("components", []), "3")
-        if not services:
-            services = ["Sin servicio"]
-        for svc in services:
+        for svc in iss["servicios"] or ["Sin servicio"]:
             buckets[svc].append(days)
     return {k: _avg(v) for k, v in sorted(buckets.items(), key=lambda x: -_avg(x[1]))}
 
@@ -181,11 +191,26 @@ def build_time_series(issues: list[dict]) -> dict:
 #  Carga y filtrado                                                   #
 # ------------------------------------------------------------------ #
 
+# La base se usa sólo si el dataset está al día con su JSON (store.is_current);
+# si no (nunca se escribió ahí, o el JSON llegó por git), se lee el JSON
+
 def load_epics() -> list[dict]:
+    if store.exists():
+        with closing(store.connect()) as conn:
+            if store.is_current(conn, "epics"):
+                return store.load(conn, "epics")
     return json.loads((ROOT / "data" / "epics.json").read_text(encoding="utf-8"))
 
 
 def load_all_issues() -> list[dict]:
+    if store.exists():
+        with closing(store.connect()) as conn:
+            if store.is_current(conn, "issues"):
+                # Mismo filtro que abajo, con los índices de issuetype/updated
+                return store.load(
+                    conn, "issues", "issuetype = ? OR updated >= ?",
+                    ("Épica", ISSUES_UPDATED_SINCE),
+                )
     path = ROOT / "data" / "all_issues.json"
     if not path.exists():
         return []
@@ -197,6 +222,55 @@ def load_all_issues() -> list[dict]:
     ]
 
 
+def load_issues_frame(
+    columns: list[str] | None = None,
+    dataset: str = "issues",
+    relevant_only: bool = True,
+) -> "pd.DataFrame":
+    """Lee el snapshot Parquet de ``dataset`` con sólo ``columns``.
+
+    Con ``relevant_only`` aplica el mismo filtro que ``load_all_issues``
+    (épicas o updated >= ISSUES_UPDATED_SINCE) al leer, sin materializar el
+    resto de filas. Requiere el snapshot al día (``snapshot.is_current``).
+    pandas y pyarrow se importan aquí: sólo los paga el motor pandas.
+    """
+    import pandas as pd
+
+    import snapshot
+
+    path, _ = snapshot.snapshot_paths(dataset)
+    filters = None
+    if relevant_only and dataset == "issues":
+        filters = [
+            [("issuetype", "==", "Épica")],
+            [("updated", ">=", ISSUES_UPDATED_SINCE)],
+        ]
+    return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+def load_tags_frame(
+    dataset: str = "issues",
+    kind: str | None = None,
+    keys: "pd.Series | None" = None,
+    columns: list[str] | None = None,
+) -> "pd.DataFrame":
+    """Tabla larga de components/labels (key, kind, position, name, prefix, value).
+
+    ``kind`` filtra por "component" o "label"; ``keys`` restringe a esas keys
+    y ``columns`` a esas columnas (en el orden en que se escribieron).
+    """
+    import pandas as pd
+
+    import snapshot
+
+    _, path = snapshot.snapshot_paths(dataset)
+    filters = [("kind", "==", kind)] if kind else None
+    tags = pd.read_parquet(path, columns=columns, filters=filters)
+    if keys is not None:
+        tags = tags[tags["key"].isin(keys)]
+    return tags
+
+
 def filter_relevant(epics: list[dict]) -> list[dict]:
     return [
         e for e in epics
@@ -332,6 +406,9 @@ def _issue_slim(issue: dict) -> dict:
         "ct": issue.get("cycle_time"),
         "lt": issue.get("lead_time"),
         "ek": issue.get("epic_key", ""),
+        "su": issue["summary"][:80],
+        # URL de Jira sin la key: un solo valor en el diccionario de la columna
+        "ub": issue.get("url", "").removesuffix(issue["key"]),
     }
 
 
@@ -345,14 +422,25 @@ def _collect_weeks(issues: list[dict]) -> list[str]:
 #  Métricas por dominio                                               #
 # ------------------------------------------------------------------ #
 
+def partition_by_domain(records: list[dict]) -> dict[str, list[dict]]:
+    """Agrupa épicas o issues enriquecidos por dominio en una sola pasada.
+
+    Cada registro aparece una vez en cada uno de sus dominios, en el orden
+    original de ``records``.
+    """
+    buckets: dict[str, list[dict]] = defaultdict(list)
+    for rec in records:
+        for d in dict.fromkeys(rec.get("dominios", [])):
+            buckets[d].append(rec)
+    return buckets
+
+
 def compute_domain_metrics(
     domain_name: str,
-    epics: list[dict],
-    all_issues: list[dict],
+    dom_epics: list[dict],
+    dom_issues: list[dict],
 ) -> dict:
-    dom_epics = [e for e in epics if domain_name in e.get("dominios", [])]
-    dom_issues = [i for i in all_issues if domain_name in i.get("dominios", [])]
-
+    """Métricas de un dominio a partir de sus épicas e issues (ya particionados)."""
     active = [e for e in dom_epics if e["status"] in {"Work in Progress", "In Progress"}]
     blocked = [e for e in dom_epics if e["status"] == "Blocked"]
     resolved = sum(1 for e in dom_epics if e["resolution"])
@@ -387,8 +475,8 @@ def compute_domain_metrics(
         "issuetype_dist": _count([i["issuetype"] for i in dom_issues]),
         "status_dist": _count([i["status"] for i in dom_issues]),
         "assignee_dist": _count([i["assignee"] for i in dom_issues]),
-        "cycle_time_by_service": _time_by_service(dom_issues, compute_cycle_time),
-        "lead_time_by_service": _time_by_service(dom_issues, compute_lead_time),
+        "cycle_time_by_service": _time_by_service(dom_issues, "cycle_time"),
+        "lead_time_by_service": _time_by_service(dom_issues, "lead_time"),
         "time_series": build_time_series(dom_issues),
         "issues_slim": [_issue_slim(i) for i in dom_issues],
         "weeks": _collect_weeks(dom_issues),
@@ -399,31 +487,70 @@ def compute_domain_metrics(
 #  Pipeline principal                                                 #
 # ------------------------------------------------------------------ #
 
-def compute_all_metrics() -> dict:
-    raw = load_epics()
-    filtered = filter_relevant(raw)
-    epics = [enrich_epic(e) for e in filtered]
+def compute_all_metrics(pool: Executor | None = None) -> dict:
+    """Contexto completo del dashboard.
+
+    Con ``pool`` (p. ej. un ``ProcessPoolExecutor``) las métricas de cada
+    dominio se calculan en paralelo; el resultado es idéntico al secuencial.
+    """
+    with stage("load_epics"):
+        raw = load_epics()
+    with stage("enrich_epics"):
+        filtered = filter_relevant(raw)
+        epics = [enrich_epic(e) for e in filtered]
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    all_issues_raw = load_all_issues()
-    all_issues = [enrich_issue(i) for i in all_issues_raw]
+    with stage("load_issues"):
+        all_issues_raw = load_all_issues()
+    with stage("enrich_issues"):
+        all_issues = [enrich_issue(i) for i in all_issues_raw]
 
+    # Dominios
+    with stage("partition"):
+        epics_by_domain = partition_by_domain(epics)
+        issues_by_domain = partition_by_domain(all_issues)
+    domain_names = set(epics_by_domain) | set(issues_by_domain)
+
+    names = sorted(domain_names)
+    with stage("domains"):
+        if pool is None:
+            domains = []
+            for d in names:
+                with stage(d):
+                    domains.append(
+                        compute_domain_metrics(d, epics_by_domain[d], issues_by_domain[d])
+                    )
+        else:
+            # map conserva el orden de los dominios; cada worker devuelve sus
+            # medidas para que el perfil tenga también una entrada por dominio
+            measured = pool.map(
+                partial(measured_call, compute_domain_metrics, tracing_memory()),
+                names,
+                [epics_by_domain[d] for d in names],
+                [issues_by_domain[d] for d in names],
+            )
+            domains = []
+            for d, (dom, measures) in zip(names, measured):
+                record(d, measures)
+                domains.append(dom)
+
+    with stage("global"):
+        return _global_metrics(now, raw, epics, all_issues, domains, domain_names)
+
+
+def _global_metrics(
+    now: str,
+    raw: list[dict],
+    epics: list[dict],
+    all_issues: list[dict],
+    domains: list[dict],
+    domain_names: set[str],
+) -> dict:
+    """Métricas globales y contexto final de ``compute_all_metrics``."""
     active = [e for e in epics if e["status"] in {"Work in Progress", "In Progress"}]
     blocked = [e for e in epics if e["status"] == "Blocked"]
     done_recent = [e for e in epics if e["status"] == "Listo"]
 
-    # Dominios
-    domain_names: set[str] = set()
-    for e in epics:
-        domain_names.update(e.get("dominios", []))
-    for i in all_issues:
-        domain_names.update(i.get("dominios", []))
-
-    domains = [
-        compute_domain_metrics(d, epics, all_issues)
-        for d in sorted(domain_names)
-    ]
-
     # Global cycle/lead time
     ct_all = [i["cycle_time"] for i in all_issues if i["cycle_time"] is not None]
     lt_all = [i["lead_time"] for i in all_issues if i["lead_time"] is not None]
@@ -464,8 +591,8 @@ def compute_all_metrics() -> dict:
         },
         "avg_cycle_time": _avg(ct_all),
         "avg_lead_time": _avg(lt_all),
-        "cycle_time_by_service": _time_by_service(all_issues, compute_cycle_time),
-        "lead_time_by_service": _time_by_service(all_issues, compute_lead_time),
+        "cycle_time_by_service": _time_by_service(all_issues, "cycle_time"),
+        "lead_time_by_service": _time_by_service(all_issues, "lead_time"),
         "service_dist_global": _count(
             [s for i in all_issues for s in i.get("servicios", [])]
         ),
@@ -0,0 +1,449 @@
+"""Motor vectorizado (pandas/numpy) para las métricas de issues.
+
+Alternativa a ``metrics.compute_all_metrics``: cycle/lead time, semanas,
+dominios/servicios, distribuciones, promedios por servicio y límites SPC se
+calculan por columnas y con groupby en lugar de recorrer cada issue en
+Python. Las épicas (pocas) siguen usando las funciones de metrics.py.
+
+Los issues se leen del snapshot Parquet (snapshot.py) si está al día, ya
+como columnas; si no, con ``metrics.load_all_issues`` (SQLite o JSON).
+
+El contexto resultante es idéntico al del motor Python, incluidos el orden
+de los empates de ``Counter.most_common`` y el redondeo de ``round``. Para
+comprobarlo contra los datos actuales:
+
+    python src/metrics_pandas.py
+"""
+
+import json
+import sys
+from collections import Counter
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+import metrics
+import snapshot
+from metrics import (
+    CUTOFF_DATE,
+    _count,
+    _count_nested,
+    _parse_date,
+    build_gantt_items,
+    enrich_epic,
+    filter_relevant,
+    load_all_issues,
+    load_epics,
+    load_issues_frame,
+    load_tags_frame,
+    partition_by_domain,
+)
+from profiling import stage
+from store import DATASETS
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+# ------------------------------------------------------------------ #
+#  Columnas derivadas                                                 #
+# ------------------------------------------------------------------ #
+
+def _ordinals(values: pd.Series) -> np.ndarray:
+    """Fechas 'YYYY-MM-DD...' como ordinales (NaN si ``_parse_date`` da None).
+
+    Lo que pandas no parsea se vuelve a intentar con ``_parse_date``, así
+    ambos motores aceptan y rechazan exactamente las mismas fechas.
+    """
+    values = values.fillna("").astype(object)
+    text = values.str[:10].where(values.str.len() >= 10)
+    parsed = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    days = parsed.to_numpy().astype("datetime64[D]")
+    out = np.where(np.isnat(days), np.nan, days.astype(np.int64) + _EPOCH_ORDINAL)
+    for pos in np.flatnonzero(np.isnan(out) & (values.str.len() >= 10).to_numpy()):
+        d = _parse_date(values.iat[pos])
+        if d:
+            out[pos] = d.toordinal()
+    return out
+
+
+def _days_between(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """``metrics._days_between`` por columnas: fin vacío o inválido = hoy."""
+    end = np.where(np.isnan(end), metrics.TODAY.toordinal(), end)
+    return np.maximum(end - start, 0)
+
+
+def _week_labels(updated: np.ndarray) -> list[str]:
+    """``metrics._week_label`` por columnas ('Sem <lunes>' o '')."""
+    monday = updated - (updated - 1) % 7  # el ordinal 1 (0001-01-01) es lunes
+    codes, uniques = pd.factorize(monday, use_na_sentinel=True)
+    labels = [f"Sem {date.fromordinal(int(o)).isoformat()}" for o in uniques]
+    return [labels[c] if c >= 0 else "" for c in codes]
+
+
+def _by_prefix(components: pd.Series, prefix: str) -> pd.Series:
+    """Pares (fila, valor) de ``metrics._get_by_prefix``, en orden."""
+    exploded = components.explode().dropna()
+    exploded = exploded[exploded.str.startswith(f"{prefix}.")]
+    return exploded.str.split(".", n=1).str[1].str.replace("_", " ", regex=False)
+
+
+class _Pairs:
+    """Relación fila -> valores (p. ej. servicios) con acceso por subconjunto.
+
+    Los pares se guardan ordenados por fila; ``select(rows)`` devuelve los
+    pares de esas filas en O(pares seleccionados), sin recorrer el total.
+    """
+
+    def __init__(self, pairs: pd.Series, n_rows: int) -> None:
+        self.rows = pairs.index.to_numpy(dtype=np.int64)
+        self.values = pairs.to_numpy(dtype=object)
+        self.counts = np.bincount(self.rows, minlength=n_rows)
+        self.offsets = np.concatenate(([0], np.cumsum(self.counts)[:-1]))
+
+    def lists(self) -> list[list]:
+        return [
+            list(self.values[o:o + c]) for o, c in zip(self.offsets, self.counts)
+        ]
+
+    def select(self, rows: np.ndarray) -> np.ndarray:
+        counts = self.counts[rows]
+        starts = self.offsets[rows]
+        base = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return base + np.arange(counts.sum())
+
+
+# ------------------------------------------------------------------ #
+#  Agregados                                                          #
+# ------------------------------------------------------------------ #
+
+def _avg_of(total: int, n: int) -> float:
+    return round(total / n, 1) if n else 0
+
+
+def _count_values(values: np.ndarray) -> dict:
+    """``dict(Counter(values).most_common())`` vía factorize + bincount."""
+    if not len(values):
+        return {}
+    codes, uniques = pd.factorize(values)
+    counts = np.bincount(codes)
+    order = np.argsort(-counts, kind="stable")
+    return {uniques[i]: int(counts[i]) for i in order}
+
+
+def _time_by_service(days: np.ndarray, services: np.ndarray) -> dict[str, float]:
+    """``metrics._time_by_service`` sobre pares (días, servicio)."""
+    mask = ~np.isnan(days)
+    days, services = days[mask], services[mask]
+    if not len(days):
+        return {}
+    codes, uniques = pd.factorize(services)
+    totals = np.bincount(codes, weights=days)
+    counts = np.bincount(codes)
+    avgs = [_avg_of(int(t), int(c)) for t, c in zip(totals, counts)]
+    order = sorted(range(len(avgs)), key=lambda i: -avgs[i])
+    return {uniques[i]: avgs[i] for i in order}
+
+
+def _spc(created: np.ndarray, keys: np.ndarray, days: np.ndarray) -> dict:
+    """Una serie de ``metrics.build_time_series`` (puntos, media, UCL, LCL)."""
+    mask = ~np.isnan(days)
+    vals = days[mask]
+    points = [
+        {"x": x, "y": int(y), "key": k}
+        for x, y, k in zip(created[mask], vals, keys[mask])
+    ]
+    n = len(vals)
+    total = int(vals.sum())
+    mean = _avg_of(total, n)
+    std = 0.0
+    if n >= 2:
+        # cumsum suma en el mismo orden que sum() de Python (sin pairwise)
+        exact_mean = total / n
+        std = float(np.cumsum((vals - exact_mean) ** 2)[-1]) / n
+        std = std ** 0.5
+    std = round(std, 1)
+    return {
+        "points": points,
+        "mean": mean,
+        "ucl": round(mean + 2 * std, 1),
+        "lcl": round(max(mean - 2 * std, 0), 1),
+    }
+
+
+class IssueFrame:
+    """Issues enriquecidos como columnas numpy/pandas."""
+
+    COLUMNS = [
+        "key", "issuetype", "status", "assignee", "created", "updated",
+        "resolution_date", "start_date", "components",
+    ]
+
+    def __init__(self, issues: list[dict], df: pd.DataFrame | None = None) -> None:
+        """``df``: las mismas filas ya como DataFrame (del snapshot Parquet)."""
+        self.issues = issues
+        if df is None:
+            df = pd.DataFrame.from_records(issues, columns=self.COLUMNS)
+        else:
+            df = df[self.COLUMNS]
+        if df.empty:
+            df = df.astype(object)
+        n = len(df)
+        self.n = n
+
+        resolved = _ordinals(df["resolution_date"])
+        self.cycle = _days_between(_ordinals(df["start_date"]), resolved)
+        self.lead = _days_between(_ordinals(df["created"]), resolved)
+        self.weeks = _week_labels(_ordinals(df["updated"]))
+
+        components = df["components"].apply(lambda c: c or [])
+        self.dominios = _Pairs(_by_prefix(components, "1"), n)
+        self.servicios = _Pairs(_by_prefix(components, "3"), n)
+
+        # Para promedios por servicio: "Sin servicio" si no tiene ninguno
+        no_service = pd.Series(
+            "Sin servicio", index=np.flatnonzero(self.servicios.counts == 0),
+        )
+        with_fallback = pd.concat([
+            pd.Series(self.servicios.values, index=self.servicios.rows),
+            no_service,
+        ]).sort_index(kind="stable")
+        self.services_or_none = _Pairs(with_fallback, n)
+
+        self.keys = df["key"].to_numpy(dtype=object)
+        self.created = df["created"].fillna("").to_numpy(dtype=object)
+        self.issuetype = df["issuetype"].to_numpy(dtype=object)
+        self.status = df["status"].to_numpy(dtype=object)
+        self.assignee = df["assignee"].to_numpy(dtype=object)
+        self.all_rows = np.arange(n)
+
+    def enrich(self) -> None:
+        """Escribe en los dicts los mismos campos que ``metrics.enrich_issue``."""
+        dominios = self.dominios.lists()
+        servicios = self.servicios.lists()
+        for i, issue in enumerate(self.issues):
+            ct, lt = self.cycle[i], self.lead[i]
+            issue["dominios"] = dominios[i]
+            issue["servicios"] = servicios[i]
+            issue["dominio"] = ", ".join(dominios[i])
+            issue["servicio"] = ", ".join(servicios[i])
+            issue["cycle_time"] = None if np.isnan(ct) else int(ct)
+            issue["lead_time"] = None if np.isnan(lt) else int(lt)
+            issue["week"] = self.weeks[i]
+        self.slim = [metrics._issue_slim(i) for i in self.issues]
+
+    def domain_rows(self) -> dict[str, np.ndarray]:
+        """Filas de cada dominio (orden original), en una sola pasada."""
+        pairs = pd.DataFrame({"row": self.dominios.rows, "dom": self.dominios.values})
+        pairs = pairs.drop_duplicates()
+        return {
+            name: group["row"].to_numpy()
+            for name, group in pairs.groupby("dom", sort=False)
+        }
+
+    def aggregates(self, rows: np.ndarray) -> dict:
+        """Agregados de issues de ``compute_domain_metrics`` para ``rows``."""
+        ct, lt = self.cycle[rows], self.lead[rows]
+        svc_idx = self.servicios.select(rows)
+        fb_idx = self.services_or_none.select(rows)
+        fb_rows = self.services_or_none.rows[fb_idx]
+        fb_values = self.services_or_none.values[fb_idx]
+        order = rows[np.argsort(self.created[rows], kind="stable")]
+        return {
+            "ct_sum": int(np.nansum(ct)), "ct_n": int((~np.isnan(ct)).sum()),
+            "lt_sum": int(np.nansum(lt)), "lt_n": int((~np.isnan(lt)).sum()),
+            "service_dist": _count_values(self.servicios.values[svc_idx]),
+            "issuetype_dist": _count_values(self.issuetype[rows]),
+            "status_dist": _count_values(self.status[rows]),
+            "assignee_dist": _count_values(self.assignee[rows]),
+            "cycle_time_by_service": _time_by_service(self.cycle[fb_rows], fb_values),
+            "lead_time_by_service": _time_by_service(self.lead[fb_rows], fb_values),
+            "time_series": {
+                "cycle_time": _spc(
+                    self.created[order], self.keys[order], self.cycle[order],
+                ),
+                "lead_time": _spc(
+                    self.created[order], self.keys[order], self.lead[order],
+                ),
+            },
+            "issues": [self.issues[i] for i in rows],
+            "issues_slim": [self.slim[i] for i in rows],
+            "weeks": sorted({self.weeks[i] for i in rows} - {""}),
+        }
+
+
+# ------------------------------------------------------------------ #
+#  Pipeline                                                           #
+# ------------------------------------------------------------------ #
+
+def _pylist(values: pd.Series) -> list:
+    """Valores como objetos de Python, con None (como en el JSON) para los nulos."""
+    if values.hasnans:
+        values = values.astype(object).where(values.notna(), None)
+    return values.tolist()
+
+
+def load_issues() -> tuple[list[dict], pd.DataFrame | None]:
+    """Issues relevantes como dicts y, si vienen del snapshot, como DataFrame.
+
+    Mismos registros y orden que ``load_all_issues``; sin snapshot al día
+    (``snapshot.is_current``) se usa esa función y el DataFrame es None.
+    """
+    if not snapshot.is_current("issues"):
+        return load_all_issues(), None
+    df = load_issues_frame()
+    tags = load_tags_frame(columns=["key", "kind", "name"])
+    # Listas por key armadas con zip: groupby(...).agg(list) y
+    # to_dict("records") tardan varias veces más que leer el snapshot
+    lists: dict[str, dict[str, list[str]]] = {kind: {} for kind in snapshot.TAG_KINDS.values()}
+    for key, kind, name in zip(*(_pylist(tags[c]) for c in ("key", "kind", "name"))):
+        lists[kind].setdefault(key, []).append(name)
+    keys = _pylist(df["key"])
+    for field, kind in snapshot.TAG_KINDS.items():
+        df[field] = [lists[kind].get(key, []) for key in keys]
+    columns = list(DATASETS["issues"])
+    issues = [
+        dict(zip(columns, row))
+        for row in zip(*(_pylist(df[c]) for c in columns))
+    ]
+    return issues, df
+
+
+def _domain_metrics(name: str, dom_epics: list[dict], agg: dict) -> dict:
+    active = [e for e in dom_epics if e["status"] in {"Work in Progress", "In Progress"}]
+    blocked = [e for e in dom_epics if e["status"] == "Blocked"]
+    resolved = sum(1 for e in dom_epics if e["resolution"])
+    return {
+        "name": name,
+        "slug": name.lower().replace(" ", "-"),
+        "total_epics": len(dom_epics),
+        "total_issues": len(agg["issues"]),
+        "active": len(active),
+        "blocked": len(blocked),
+        "blocked_epics": blocked,
+        "resolved": resolved,
+        "resolution_rate": round(resolved / len(dom_epics) * 100, 1) if dom_epics else 0,
+        "avg_cycle_time": _avg_of(agg["ct_sum"], agg["ct_n"]),
+        "avg_lead_time": _avg_of(agg["lt_sum"], agg["lt_n"]),
+        "gantt": build_gantt_items(dom_epics),
+        "epics": dom_epics,
+        "issues": agg["issues"],
+        "service_dist": agg["service_dist"],
+        "issuetype_dist": agg["issuetype_dist"],
+        "status_dist": agg["status_dist"],
+        "assignee_dist": agg["assignee_dist"],
+        "cycle_time_by_service": agg["cycle_time_by_service"],
+        "lead_time_by_service": agg["lead_time_by_service"],
+        "time_series": agg["time_series"],
+        "issues_slim": agg["issues_slim"],
+        "weeks": agg["weeks"],
+    }
+
+
+def compute_all_metrics() -> dict:
+    """Mismo contexto que ``metrics.compute_all_metrics``, vectorizado."""
+    with stage("load_epics"):
+        raw = load_epics()
+    with stage("enrich_epics"):
+        filtered = filter_relevant(raw)
+        epics = [enrich_epic(e) for e in filtered]
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    with stage("load_issues"):
+        issues, df = load_issues()
+    with stage("enrich_issues"):
+        frame = IssueFrame(issues, df)
+        frame.enrich()
+    all_issues = frame.issues
+
+    active = [e for e in epics if e["status"] in {"Work in Progress", "In Progress"}]
+    blocked = [e for e in epics if e["status"] == "Blocked"]
+    done_recent = [e for e in epics if e["status"] == "Listo"]
+
+    with stage("partition"):
+        epics_by_domain = partition_by_domain(epics)
+        rows_by_domain = frame.domain_rows()
+    domain_names = set(epics_by_domain) | set(rows_by_domain)
+
+    empty = np.array([], dtype=np.int64)
+    domains = []
+    with stage("domains"):
+        for d in sorted(domain_names):
+            with stage(d):
+                domains.append(_domain_metrics(
+                    d, epics_by_domain.get(d, []),
+                    frame.aggregates(rows_by_domain.get(d, empty)),
+                ))
+
+    with stage("global"):
+        overall = frame.aggregates(frame.all_rows)
+    resolved = sum(1 for e in epics if e["resolution"])
+
+    return {
+        "generated_at": now,
+        "cutoff_date": CUTOFF_DATE,
+        "total_raw": len(raw),
+        "total_epics": len(epics),
+        "total_all_issues": len(all_issues),
+        "epics": epics,
+        "status_dist": _count([e["status"] for e in epics]),
+        "dominio_dist": _count_nested(epics, "comp_parsed.Dominio"),
+        "equipo_df_dist": _count_nested(epics, "comp_parsed.Equipo DF"),
+        "servicio_dist": _count_nested(
+            epics, "comp_parsed.Servicio", "label_parsed.Servicio",
+        ),
+        "app_dist": _count_nested(
+            epics, "comp_parsed.App / Producto", "label_parsed.App / Producto",
+        ),
+        "tipo_dist": _count_nested(
+            epics, "comp_parsed.Tipo (Ext/Int)", "label_parsed.Tipo (Ext/Int)",
+        ),
+        "assignee_dist": _count([e["assignee"] for e in epics]),
+        "issuetype_dist": overall["issuetype_dist"],
+        "monthly": dict(sorted(
+            Counter(e["created"][:7] for e in epics if e["created"]).items()
+        )),
+        "resolution": {
+            "total": len(epics),
+            "resolved": resolved,
+            "unresolved": len(epics) - resolved,
+            "rate_pct": round(resolved / len(epics) * 100, 1) if epics else 0,
+        },
+        "avg_cycle_time": _avg_of(overall["ct_sum"], overall["ct_n"]),
+        "avg_lead_time": _avg_of(overall["lt_sum"], overall["lt_n"]),
+        "cycle_time_by_service": overall["cycle_time_by_service"],
+        "lead_time_by_service": overall["lead_time_by_service"],
+        "service_dist_global": overall["service_dist"],
+        "time_series": overall["time_series"],
+        "issues_slim": overall["issues_slim"],
+        "weeks": overall["weeks"],
+        "active_epics": active,
+        "blocked_epics": blocked,
+        "done_recent": done_recent,
+        "gantt": build_gantt_items(epics),
+        "domains": domains,
+        "domain_names": sorted(domain_names),
+    }
+
+
+def _canonical(ctx: dict) -> str:
+    ctx = dict(ctx, generated_at="")
+    return json.dumps(ctx, ensure_ascii=False, indent=1)
+
+
+def main() -> None:
+    """Compara este motor con el de metrics.py sobre los datos actuales."""
+    expected = _canonical(metrics.compute_all_metrics())
+    got = _canonical(compute_all_metrics())
+    if expected == got:
+        print("OK: el motor pandas produce el mismo contexto que el motor Python")
+        return
+    for n, (a, b) in enumerate(zip(expected.splitlines(), got.splitlines()), 1):
+        if a != b:
+            print(f"Diferencia en la línea {n}:\n  python: {a}\n  pandas: {b}")
+            break
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
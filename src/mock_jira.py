@@ -0,0 +1,387 @@
+"""Servidor Jira local para probar y medir la extracción sin red.
+
+Sirve, con datos de synthetic.py en el formato crudo de la REST API (el
+mismo de data/epics_raw.json):
+
+    GET /rest/api/2/search   jql, startAt, maxResults, fields
+    GET /rest/api/2/field    campos del sistema y custom fields de CAMDP
+    GET /rest/api/2/myself   usuario de prueba
+
+El JQL soporta lo que usan los extractores: ``project = X``,
+``issuetype = Epic``, ``updated >= "YYYY-MM-DD HH:MM"`` y ``key in (...)``
+unidos con AND, más ``ORDER BY created DESC``. Cualquier otra cosa responde
+400, como Jira. ``maxResults`` se recorta a ``max_results`` (Jira limita a
+100). Las respuestas van con gzip si el cliente lo acepta.
+
+Para ejercitar concurrencia y reintentos se puede agregar latencia por
+petición y una proporción de respuestas 429 (con ``Retry-After``) y 503.
+
+Uso:
+    python src/mock_jira.py --issues 50000 --latency 80 --error-rate 0.02
+    # y en .env: JIRA_URL=http://127.0.0.1:8765 y JIRA_COOKIE=x
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import synthetic
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_RESULTS = 100
+EPIC_TYPES = {"epic", "épica"}
+TIMESTAMP_SUFFIX = "T09:30:00.000-0600"
+
+# /rest/api/2/field: los campos que leen los extractores
+FIELDS = [
+    {"id": fid, "name": name, "custom": fid.startswith("customfield_")}
+    for fid, name in [
+        ("summary", "Summary"), ("status", "Status"), ("issuetype", "Issue Type"),
+        ("assignee", "Assignee"), ("created", "Created"), ("updated", "Updated"),
+        ("priority", "Priority"), ("labels", "Labels"),
+        ("components", "Component/s"), ("resolution", "Resolution"),
+        ("resolutiondate", "Resolved"), ("description", "Description"),
+        ("duedate", "Due Date"), ("customfield_10007", "Epic Link"),
+        ("customfield_10400", "Planned Done Date"),
+        ("customfield_11805", "Start date"),
+    ]
+]
+MYSELF = {
+    "name": "mock", "key": "mock", "displayName": "Mock Jira",
+    "emailAddress": "mock@example.com", "active": True,
+}
+
+_CLAUSES = [
+    ("project", re.compile(r'project\s*=\s*"?([\w-]+)"?', re.I)),
+    ("issuetype", re.compile(r'issuetype\s*=\s*"?([^"]+?)"?', re.I)),
+    ("updated", re.compile(r'updated\s*>=\s*"([^"]+)"', re.I)),
+    ("key_in", re.compile(r"key\s+in\s*\(([^)]*)\)", re.I)),
+]
+
+
+class JqlError(ValueError):
+    """JQL fuera del subconjunto soportado (Jira responde 400)."""
+
+
+def parse_jql(jql: str) -> list[tuple[str, str]]:
+    """Cláusulas ``(tipo, valor)`` de un JQL con AND y ORDER BY created DESC."""
+    where, _, order = jql.partition(" ORDER BY ")
+    if order and order.strip().lower() != "created desc":
+        raise JqlError(f"ORDER BY no soportado: {order}")
+    clauses = []
+    for part in re.split(r"\s+AND\s+", where.strip(), flags=re.I):
+        for kind, pattern in _CLAUSES:
+            m = pattern.fullmatch(part.strip())
+            if m:
+                clauses.append((kind, m.group(1).strip()))
+                break
+        else:
+            raise JqlError(f"Cláusula JQL no soportada: {part!r}")
+    return clauses
+
+
+def _timestamp(day: str) -> str | None:
+    return f"{day}{TIMESTAMP_SUFFIX}" if day else None
+
+
+DESCRIPTION_WORDS = (
+    "Mapeo y disponibilización de fuentes de datos prioritarias a nivel del "
+    "Data Lake con el objetivo de habilitar el acceso centralizado a la "
+    "información clave para el negocio incluye el monitoreo continuo de la "
+    "salud y disponibilidad de cada fuente"
+).split()
+
+
+def _id(name: str) -> str:
+    return str(zlib.crc32(name.encode()) % 10**6)
+
+
+def _description(key: str) -> str:
+    """Texto largo y determinista (las descripciones reales tienen KB)."""
+    n = 20 + zlib.crc32(key.encode()) % 300
+    words = DESCRIPTION_WORDS * (n // len(DESCRIPTION_WORDS) + 1)
+    return " ".join(words[:n]) + "."
+
+
+def _named(base_url: str, kind: str, name: str, **extra) -> dict:
+    """Objeto con nombre como los de Jira: self, id, iconUrl, name..."""
+    oid = _id(name)
+    return {
+        "self": f"{base_url}/rest/api/2/{kind}/{oid}",
+        "id": oid,
+        "iconUrl": f"{base_url}/images/icons/{kind}/{oid}.png",
+        "name": name,
+        **extra,
+    }
+
+
+def to_raw(record: dict, base_url: str, n: int) -> dict:
+    """Issue limpio de synthetic.py -> issue crudo de /rest/api/2/search.
+
+    Con los objetos anidados que manda Jira (``self``, avatares,
+    ``statusCategory`` completo) y una description larga, para que los
+    bytes por issue se parezcan a los reales.
+    """
+    assignee = None
+    if record["assignee"] != "Sin asignar":
+        user = record["assignee_email"].split("@")[0]
+        avatar = f"{base_url}/secure/useravatar?ownerId={user}"
+        assignee = {
+            "self": f"{base_url}/rest/api/2/user?username={user}",
+            "name": user,
+            "key": f"JIRAUSER{_id(user)}",
+            "emailAddress": record["assignee_email"],
+            "avatarUrls": {
+                f"{px}x{px}": f"{avatar}&size={px}" for px in (48, 24, 16, 32)
+            },
+            "displayName": record["assignee"],
+            "active": True,
+            "timeZone": "America/Mexico_City",
+        }
+    category = record["status_category"]
+    resolution = record["resolution"]
+    return {
+        "expand": "operations,versionedRepresentations,editmeta,changelog,renderedFields",
+        "id": str(10_000_000 + n),
+        "self": f"{base_url}/rest/api/2/issue/{10_000_000 + n}",
+        "key": record["key"],
+        "fields": {
+            "summary": record["summary"],
+            "issuetype": _named(
+                base_url, "issuetype", record.get("issuetype", "Épica"),
+                description="", subtask=record.get("issuetype") == "Sub-tarea",
+            ),
+            "status": _named(
+                base_url, "status", record["status"],
+                description=f"Estado {record['status']} del flujo de trabajo.",
+                statusCategory={
+                    "self": f"{base_url}/rest/api/2/statuscategory/{_id(category)}",
+                    "id": int(_id(category)),
+                    "key": category.lower().replace(" ", "-"),
+                    "colorName": "default",
+                    "name": category,
+                },
+            ),
+            "assignee": assignee,
+            "priority": _named(base_url, "priority", record["priority"]),
+            "created": _timestamp(record["created"]),
+            "updated": _timestamp(record["updated"]),
+            "resolution": (
+                _named(base_url, "resolution", resolution, description="")
+                if resolution else None
+            ),
+            "resolutiondate": _timestamp(record["resolution_date"]),
+            "labels": record["labels"],
+            "components": [
+                {
+                    "self": f"{base_url}/rest/api/2/component/{_id(c)}",
+                    "id": _id(c),
+                    "name": c,
+                }
+                for c in record["components"]
+            ],
+            "description": _description(record["key"]),
+            "duedate": record["due_date"] or None,
+            "customfield_10400": record["planned_done_date"] or None,
+            "customfield_11805": record["start_date"] or None,
+            "customfield_10007": record.get("epic_key") or None,
+        },
+    }
+
+
+class MockJira:
+    """Datos y reglas del servidor (latencia, límite de página, errores)."""
+
+    def __init__(
+        self,
+        n_issues: int = 10_000,
+        n_domains: int = 8,
+        seed: int = 1,
+        latency_ms: float = 0.0,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        error_rate: float = 0.0,
+        retry_after: int = 1,
+        base_url: str = f"http://127.0.0.1:{DEFAULT_PORT}",
+    ) -> None:
+        _, records = synthetic.generate(n_issues, n_domains, seed)
+        issues = [to_raw(r, base_url, n) for n, r in enumerate(records)]
+        # Orden del JQL: created DESC (estable por key descendente)
+        issues.sort(key=lambda i: (i["fields"]["created"], int(i["key"].split("-")[1])),
+                    reverse=True)
+        self.issues = issues
+        self.project = synthetic.KEY_PREFIX
+        self.latency = latency_ms / 1000
+        self.max_results = max_results
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._matching = lru_cache(maxsize=64)(self._match)
+
+    def _match(self, jql: str) -> list[dict]:
+        result = self.issues
+        for kind, value in parse_jql(jql):
+            if kind == "project":
+                if value.upper() != self.project:
+                    return []
+            elif kind == "issuetype":
+                # Jira acepta el nombre en inglés o el traducido
+                wanted = EPIC_TYPES if value.lower() in EPIC_TYPES else {value.lower()}
+                result = [
+                    i for i in result
+                    if i["fields"]["issuetype"]["name"].lower() in wanted
+                ]
+            elif kind == "updated":
+                since = value.replace(" ", "T")
+                result = [i for i in result if i["fields"]["updated"] >= since]
+            elif kind == "key_in":
+                keys = {k.strip().strip('"') for k in value.split(",")}
+                result = [i for i in result if i["key"] in keys]
+        return result
+
+    def search(self, params: dict[str, str]) -> dict:
+        """Respuesta de /rest/api/2/search (lanza JqlError si el JQL no aplica)."""
+        matching = self._matching(params.get("jql", ""))
+        start = int(params.get("startAt", 0))
+        size = min(int(params.get("maxResults", 50)), self.max_results)
+        page = matching[start:start + size]
+        fields = params.get("fields", "*all")
+        if fields not in ("*all", "*navigable"):
+            wanted = set(fields.split(","))
+            page = [
+                {**i, "fields": {k: v for k, v in i["fields"].items() if k in wanted}}
+                for i in page
+            ]
+        return {
+            "expand": "schema,names",
+            "startAt": start,
+            "maxResults": size,
+            "total": len(matching),
+            "issues": page,
+        }
+
+    def injected_error(self) -> int | None:
+        """429 o 503 con probabilidad ``error_rate``."""
+        with self._lock:
+            self.requests += 1
+            if self._rng.random() >= self.error_rate:
+                return None
+            self.errors += 1
+            return self._rng.choice([429, 503])
+
+    def record_bytes(self, n: int) -> None:
+        with self._lock:
+            self.bytes_sent += n
+
+
+def make_handler(jira: MockJira) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, como Jira
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            pass
+
+        def _send(self, status: int, body: object, headers: dict | None = None) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                data = gzip.compress(data, compresslevel=6)
+                self.send_header("Content-Encoding", "gzip")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            # Antes de escribir: el cliente puede terminar y medir apenas
+            # recibe el último byte
+            jira.record_bytes(len(data))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:  # noqa: N802
+            if jira.latency:
+                time.sleep(jira.latency)
+            url = urlsplit(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            error = jira.injected_error()
+            if error == 429:
+                self._send(429, {"errorMessages": ["Rate limit exceeded"]},
+                           {"Retry-After": str(jira.retry_after)})
+            elif error == 503:
+                self._send(503, {"errorMessages": ["Service unavailable"]})
+            elif url.path == "/rest/api/2/search":
+                try:
+                    self._send(200, jira.search(params))
+                except ValueError as exc:  # JqlError o startAt/maxResults inválidos
+                    self._send(400, {"errorMessages": [str(exc)]})
+            elif url.path == "/rest/api/2/field":
+                self._send(200, FIELDS)
+            elif url.path == "/rest/api/2/myself":
+                self._send(200, MYSELF)
+            else:
+                self._send(404, {"errorMessages": [f"No existe {url.path}"]})
+
+    return Handler
+
+
+def serve(jira: MockJira, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Levanta el servidor en un hilo de fondo (``port=0`` elige uno libre)."""
+    server = ThreadingHTTPServer((host, port), make_handler(jira))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_server_args(parser: argparse.ArgumentParser) -> None:
+    """Opciones del servidor, compartidas con bench_extract.py."""
+    parser.add_argument("--issues", type=int, default=10_000)
+    parser.add_argument("--domains", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="ms por petición")
+    parser.add_argument(
+        "--max-results", type=int, default=DEFAULT_MAX_RESULTS,
+        help="tope de maxResults por página",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0,
+        help="proporción de respuestas 429/503 (0-1)",
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="segundos de Retry-After en los 429",
+    )
+
+
+def from_args(args: argparse.Namespace, base_url: str) -> MockJira:
+    return MockJira(
+        n_issues=args.issues, n_domains=args.domains, seed=args.seed,
+        latency_ms=args.latency, max_results=args.max_results,
+        error_rate=args.error_rate, retry_after=args.retry_after,
+        base_url=base_url,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor Jira local de prueba")
+    add_server_args(parser)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    base_url = f"http://127.0.0.1:{args.port}"
+    jira = from_args(args, base_url)
+    server = serve(jira, port=args.port)
+    print(f"Mock Jira con {len(jira.issues)} issues en {base_url} (Ctrl+C para detener)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n{jira.requests} peticiones, {jira.errors} errores inyectados")
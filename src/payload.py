@@ -0,0 +1,144 @@
+"""Datos que consume dashboard.js: docs/data/*.json.
+
+    issues.<hash>.json   todos los issues una sola vez, en columnas
+    <slug>.<hash>.json   una pestaña: gantt, filas de issues, cubo de
+                         agregados y (dominios) HTML; general lleva además
+                         la tabla de épicas en columnas
+
+index.html recibe el nombre con hash de cada archivo en ``DATA_FILES``.
+
+En issues.json los strings repetidos (tipo, estado, assignee, servicio,
+fechas, semana, épica, URL base de Jira) van como códigos enteros a un
+diccionario por columna; key, summary, cycle time y lead time van tal cual.
+Cada dominio lista sólo los índices de sus issues en esas columnas
+("general" = todas las filas). dashboard.worker.js filtra y agrega
+directamente sobre los códigos, y dashboard.js arma con las mismas columnas
+las tablas de issues y de épicas (ya no se renderizan filas en el HTML).
+
+El cubo de cada pestaña agrega sus issues por semana × servicio × estado
+(los mismos códigos de issues.json): por celda, cantidad de issues, posición
+del primero en ``rows`` y, para cycle y lead time, cantidad, suma y suma de
+cuadrados. Con eso los gráficos de servicio y estado y la media/UCL/LCL de
+los control charts salen de sumar celdas, sin recorrer issues.
+"""
+
+import json
+from collections.abc import Sequence
+
+PAYLOAD_VERSION = 3
+
+# Columnas de metrics._issue_slim
+RAW_COLUMNS = ("k", "su", "ct", "lt")
+ENCODED_COLUMNS = ("t", "s", "a", "sv", "c", "u", "w", "ek", "ub")
+
+# Dimensiones y medidas del cubo de cada pestaña
+CUBE_DIMENSIONS = ("w", "sv", "s")
+CUBE_MEASURES = ("first", "n", "ct_n", "ct_sum", "ct_sq", "lt_n", "lt_sum", "lt_sq")
+
+# Tabla de épicas de la pestaña General
+EPIC_RAW_COLUMNS = ("k", "su")
+EPIC_ENCODED_COLUMNS = ("s", "d", "sv", "a", "c", "ub")
+
+
+def _encode(values: list) -> dict:
+    """Diccionario (orden de primera aparición) + códigos."""
+    index: dict = {}
+    codes = [index.setdefault(v, len(index)) for v in values]
+    return {"dict": list(index), "codes": codes}
+
+
+def encode_columns(records: list[dict], raw: tuple, encoded: tuple) -> dict:
+    """Registros como columnas, con diccionario para las ``encoded``."""
+    return {
+        "length": len(records),
+        "columns": {c: [r[c] for r in records] for c in raw},
+        "encoded": {c: _encode([r[c] for r in records]) for c in encoded},
+    }
+
+
+def encode_issues(issues_slim: list[dict]) -> dict:
+    """Issues ligeros como columnas, con diccionario para los strings."""
+    return {
+        "version": PAYLOAD_VERSION,
+        **encode_columns(issues_slim, RAW_COLUMNS, ENCODED_COLUMNS),
+    }
+
+
+def _epic_row(epic: dict) -> dict:
+    return {
+        "k": epic["key"],
+        "su": epic["summary"],
+        "s": epic["status"],
+        "d": epic["dominio"],
+        "sv": epic["servicio"],
+        "a": epic["assignee"],
+        "c": epic["created"],
+        "ub": epic.get("url", "").removesuffix(epic["key"]),
+    }
+
+
+def encode_epics(epics: list[dict]) -> dict:
+    """Tabla de épicas de la pestaña General, en columnas."""
+    return encode_columns(
+        [_epic_row(e) for e in epics], EPIC_RAW_COLUMNS, EPIC_ENCODED_COLUMNS,
+    )
+
+
+def build_cube(
+    issues_slim: list[dict], rows: Sequence[int], codes: dict[str, list[int]],
+) -> dict:
+    """Cubo de agregados de las filas ``rows`` (ver docstring del módulo).
+
+    ``codes`` tiene los códigos de issues.json de cada dimensión. Las celdas
+    quedan en orden de primera aparición y sólo existen las no vacías.
+    """
+    cells: dict[tuple, list] = {}
+    for pos, r in enumerate(rows):
+        key = tuple(codes[d][r] for d in CUBE_DIMENSIONS)
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = [pos, 0, 0, 0, 0, 0, 0, 0]
+        cell[1] += 1
+        for offset, col in ((2, "ct"), (5, "lt")):
+            days = issues_slim[r][col]
+            if days is not None:
+                cell[offset] += 1
+                cell[offset + 1] += days
+                cell[offset + 2] += days * days
+    cube = {d: [key[n] for key in cells] for n, d in enumerate(CUBE_DIMENSIONS)}
+    for n, m in enumerate(CUBE_MEASURES):
+        cube[m] = [cell[n] for cell in cells.values()]
+    return cube
+
+
+def tab_payloads(ctx: dict, domain_html: dict[str, str]) -> dict[str, dict]:
+    """Contenido de docs/data/: ``issues`` más una entrada por pestaña.
+
+    ``domain_html`` tiene el HTML de la pestaña de cada dominio, por slug.
+    """
+    issues = ctx["issues_slim"]
+    row_of = {i["k"]: n for n, i in enumerate(issues)}
+    encoded = encode_issues(issues)
+    codes = {d: encoded["encoded"][d]["codes"] for d in CUBE_DIMENSIONS}
+    payloads = {
+        "issues": encoded,
+        "general": {
+            "gantt": ctx["gantt"],
+            "cube": build_cube(issues, range(len(issues)), codes),
+            "epics": encode_epics(ctx["epics"]),
+        },
+    }
+    for dom in ctx["domains"]:
+        rows = [row_of[i["k"]] for i in dom["issues_slim"]]
+        payloads[dom["slug"]] = {
+            "gantt": dom["gantt"],
+            "rows": rows,
+            "cube": build_cube(issues, rows, codes),
+            "html": domain_html[dom["slug"]],
+        }
+    return payloads
+
+
+def to_bytes(payload: dict) -> bytes:
+    """JSON compacto en UTF-8, como se publica en docs/data/."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
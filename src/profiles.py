@@ -0,0 +1,56 @@
+"""Perfiles de extracción: qué campos de Jira necesita cada dataset.
+
+/rest/api/2/search devuelve sólo los campos pedidos en ``fields`` y cada
+campo de más viaja en cada página de cada crawl. Acá se declara, por
+dataset, exactamente lo que leen ``clean_epic``/``clean_issue`` y cuántos
+caracteres de ``description`` (el campo más pesado) se guardan; 0 = no se
+pide.
+
+Jira no permite recortar los objetos anidados (``self``, avatares,
+``statusCategory`` completo): la única forma de no recibirlos es no pedir
+el campo.
+"""
+
+# Campos que leen clean_epic y clean_issue
+COMMON_FIELDS = (
+    "summary", "status", "assignee", "created", "updated", "priority",
+    "labels", "components", "resolution", "resolutiondate", "duedate",
+    "customfield_10400",  # Planned Done Date
+    "customfield_11805",  # Start date
+)
+
+PROFILES: dict[str, dict] = {
+    "epics": {
+        "fields": COMMON_FIELDS,
+        "description_chars": 300,
+    },
+    "issues": {
+        "fields": COMMON_FIELDS + (
+            "issuetype",
+            "customfield_10007",  # Epic Link
+        ),
+        # El dashboard no usa la description de los issues
+        "description_chars": 0,
+    },
+}
+
+
+def description_chars(dataset: str) -> int:
+    return PROFILES[dataset]["description_chars"]
+
+
+def fields_for(dataset: str, description: bool = True) -> str:
+    """Valor del parámetro ``fields`` de /search para ``dataset``.
+
+    Con ``description=False`` no se pide aunque el perfil la guarde.
+    """
+    fields = list(PROFILES[dataset]["fields"])
+    if description and description_chars(dataset):
+        fields.append("description")
+    return ",".join(fields)
+
+
+def union_fields(*datasets: str, description: bool = True) -> str:
+    """``fields`` para un crawl que alimenta varios datasets a la vez."""
+    fields = [f for d in datasets for f in fields_for(d, description).split(",")]
+    return ",".join(dict.fromkeys(fields))
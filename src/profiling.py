@@ -0,0 +1,215 @@
+"""Instrumentación de etapas del build: tiempo de reloj, CPU y memoria pico.
+
+Uso desde el código del pipeline:
+
+    from profiling import stage
+
+    with stage("enrich_issues"):
+        ...
+
+``stage`` no hace nada si no hay un ``BuildProfile`` activo, así que
+metrics.py se puede usar sin instrumentar. build.py activa uno en cada
+ejecución y escribe el resultado en reports/build_profile.json.
+
+Las etapas se anidan (p. ej. ``metrics/domains/Data Foundation``). La memoria
+pico se mide con tracemalloc: es el máximo de memoria asignada por Python
+mientras la etapa estaba abierta, incluidas sus subetapas. El reporte incluye
+además el RSS máximo del proceso (``max_rss_mb``) donde el sistema lo expone.
+
+Lo que corre en un pool de procesos no ve el perfil del proceso principal:
+se envuelve con ``measured_call``, que devuelve las mismas medidas junto al
+resultado, y el proceso principal las agrega con ``record``. Esas entradas
+llevan ``pid`` y su pico de memoria es el del worker.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: sin RSS máximo en el reporte
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORTS_DIR = ROOT / "reports"
+PROFILE_PATH = REPORTS_DIR / "build_profile.json"
+CPROFILE_PATH = REPORTS_DIR / "build_profile.prof"
+
+_active: "BuildProfile | None" = None
+
+
+def max_rss_mb() -> float | None:
+    """RSS máximo del proceso en MB (None si no se puede medir)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB, macOS en bytes
+    return round(rss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+class BuildProfile:
+    """Registro de etapas de un build (una entrada por etapa, en orden)."""
+
+    def __init__(self, memory: bool = True, cprofile: bool = False) -> None:
+        self.memory = memory
+        self.stages: list[dict] = []
+        self._path: list[str] = []
+        self._peaks: list[int] = []  # pico acumulado del build y cada etapa abierta
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._started_tracing = False
+        self._start = 0.0
+
+    def __enter__(self) -> "BuildProfile":
+        global _active
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._peaks = [tracemalloc.get_traced_memory()[0]]
+        if self._cprofile:
+            self._cprofile.enable()
+        self._start = time.perf_counter()
+        _active = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        _active = None
+        self.wall_s = time.perf_counter() - self._start
+        if self._cprofile:
+            self._cprofile.disable()
+        if self.memory:
+            self._close_peak()
+            self.peak_bytes = self._peaks.pop()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._path.append(name)
+        entry = {"name": "/".join(self._path), "depth": len(self._path) - 1}
+        self.stages.append(entry)
+
+        if self.memory:
+            # El pico hasta ahora pertenece a las etapas ya abiertas
+            self._close_peak()
+            tracemalloc.reset_peak()
+            self._peaks.append(tracemalloc.get_traced_memory()[0])
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry["wall_s"] = round(time.perf_counter() - wall, 4)
+            entry["cpu_s"] = round(time.process_time() - cpu, 4)
+            if self.memory:
+                self._close_peak()
+                peak = self._peaks.pop()
+                entry["peak_mb"] = round(peak / 2**20, 2)
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self._path.pop()
+
+    def record(self, name: str, measures: dict) -> None:
+        """Agrega como subetapa de la etapa abierta una medida de ``measured_call``."""
+        self.stages.append({
+            "name": "/".join([*self._path, name]),
+            "depth": len(self._path),
+            **measures,
+        })
+
+    def _close_peak(self) -> None:
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+
+    def to_dict(self, **meta) -> dict:
+        report = {
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **meta,
+            "wall_s": round(self.wall_s, 4),
+            "stages": self.stages,
+        }
+        if self.memory:
+            report["peak_mb"] = round(self.peak_bytes / 2**20, 2)
+        rss = max_rss_mb()
+        if rss is not None:
+            report["max_rss_mb"] = rss
+        return report
+
+    def write(self, path: Path = PROFILE_PATH, **meta) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(self.to_dict(**meta), indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        return path
+
+    def dump_cprofile(self, path: Path = CPROFILE_PATH) -> Path | None:
+        """Escribe el perfil de cProfile (``python -m pstats <path>``)."""
+        if not self._cprofile:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._cprofile.dump_stats(str(path))
+        return path
+
+    def summary(self, max_depth: int = 1) -> str:
+        """Tabla de texto de las etapas hasta ``max_depth`` para los logs."""
+        lines = []
+        for s in self.stages:
+            if s["depth"] > max_depth:
+                continue
+            mem = f"  {s['peak_mb']:>8.1f} MB" if self.memory else ""
+            lines.append(
+                f"   {s['name']:<40} {s['wall_s']:>8.2f} s"
+                f"  {s['cpu_s']:>8.2f} s CPU{mem}"
+            )
+        return "\n".join(lines)
+
+
+def tracing_memory() -> bool:
+    """True si el ``BuildProfile`` activo mide memoria."""
+    return _active is not None and _active.memory
+
+
+def measured_call(fn: Callable, memory: bool, *args) -> tuple[object, dict]:
+    """``(fn(*args), medidas)`` con las claves de una etapa, para correr en un worker."""
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = fn(*args)
+    measures = {
+        "wall_s": round(time.perf_counter() - wall, 4),
+        "cpu_s": round(time.process_time() - cpu, 4),
+        "pid": os.getpid(),
+    }
+    if memory:
+        measures["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    if started:
+        tracemalloc.stop()
+    return result, measures
+
+
+def record(name: str, measures: dict) -> None:
+    """``BuildProfile.record`` en el perfil activo (no-op si no hay)."""
+    if _active is not None:
+        _active.record(name, measures)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mide una etapa en el ``BuildProfile`` activo (no-op si no hay)."""
+    if _active is None:
+        yield
+        return
+    with _active.stage(name):
+        yield
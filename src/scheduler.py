@@ -1,6 +1,9 @@
 """Scheduler para regenerar el sitio a horas específicas.
 
-Ejecuta build.py automáticamente a las 8:00, 12:00 y 17:00.
+Ejecuta build.py automáticamente a las 8:00, 12:00 y 17:00. Si en ese
+momento hay otro build o extracción en curso (build_cache.build_lock) se salta
+ese horario. Para extraer además de construir, reaccionar a cambios en data/
+o templates/ y pedir builds a demanda, ver build_daemon.py.
 Uso:
     python src/scheduler.py              # horarios por defecto
     python src/scheduler.py 08:00 14:00  # horarios personalizados
@@ -12,6 +15,7 @@ from datetime import datetime
 
 import schedule
 
+import build_cache
 from build import build
 
 DEFAULT_TIMES = ["08:00", "12:00", "17:00"]
@@ -24,8 +28,11 @@ def run_build() -> None:
     print(f"[{now}] Iniciando build programado...")
     print(f"{'='*50}")
     try:
-        build()
+        with build_cache.build_lock(wait=False):
+            build()
         print(f"[{now}] Build completado exitosamente.")
+    except build_cache.BuildLocked:
+        print(f"[{now}] Otro build o extracción en curso: se salta este horario.")
     except Exception as exc:  # noqa: BLE001
         print(f"[{now}] ERROR en build: {exc}")
 
@@ -0,0 +1,72 @@
+"""Índice invertido para los buscadores del dashboard: docs/data/search.json.
+
+Cada término apunta a la lista de documentos que lo contienen:
+
+    {"version": 1,
+     "issues": {"<término>": [fila, +delta, +delta, ...], ...},
+     "epics":  {"<término>": [...], ...}}
+
+Los documentos de ``issues`` son las filas de issues.json (key, summary,
+assignee, servicio, dominios y épica del issue); los de ``epics``, las filas
+de la tabla de épicas de general.json (key, summary, assignee, servicio y
+dominio). Las listas van ordenadas y con deltas (la primera fila absoluta,
+después la diferencia con la anterior) para que el JSON sea chico.
+
+Los términos se normalizan igual que en dashboard.js (``fold``): minúsculas,
+sin tildes ni diéresis (NFKD sin las marcas combinantes) y cortados en
+secuencias de ``[a-z0-9]``. "Migración" y "migracion" son el mismo término.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable
+
+INDEX_VERSION = 1
+
+_COMBINING = re.compile("[\u0300-\u036f]")
+_TOKEN = re.compile("[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Minúsculas y sin marcas diacríticas (mismo orden que dashboard.js)."""
+    return _COMBINING.sub("", unicodedata.normalize("NFKD", text.lower()))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(fold(text))
+
+
+def invert(docs: Iterable[Iterable[str]]) -> dict[str, list[int]]:
+    """Índice invertido de ``docs`` (textos por documento), con deltas."""
+    postings: dict[str, list[int]] = defaultdict(list)
+    for n, texts in enumerate(docs):
+        for term in dict.fromkeys(t for text in texts for t in tokenize(text)):
+            postings[term].append(n)
+    index = {}
+    for term in sorted(postings):
+        rows = postings[term]
+        index[term] = rows[:1] + [b - a for a, b in zip(rows, rows[1:])]
+    return index
+
+
+def build_index(ctx: dict) -> dict:
+    """Índice de issues y épicas a partir del contexto de métricas."""
+    issues = ctx["issues_slim"]
+    row_of = {i["k"]: n for n, i in enumerate(issues)}
+    domains_of: dict[int, list[str]] = defaultdict(list)
+    for dom in ctx["domains"]:
+        for i in dom["issues_slim"]:
+            domains_of[row_of[i["k"]]].append(dom["name"])
+
+    return {
+        "version": INDEX_VERSION,
+        "issues": invert(
+            (i["k"], i["su"], i["a"], i["sv"], i["ek"], *domains_of[n])
+            for n, i in enumerate(issues)
+        ),
+        "epics": invert(
+            (e["key"], e["summary"], e["assignee"], e["servicio"], e["dominio"])
+            for e in ctx["epics"]
+        ),
+    }
@@ -0,0 +1,166 @@
+"""Snapshot columnar (Parquet) de épicas e issues limpios.
+
+Por cada dataset se escriben dos archivos en data/:
+
+    issues.parquet       una fila por issue, columnas escalares de clean_issue
+    issues_tags.parquet  tabla larga: key, kind (component/label), position,
+                         name, prefix, value
+
+Los strings repetidos (status, assignee, servicio...) quedan
+dictionary-encoded, y la lectura puede pedir sólo las columnas necesarias,
+así que cargar el snapshot es mucho más barato que ``json.loads`` del JSON
+indentado. Los extractores lo escriben página a página con ``SnapshotWriter``.
+
+Uso:
+    python src/snapshot.py   # genera los snapshots desde data/*.json
+"""
+
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from store import DATASETS, JSON_FILES, split_component
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "data"
+TAG_KINDS = {"components": "component", "labels": "label"}
+
+TAGS_SCHEMA = pa.schema([
+    ("key", pa.string()),
+    ("kind", pa.string()),
+    ("position", pa.int16()),
+    ("name", pa.string()),
+    ("prefix", pa.string()),
+    ("value", pa.string()),
+])
+
+
+def snapshot_paths(dataset: str, data_dir: Path = DATA_DIR) -> tuple[Path, Path]:
+    return data_dir / f"{dataset}.parquet", data_dir / f"{dataset}_tags.parquet"
+
+
+def scalar_columns(dataset: str) -> list[str]:
+    return [c for c in DATASETS[dataset] if c not in TAG_KINDS]
+
+
+def _schema(dataset: str) -> pa.Schema:
+    return pa.schema([(c, pa.string()) for c in scalar_columns(dataset)])
+
+
+class SnapshotWriter:
+    """Escribe un dataset en Parquet por lotes (un row group por página).
+
+    Misma interfaz que ``json_stream.JsonArrayWriter``: escribe a archivos
+    temporales y los renombra al cerrar; si hay una excepción los descarta.
+    """
+
+    def __init__(
+        self, dataset: str, data_dir: Path = DATA_DIR, batch_size: int = 1000,
+    ) -> None:
+        self.dataset = dataset
+        self.paths = snapshot_paths(dataset, data_dir)
+        self.batch_size = batch_size
+        self.count = 0
+        self._columns = scalar_columns(dataset)
+        self._rows: list[dict] = []
+        self._tags: list[dict] = []
+        self._tmps: list[str] = []
+        self._writers: list[pq.ParquetWriter] = []
+
+    def __enter__(self) -> "SnapshotWriter":
+        for path, schema in zip(self.paths, (_schema(self.dataset), TAGS_SCHEMA)):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{path.name}.", suffix=".tmp", dir=path.parent,
+            )
+            os.close(fd)
+            self._tmps.append(tmp)
+            self._writers.append(pq.ParquetWriter(tmp, schema))
+        return self
+
+    def write(self, record: dict) -> None:
+        self._rows.append({c: record.get(c) for c in self._columns})
+        for field, kind in TAG_KINDS.items():
+            for pos, name in enumerate(record.get(field, [])):
+                prefix, value = split_component(name)
+                self._tags.append({
+                    "key": record["key"], "kind": kind, "position": pos,
+                    "name": name, "prefix": prefix, "value": value,
+                })
+        self.count += 1
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def write_all(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def _flush(self) -> None:
+        rows_writer, tags_writer = self._writers
+        if self._rows:
+            rows_writer.write_table(
+                pa.Table.from_pylist(self._rows, schema=rows_writer.schema),
+            )
+        if self._tags:
+            tags_writer.write_table(pa.Table.from_pylist(self._tags, schema=TAGS_SCHEMA))
+        self._rows, self._tags = [], []
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self._flush()
+        for writer in self._writers:
+            writer.close()
+        for tmp, path in zip(self._tmps, self.paths):
+            if exc_type is None:
+                os.chmod(tmp, 0o644)  # mkstemp crea el archivo con 0600
+                os.replace(tmp, path)
+            else:
+                os.unlink(tmp)
+
+
+def exists(dataset: str, data_dir: Path = DATA_DIR) -> bool:
+    return all(p.exists() for p in snapshot_paths(dataset, data_dir))
+
+
+def is_current(dataset: str, data_dir: Path = DATA_DIR) -> bool:
+    """True si el snapshot existe y no es anterior a su JSON.
+
+    Los extractores cierran el SnapshotWriter después del JSON, así que un
+    JSON más nuevo que el snapshot llegó por fuera (un ``git pull`` de data/).
+    """
+    if not exists(dataset, data_dir):
+        return False
+    source = data_dir / JSON_FILES[dataset]
+    if not source.exists():
+        return True
+    written = min(p.stat().st_mtime_ns for p in snapshot_paths(dataset, data_dir))
+    return written >= source.stat().st_mtime_ns
+
+
+def export_json(data_dir: Path = DATA_DIR) -> dict[str, int]:
+    """Genera los snapshots a partir de los JSON de data/."""
+    counts = {}
+    for dataset, filename in JSON_FILES.items():
+        source = data_dir / filename
+        if not source.exists():
+            continue
+        with SnapshotWriter(dataset, data_dir) as out:
+            out.write_all(json.loads(source.read_text(encoding="utf-8")))
+        counts[dataset] = out.count
+    return counts
+
+
+if __name__ == "__main__":
+    for name, n in export_json().items():
+        print(f"  {name}: {n} registros en {snapshot_paths(name)[0]}")
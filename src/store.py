@@ -0,0 +1,349 @@
+"""Almacén local SQLite de épicas e issues (data/camdp.db).
+
+Los extractores escriben aquí además de los JSON; metrics.py consulta sólo
+las filas que necesita. Cada dataset (``issues``, ``epics``) es una tabla con
+las columnas que emiten ``clean_issue``/``clean_epic``, más una tabla
+normalizada ``components`` (dataset, key, posición, nombre, prefijo, valor).
+Los JSON en data/ quedan como formato de exportación.
+
+La tabla ``datasets`` registra, por dataset, cuántas filas se escribieron y
+el mtime/tamaño que tenía su JSON en ese momento. Un dataset sin registro
+(p. ej. ``epics`` después de correr sólo extract_all_issues.py) o cuyo JSON
+cambió desde entonces (un ``git pull`` de data/) no está al día, y
+``is_current`` lo informa para que metrics.py lea el JSON en su lugar.
+
+Uso:
+    python src/store.py   # (re)importa data/epics.json y data/all_issues.json
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+from types import TracebackType
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "data"
+DB_PATH = DATA_DIR / "camdp.db"
+SCHEMA_VERSION = 2
+
+_COMMON = (
+    "key", "summary", "status", "status_category", "assignee",
+    "assignee_email", "priority", "created", "updated", "resolution",
+    "resolution_date", "labels", "components", "description", "url",
+    "start_date", "planned_done_date", "due_date",
+)
+
+# Columnas en el orden de las claves de clean_issue / clean_epic
+DATASETS: dict[str, tuple[str, ...]] = {
+    "issues": _COMMON[:2] + ("issuetype",) + _COMMON[2:] + ("epic_key",),
+    "epics": _COMMON,
+}
+JSON_FILES = {"issues": "all_issues.json", "epics": "epics.json"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY, seq REAL NOT NULL,
+    summary TEXT, issuetype TEXT, status TEXT, status_category TEXT,
+    assignee TEXT, assignee_email TEXT, priority TEXT, created TEXT,
+    updated TEXT, resolution TEXT, resolution_date TEXT, labels TEXT,
+    description TEXT, url TEXT, start_date TEXT, planned_done_date TEXT,
+    due_date TEXT, epic_key TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_issues_seq ON issues (seq);
+CREATE INDEX IF NOT EXISTS ix_issues_updated ON issues (updated);
+CREATE INDEX IF NOT EXISTS ix_issues_epic_key ON issues (epic_key);
+CREATE INDEX IF NOT EXISTS ix_issues_issuetype ON issues (issuetype);
+CREATE INDEX IF NOT EXISTS ix_issues_status ON issues (status);
+
+CREATE TABLE IF NOT EXISTS epics (
+    key TEXT PRIMARY KEY, seq REAL NOT NULL,
+    summary TEXT, status TEXT, status_category TEXT,
+    assignee TEXT, assignee_email TEXT, priority TEXT, created TEXT,
+    updated TEXT, resolution TEXT, resolution_date TEXT, labels TEXT,
+    description TEXT, url TEXT, start_date TEXT, planned_done_date TEXT,
+    due_date TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_epics_seq ON epics (seq);
+CREATE INDEX IF NOT EXISTS ix_epics_updated ON epics (updated);
+CREATE INDEX IF NOT EXISTS ix_epics_status ON epics (status);
+
+CREATE TABLE IF NOT EXISTS components (
+    dataset TEXT NOT NULL, key TEXT NOT NULL, position INTEGER NOT NULL,
+    name TEXT NOT NULL, prefix TEXT, value TEXT,
+    PRIMARY KEY (dataset, key, position)
+);
+CREATE INDEX IF NOT EXISTS ix_components_value ON components (dataset, prefix, value);
+
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset TEXT PRIMARY KEY, rows INTEGER NOT NULL,
+    source_mtime_ns INTEGER, source_size INTEGER
+);
+"""
+
+
+def exists(path: Path = DB_PATH) -> bool:
+    return path.exists()
+
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    """Abre (y crea si hace falta) la base con el esquema actual."""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def _source_stat(source: Path) -> tuple[int | None, int | None]:
+    if not source.exists():
+        return None, None
+    st = source.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def mark_written(
+    conn: sqlite3.Connection, dataset: str, data_dir: Path = DATA_DIR,
+) -> None:
+    """Registra que el dataset quedó completo y al día con su JSON.
+
+    Se llama con el JSON ya en su lugar: guarda su mtime y tamaño actuales.
+    """
+    rows = conn.execute(f"SELECT COUNT(*) FROM {dataset}").fetchone()[0]
+    conn.execute(
+        "INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?)",
+        (dataset, rows, *_source_stat(data_dir / JSON_FILES[dataset])),
+    )
+
+
+def is_current(
+    conn: sqlite3.Connection, dataset: str, data_dir: Path = DATA_DIR,
+) -> bool:
+    """True si el dataset se escribió en la base y su JSON no cambió después."""
+    row = conn.execute(
+        "SELECT source_mtime_ns, source_size FROM datasets WHERE dataset = ?",
+        (dataset,),
+    ).fetchone()
+    if row is None:
+        return False
+    source = data_dir / JSON_FILES[dataset]
+    return not source.exists() or tuple(row) == _source_stat(source)
+
+
+def current(dataset: str, path: Path = DB_PATH) -> bool:
+    """``is_current`` abriendo la base (False si todavía no existe)."""
+    if not exists(path):
+        return False
+    with closing(connect(path)) as conn:
+        return is_current(conn, dataset, path.parent)
+
+
+def split_component(name: str) -> tuple[str, str]:
+    """'3.Machine_Learning' -> ('3', 'Machine Learning')"""
+    prefix, dot, value = name.partition(".")
+    if dot and prefix.isdigit():
+        return prefix, value.replace("_", " ")
+    return "", name.replace("_", " ")
+
+
+def _insert(
+    conn: sqlite3.Connection, dataset: str, records: Iterable[tuple[float, dict]],
+) -> None:
+    columns = [c for c in DATASETS[dataset] if c != "components"]
+    names = ", ".join(["seq", *columns])
+    marks = ", ".join("?" * (len(columns) + 1))
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "key")
+    # ON CONFLICT conserva el seq original: el issue no cambia de lugar
+    row_sql = (
+        f"INSERT INTO {dataset} ({names}) VALUES ({marks}) "
+        f"ON CONFLICT (key) DO UPDATE SET {updates}"
+    )
+    for seq, rec in records:
+        values = [
+            json.dumps(rec.get(c, []), ensure_ascii=False) if c == "labels"
+            else rec.get(c)
+            for c in columns
+        ]
+        conn.execute(row_sql, [seq, *values])
+        conn.execute(
+            "DELETE FROM components WHERE dataset = ? AND key = ?",
+            (dataset, rec["key"]),
+        )
+        conn.executemany(
+            "INSERT INTO components VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (dataset, rec["key"], pos, name, *split_component(name))
+                for pos, name in enumerate(rec.get("components", []))
+            ],
+        )
+
+
+class DatasetWriter:
+    """Reemplaza un dataset completo registro a registro, en una transacción.
+
+    Análogo a ``json_stream.JsonArrayWriter``: si hay una excepción se hace
+    rollback y el contenido anterior queda intacto. Con ``conn`` escribe en
+    la transacción ya abierta en esa conexión (commit y rollback quedan a
+    cargo de quien la abrió): así se reemplazan varios datasets a la vez, ya
+    que SQLite admite una sola transacción de escritura por base.
+
+    Al salir sin error llama a ``mark_written``: el JSON del dataset tiene
+    que quedar en su lugar antes (en un ``with`` conjunto, abrir el
+    DatasetWriter primero para que se cierre último).
+    """
+
+    def __init__(
+        self, dataset: str, path: Path = DB_PATH, conn: sqlite3.Connection | None = None,
+    ) -> None:
+        self.dataset = dataset
+        self.path = path
+        self.count = 0
+        self._own = conn is None
+        self._conn = conn
+
+    def __enter__(self) -> "DatasetWriter":
+        if self._own:
+            self._conn = connect(self.path)
+            self._conn.execute("BEGIN")
+        self._conn.execute(f"DELETE FROM {self.dataset}")
+        self._conn.execute(
+            "DELETE FROM components WHERE dataset = ?", (self.dataset,),
+        )
+        return self
+
+    def write(self, record: dict) -> None:
+        _insert(self._conn, self.dataset, [(self.count, record)])
+        self.count += 1
+
+    def write_all(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            mark_written(self._conn, self.dataset, self.path.parent)
+        if not self._own:
+            return
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+        self._conn.close()
+
+
+def upsert(
+    conn: sqlite3.Connection, dataset: str, records: list[dict],
+) -> None:
+    """Inserta o actualiza por key. Los issues nuevos van al principio.
+
+    Mismo orden que ``incremental.merge_by_key``: los existentes conservan su
+    lugar y los nuevos se anteponen en orden de key descendente.
+    """
+    known = {
+        row[0] for row in conn.execute(f"SELECT key FROM {dataset}")
+    }
+    new = sorted(
+        (r for r in records if r["key"] not in known),
+        key=lambda r: _key_number(r["key"]),
+    )
+    first = conn.execute(f"SELECT MIN(seq) FROM {dataset}").fetchone()[0] or 0
+    seqs = {r["key"]: first - n for n, r in enumerate(new, start=1)}
+    _insert(conn, dataset, [(seqs.get(r["key"], 0), r) for r in records])
+
+
+def delete(conn: sqlite3.Connection, dataset: str, keys: Iterable[str]) -> None:
+    keys = list(keys)
+    conn.executemany(f"DELETE FROM {dataset} WHERE key = ?", [(k,) for k in keys])
+    conn.executemany(
+        "DELETE FROM components WHERE dataset = ? AND key = ?",
+        [(dataset, k) for k in keys],
+    )
+
+
+def apply_changes(
+    dataset: str, changed: list[dict], gone: set[str], records: list[dict],
+    was_current: bool, path: Path = DB_PATH,
+) -> None:
+    """Aplica un delta incremental: borra ``gone`` y hace upsert de ``changed``.
+
+    ``was_current`` es ``current(dataset)`` tomado antes de reescribir el
+    JSON. Si el dataset no estaba al día (no se escribió nunca en la base o
+    el JSON cambió por fuera) se carga completo desde ``records``, el dataset
+    ya fusionado.
+    """
+    if was_current:
+        with closing(connect(path)) as conn, conn:
+            delete(conn, dataset, gone)
+            upsert(conn, dataset, changed)
+            mark_written(conn, dataset, path.parent)
+        return
+    with DatasetWriter(dataset, path) as out:
+        out.write_all(records)
+
+
+def _key_number(key: str) -> int:
+    _, _, num = key.rpartition("-")
+    return int(num) if num.isdigit() else 0
+
+
+def load(
+    conn: sqlite3.Connection, dataset: str, where: str = "", params: tuple = (),
+) -> list[dict]:
+    """Registros del dataset (mismas claves que el JSON), en orden original.
+
+    ``where`` es una condición SQL sobre las columnas de la tabla, p. ej.
+    ``"issuetype = ? OR updated >= ?"``.
+    """
+    where_sql = f"WHERE {where}" if where else ""
+    rows = conn.execute(
+        f"SELECT * FROM {dataset} {where_sql} ORDER BY seq", params,
+    ).fetchall()
+
+    components: dict[str, list[str]] = {}
+    comp_sql = (
+        f"SELECT c.key, c.name FROM components c JOIN {dataset} t "
+        f"ON c.dataset = ? AND c.key = t.key {where_sql} "
+        "ORDER BY c.key, c.position"
+    )
+    for key, name in conn.execute(comp_sql, (dataset, *params)):
+        components.setdefault(key, []).append(name)
+
+    records = []
+    for row in rows:
+        rec = {}
+        for col in DATASETS[dataset]:
+            if col == "labels":
+                rec[col] = json.loads(row[col])
+            elif col == "components":
+                rec[col] = components.get(row["key"], [])
+            else:
+                rec[col] = row[col]
+        records.append(rec)
+    return records
+
+
+def import_json(path: Path = DB_PATH) -> dict[str, int]:
+    """Carga los JSON de data/ en la base, reemplazando su contenido."""
+    counts = {}
+    for dataset, filename in JSON_FILES.items():
+        source = DATA_DIR / filename
+        if not source.exists():
+            continue
+        with DatasetWriter(dataset, path) as out:
+            out.write_all(json.loads(source.read_text(encoding="utf-8")))
+        counts[dataset] = out.count
+    return counts
+
+
+if __name__ == "__main__":
+    for name, n in import_json().items():
+        print(f"  {name}: {n} registros importados en {DB_PATH}")
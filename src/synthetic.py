@@ -0,0 +1,223 @@
+"""Datos sintéticos de CAMDP para benchmarks.
+
+Genera ``epics.json`` y ``all_issues.json`` con la misma forma que
+``clean_epic``/``clean_issue``: componentes con prefijo (``1.Dominio``,
+``2.Equipo``, ``3.Servicio``, ``4.App``, ``5.Tipo``), labels, épica de cada
+issue y fechas created/updated/start/resolution coherentes entre sí. Las
+épicas aparecen también en all_issues.json con issuetype "Épica", como en
+Jira.
+
+Es determinista para una misma semilla y fecha ``today`` (por defecto
+metrics.TODAY, para que el filtro ``updated >= ISSUES_UPDATED_SINCE`` deje
+pasar una proporción realista). Los dominios tienen tamaños desiguales
+(distribución tipo Zipf), como los reales.
+
+Uso:
+    python src/synthetic.py 100000 --domains 25 --out /tmp/camdp/data
+"""
+
+import argparse
+import random
+from collections.abc import Iterator
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+import metrics
+from json_stream import JsonArrayWriter
+from store import DATASETS
+
+JIRA_URL = "https://jira.example.com"
+KEY_PREFIX = "CAMDP"
+
+REAL_DOMAINS = [
+    "Tecnología", "SCM", "Soluciones_Financieras", "Operaciones", "Finanzas",
+    "E-Commerce", "Data_DP", "Comercial",
+]
+TEAMS = ["DF_ML", "A-Team", "DF_KTLOs", "DF_Proyectos", "DF_Ingesta", "DataNinjas"]
+SERVICES = [
+    "ETL", "Machine_Learning", "Ing_Datos", "Innovación", "Admin_Recursos_Tecno",
+    "Data_Quality", "BI",
+]
+APPS = ["SALTRAMA", "Pricing", "DPM", "CODISA", "CAM Data Portal"]
+FREE_TAGS = ["New_Request", "Fabric", "Data_Engineering", "Data_Architecture", "GenAI"]
+ASSIGNEES = [f"Persona {n:02d}" for n in range(1, 41)]
+
+EPIC_STATUSES = [("Listo", 80), ("Work in Progress", 12), ("Blocked", 3), ("Backlog", 5)]
+ISSUE_STATUSES = [
+    ("Listo", 45), ("Work in Progress", 20), ("In Progress", 5), ("Backlog", 25),
+    ("Blocked", 5),
+]
+ISSUE_TYPES = [("Historia", 50), ("Tarea", 25), ("Bug", 10), ("Sub-tarea", 15)]
+STATUS_CATEGORY = {"Listo": "Listo", "Backlog": "Por hacer"}
+
+HISTORY_DAYS = 365
+ISSUES_PER_EPIC = 40
+
+
+def domain_names(n: int) -> list[str]:
+    """Los dominios reales primero y luego ``Dominio_NN`` hasta completar ``n``."""
+    extra = [f"Dominio_{i:02d}" for i in range(len(REAL_DOMAINS) + 1, n + 1)]
+    return (REAL_DOMAINS + extra)[:n]
+
+
+class Generator:
+    """Épicas e issues sintéticos para ``n_domains`` dominios."""
+
+    def __init__(self, n_domains: int, seed: int = 1, today: date | None = None) -> None:
+        self.rng = random.Random(seed)
+        self.today = today or metrics.TODAY
+        self.domains = domain_names(n_domains)
+        # Zipf: el dominio i tiene peso 1/i
+        self.domain_weights = list(accumulate(1 / (i + 1) for i in range(len(self.domains))))
+        self.next_key = 1
+        self.epics_by_domain: dict[str, list[str]] = {d: [] for d in self.domains}
+
+    def _choice(self, weighted: list[tuple[str, int]]) -> str:
+        values, weights = zip(*weighted)
+        return self.rng.choices(values, weights)[0]
+
+    def _key(self) -> str:
+        key = f"{KEY_PREFIX}-{self.next_key}"
+        self.next_key += 1
+        return key
+
+    def _domains(self) -> list[str]:
+        # 5 % sin dominio, 10 % con dos
+        r = self.rng.random()
+        k = 0 if r < 0.05 else 2 if r < 0.15 else 1
+        return list(dict.fromkeys(
+            self.rng.choices(self.domains, cum_weights=self.domain_weights, k=k),
+        ))
+
+    def _dates(self, status: str, max_duration: int) -> dict[str, str]:
+        rng, today = self.rng, self.today
+        created = today - timedelta(days=rng.randint(0, HISTORY_DAYS))
+        start = created + timedelta(days=rng.randint(0, 30))
+        if rng.random() < 0.3 or start > today:
+            start = None
+        resolved = None
+        if status == "Listo":
+            resolved = min(
+                (start or created) + timedelta(days=rng.randint(1, max_duration)), today,
+            )
+        last = resolved or min(created + timedelta(days=rng.randint(0, 120)), today)
+        planned = (start or created) + timedelta(days=rng.randint(14, max_duration + 30))
+        return {
+            "created": created.isoformat(),
+            "updated": last.isoformat(),
+            "resolution": "Done" if resolved else "",
+            "resolution_date": resolved.isoformat() if resolved else "",
+            "start_date": start.isoformat() if start else "",
+            "planned_done_date": planned.isoformat() if rng.random() < 0.6 else "",
+            "due_date": planned.isoformat() if rng.random() < 0.2 else "",
+        }
+
+    def _record(self, key: str, summary: str, status: str, components: list[str],
+                labels: list[str], max_duration: int) -> dict:
+        assignee = self.rng.choice(ASSIGNEES + ["Sin asignar"])
+        return {
+            "key": key,
+            "summary": summary,
+            "status": status,
+            "status_category": STATUS_CATEGORY.get(status, "En curso"),
+            "assignee": assignee,
+            "assignee_email": (
+                "" if assignee == "Sin asignar"
+                else assignee.replace(" ", ".").lower() + "@example.com"
+            ),
+            "priority": self.rng.choice(["P1", "P2", "P3", "None"]),
+            **self._dates(status, max_duration),
+            "labels": labels,
+            "components": components,
+            "description": f"Descripción sintética de {key}",
+            "url": f"{JIRA_URL}/browse/{key}",
+        }
+
+    def epic(self) -> dict:
+        rng = self.rng
+        doms = self._domains()
+        components = [f"1.{d}" for d in doms]
+        components.append(f"2.{rng.choice(TEAMS)}")
+        components.append(f"3.{rng.choice(SERVICES)}")
+        if rng.random() < 0.3:
+            components.append(f"4.{rng.choice(APPS)}")
+        components.append(f"5.{rng.choice(['Externo', 'Interno'])}")
+        labels = [rng.choice(FREE_TAGS)]
+        if rng.random() < 0.4:
+            labels.append(f"1.{rng.choice(SERVICES)}")
+        key = self._key()
+        for d in doms:
+            self.epics_by_domain[d].append(key)
+        status = self._choice(EPIC_STATUSES)
+        record = self._record(key, f"Épica {key}", status, components, labels, 180)
+        return _ordered(record, "epics")
+
+    def issue(self) -> dict:
+        rng = self.rng
+        doms = self._domains()
+        components = [f"1.{d}" for d in doms]
+        components += [
+            f"3.{s}" for s in dict.fromkeys(rng.choices(SERVICES, k=rng.choice([0, 1, 1, 2])))
+        ]
+        if rng.random() < 0.3:
+            components.append(f"2.{rng.choice(TEAMS)}")
+        labels = [rng.choice(FREE_TAGS)] if rng.random() < 0.2 else []
+        epics = self.epics_by_domain[rng.choice(doms)] if doms else []
+        epic_key = rng.choice(epics) if epics and rng.random() < 0.8 else ""
+        key = self._key()
+        status = self._choice(ISSUE_STATUSES)
+        record = self._record(key, f"Issue {key}", status, components, labels, 60)
+        record["issuetype"] = self._choice(ISSUE_TYPES)
+        record["epic_key"] = epic_key
+        return _ordered(record, "issues")
+
+
+def _ordered(record: dict, dataset: str) -> dict:
+    """Mismo orden de claves que ``clean_issue``/``clean_epic``."""
+    return {k: record[k] for k in DATASETS[dataset]}
+
+
+def generate(
+    n_issues: int, n_domains: int, seed: int = 1, today: date | None = None,
+) -> tuple[list[dict], Iterator[dict]]:
+    """Épicas (lista) e issues (iterador perezoso, épicas incluidas)."""
+    gen = Generator(n_domains, seed, today)
+    n_epics = max(n_domains * 3, n_issues // ISSUES_PER_EPIC)
+    epics = [gen.epic() for _ in range(n_epics)]
+
+    def issues() -> Iterator[dict]:
+        for epic in epics:
+            yield _ordered({**epic, "issuetype": "Épica", "epic_key": ""}, "issues")
+        for _ in range(max(n_issues - n_epics, 0)):
+            yield gen.issue()
+
+    return epics, issues()
+
+
+def write_dataset(
+    data_dir: Path, n_issues: int, n_domains: int, seed: int = 1,
+    today: date | None = None,
+) -> dict[str, int]:
+    """Escribe epics.json y all_issues.json en ``data_dir``; retorna los conteos."""
+    epics, issues = generate(n_issues, n_domains, seed, today)
+    with JsonArrayWriter(data_dir / "epics.json") as out:
+        out.write_all(epics)
+    with JsonArrayWriter(data_dir / "all_issues.json") as out:
+        out.write_all(issues)
+        n_written = out.count
+    return {"epics": len(epics), "issues": n_written}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de CAMDP")
+    parser.add_argument("issues", type=int, help="cantidad de issues (épicas incluidas)")
+    parser.add_argument("--domains", type=int, default=len(REAL_DOMAINS))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--out", type=Path, required=True,
+        help="directorio de salida (no usar data/ salvo a propósito)",
+    )
+    args = parser.parse_args()
+    counts = write_dataset(args.out, args.issues, args.domains, args.seed)
+    print(f"OK {counts['epics']} épicas y {counts['issues']} issues en {args.out}")
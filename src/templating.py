@@ -0,0 +1,94 @@
+"""Entorno Jinja del build, persistente entre builds del mismo proceso.
+
+``environment()`` crea el ``Environment`` una sola vez por proceso (el
+scheduler y los workers de ``--workers`` lo reutilizan en cada build) con:
+
+- caché de bytecode en .build_cache/jinja/: un proceso nuevo no vuelve a
+  parsear ni compilar una plantilla que no cambió;
+- ``auto_reload``: si se edita una plantilla, se recompila sola;
+- plantillas precompiladas opcionales (``python src/build.py
+  --compile-templates``) en .build_cache/compiled/. Se usan mientras
+  coincidan con las fuentes de templates/; si alguna cambió se vuelve al
+  loader normal hasta que se precompilen de nuevo.
+"""
+
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+from jinja2 import (
+    ChoiceLoader,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+TEMPLATE_DIR = ROOT / "templates"
+CACHE_DIR = ROOT / ".build_cache"
+BYTECODE_DIR = CACHE_DIR / "jinja"
+COMPILED_DIR = CACHE_DIR / "compiled"
+MANIFEST_PATH = COMPILED_DIR / "manifest.json"
+
+_env: Environment | None = None
+_env_key: str | None = None
+
+
+def _sources_hash() -> str:
+    """Hash de las plantillas HTML de templates/."""
+    h = hashlib.sha256()
+    for path in sorted(TEMPLATE_DIR.glob("*.html")):
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def _compiled_key() -> str | None:
+    """Hash de las fuentes si las plantillas precompiladas están al día."""
+    try:
+        manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    current = _sources_hash()
+    return current if manifest.get("sources") == current else None
+
+
+def _make_environment(precompiled: bool) -> Environment:
+    source_loader = FileSystemLoader(str(TEMPLATE_DIR))
+    if precompiled:
+        # Las precompiladas no se recargan: cualquier cambio invalida el manifiesto
+        loader = ChoiceLoader([ModuleLoader(str(COMPILED_DIR)), source_loader])
+        return Environment(loader=loader, autoescape=True)
+    BYTECODE_DIR.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=source_loader,
+        autoescape=True,
+        auto_reload=True,
+        bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_DIR)),
+    )
+
+
+def environment() -> Environment:
+    """Entorno Jinja del proceso (se rehace sólo si cambia el modo precompilado)."""
+    global _env, _env_key
+    key = _compiled_key() if COMPILED_DIR.exists() else None
+    if _env is None or key != _env_key:
+        _env, _env_key = _make_environment(key is not None), key
+    return _env
+
+
+def compile_templates() -> Path:
+    """Precompila las plantillas HTML a módulos Python en .build_cache/compiled/."""
+    sources = _sources_hash()
+    shutil.rmtree(COMPILED_DIR, ignore_errors=True)
+    env = _make_environment(precompiled=False)
+    env.compile_templates(
+        str(COMPILED_DIR),
+        filter_func=lambda name: name.endswith(".html"),
+        zip=None,
+        ignore_errors=False,
+    )
+    MANIFEST_PATH.write_text(json.dumps({"sources": sources}), encoding="utf-8")
+    return COMPILED_DIR
@@ -12,6 +12,7 @@ const GANTT_COLORS = { on_track: '#2a8703', extended: '#0053e2', blocked: '#ea11
 // ------------------------------------------------------------------ //
 //  STATE                                                              //
 // ------------------------------------------------------------------ //
+const GANTT_DATA = {};
 const ganttCharts = {};
 const ganttFilters = {};
 const chartInstances = {};
@@ -25,70 +26,36 @@ const $ = (s) => document.querySelector(s);
 const $$ = (s) => document.querySelectorAll(s);
 
 // ------------------------------------------------------------------ //
-//  AGGREGATION                                                        //
+//  FILTER WORKER                                                      //
 // ------------------------------------------------------------------ //
 
-function countBy(items, keyFn) {
-  const m = {};
-  items.forEach(i => { const k = keyFn(i) || 'Sin dato'; m[k] = (m[k] || 0) + 1; });
-  return Object.fromEntries(Object.entries(m).sort((a, b) => b[1] - a[1]));
-}
-
-function avg(arr) { return arr.length ? +(arr.reduce((a, b) => a + b, 0) / arr.length).toFixed(1) : 0; }
-function stddev(arr) {
-  if (arr.length < 2) return 0;
-  const m = avg(arr);
-  return Math.sqrt(arr.reduce((s, v) => s + (v - m) ** 2, 0) / arr.length);
-}
-
-function aggregateIssues(issues) {
-  const serviceDist = countBy(issues, i => i.sv);
-  const statusDist  = countBy(issues, i => i.s);
-
-  // Control chart series sorted by UPDATED (so all points are 2026+)
-  const sorted = [...issues].sort((a, b) => a.u.localeCompare(b.u));
-  const ctPoints = [], ltPoints = [], ctVals = [], ltVals = [];
-  sorted.forEach(i => {
-    if (i.ct != null) { ctPoints.push({ x: i.u, y: i.ct, key: i.k }); ctVals.push(i.ct); }
-    if (i.lt != null) { ltPoints.push({ x: i.u, y: i.lt, key: i.k }); ltVals.push(i.lt); }
-  });
-  const ctMean = avg(ctVals), ltMean = avg(ltVals);
-  const ctStd = stddev(ctVals), ltStd = stddev(ltVals);
-
-  return {
-    service: serviceDist,
-    status: statusDist,
-    cycleTime: {
-      points: ctPoints, mean: ctMean,
-      ucl: +(ctMean + 2 * ctStd).toFixed(1),
-      lcl: +Math.max(ctMean - 2 * ctStd, 0).toFixed(1),
-    },
-    leadTime: {
-      points: ltPoints, mean: ltMean,
-      ucl: +(ltMean + 2 * ltStd).toFixed(1),
-      lcl: +Math.max(ltMean - 2 * ltStd, 0).toFixed(1),
-    },
-  };
-}
+// Los issues viven en dashboard.worker.js (WORKER_JS, index.html): filtra y
+// agrega fuera del hilo de la UI y responde con las series de los gráficos.
+// Sólo se dibuja la respuesta a la última consulta de cada pestaña.
+const filterWorker = new Worker(WORKER_JS);
+const lastQuery = {};
+let queryId = 0;
+let issuesLoaded = null;
+
+filterWorker.onmessage = ({ data }) => {
+  if (data.type === 'issues') {
+    if (data.error) issuesLoaded.reject(new Error(data.error));
+    else issuesLoaded.resolve();
+  } else if (data.type === 'agg' && data.id === lastQuery[data.slug]) {
+    rebuildCharts(data.slug, data.agg);
+  } else if (data.type === 'table') {
+    mountTable(`issueTable-${data.slug}`, 'issues', data.cells, data.rows, issueRow, ISSUE_ROW_PX);
+  }
+};
+filterWorker.onerror = (evt) => issuesLoaded?.reject(new Error(evt.message || 'worker'));
 
 // ------------------------------------------------------------------ //
 //  FILTERING                                                          //
 // ------------------------------------------------------------------ //
 
-function getFilteredIssues(slug) {
-  let issues = ISSUES_DATA[slug] || [];
-  const f = activeFilters[slug];
-  if (f.week && f.week !== 'all') issues = issues.filter(i => i.w === f.week);
-  if (f.epicKey)  issues = issues.filter(i => i.ek === f.epicKey);
-  if (f.service)  issues = issues.filter(i => i.sv === f.service || i.sv.includes(f.service));
-  if (f.status)   issues = issues.filter(i => i.s === f.status);
-  return issues;
-}
-
 function applyFilters(slug) {
-  const issues = getFilteredIssues(slug);
-  const agg = aggregateIssues(issues);
-  rebuildCharts(slug, agg);
+  lastQuery[slug] = ++queryId;
+  filterWorker.postMessage({ type: 'query', id: queryId, slug, filters: activeFilters[slug] });
   updateFilterBadges(slug);
 }
 
@@ -241,15 +208,67 @@ function rebuildCharts(slug, agg) {
 // ------------------------------------------------------------------ //
 
 const builtTabs = {};
+const tabLoads = {};
+let issuesLoad = null;
+
+// DATA_FILES (index.html) da el nombre con hash de cada archivo de datos
+function dataUrl(name) {
+  return DATA_FILES[name].split('/').map(encodeURIComponent).join('/');
+}
+
+function fetchData(name) {
+  return fetch(dataUrl(name)).then(r => { if (!r.ok) throw new Error(`HTTP ${r.status}`); return r.json(); });
+}
+
+// El worker descarga y decodifica data/issues.json una sola vez
+function loadIssues() {
+  issuesLoad ||= new Promise((resolve, reject) => {
+    issuesLoaded = { resolve, reject };
+    filterWorker.postMessage({ type: 'load', url: new URL(dataUrl('issues'), document.baseURI).href });
+  }).catch(err => { issuesLoad = null; throw err; });
+  return issuesLoad;
+}
+
+// Cada pestaña trae su Gantt, sus filas de issues y (dominios) su HTML
+function loadTab(slug) {
+  if (!tabLoads[slug]) {
+    tabLoads[slug] = Promise.all([fetchData(slug), loadIssues()])
+      .then(([payload]) => {
+        GANTT_DATA[slug] = payload.gantt;
+        filterWorker.postMessage({ type: 'rows', slug, rows: payload.rows || null, cube: payload.cube });
+        if (payload.html) $(`#tab-${slug}`).innerHTML = payload.html;
+        if (payload.epics) {
+          mountTable('epicTable-general', 'epics', epicCells(payload.epics), null, epicRow, EPIC_ROW_PX);
+        }
+        if ($(`#issueTable-${slug}`)) filterWorker.postMessage({ type: 'table', slug });
+      })
+      .catch(err => {
+        delete tabLoads[slug];  // se reintenta al volver a abrir la pestaña
+        const msg = document.createElement('p');
+        msg.className = 'tab-status text-sm text-red-600 py-8 text-center';
+        msg.textContent = `No se pudieron cargar los datos (${err.message}). `
+          + 'Abre el sitio desde un servidor HTTP, p. ej. python -m http.server -d docs';
+        const tab = $(`#tab-${slug}`);
+        tab.querySelector('.tab-status')?.remove();
+        tab.prepend(msg);
+        throw err;
+      });
+  }
+  return tabLoads[slug];
+}
 
 function switchTab(slug) {
   $$('.domain-btn').forEach(b => b.classList.toggle('active', b.dataset.tab === slug));
   $$('.tab-content').forEach(d => d.classList.toggle('active', d.id === `tab-${slug}`));
-  if (!builtTabs[slug]) {
-    applyFilters(slug);
-    builtTabs[slug] = true;
-  }
-  if (GANTT_DATA[slug]?.length && !ganttCharts[slug]) buildGantt(slug);
+  loadTab(slug).then(() => {
+    // Si el usuario cambió de pestaña mientras cargaba, se construye al volver
+    if (!$(`#tab-${slug}`).classList.contains('active')) return;
+    if (!builtTabs[slug]) {
+      applyFilters(slug);
+      builtTabs[slug] = true;
+    }
+    if (GANTT_DATA[slug]?.length && !ganttCharts[slug]) buildGantt(slug);
+  }, () => {});
 }
 window.switchTab = switchTab;
 
@@ -257,14 +276,13 @@ window.switchTab = switchTab;
 //  WEEK SLICER                                                        //
 // ------------------------------------------------------------------ //
 
-$$('.week-slicer').forEach(sel => {
-  sel.addEventListener('change', function () {
-    const slug = this.dataset.domain;
-    activeFilters[slug].week = this.value;
-    builtTabs[slug] = false;
-    applyFilters(slug);
-    builtTabs[slug] = true;
-  });
+// Delegado en document: los slicers de dominio llegan después con el HTML
+document.addEventListener('change', (evt) => {
+  const sel = evt.target.closest('.week-slicer');
+  if (!sel) return;
+  const slug = sel.dataset.domain;
+  activeFilters[slug].week = sel.value;
+  applyFilters(slug);  // lastQuery descarta las respuestas de consultas anteriores
 });
 
 // ------------------------------------------------------------------ //
@@ -277,27 +295,207 @@ function setEpicFilter(slug, epicKey) {
 }
 
 // ------------------------------------------------------------------ //
-//  SEARCH                                                             //
+//  TABLES (virtualized)                                               //
 // ------------------------------------------------------------------ //
 
-function setupSearch() {
-  const gi = $('#searchInput-general');
-  if (gi) gi.addEventListener('input', function () {
-    const q = this.value.toLowerCase();
-    $$('#epicTable-general tbody tr').forEach(r => {
-      r.style.display = r.textContent.toLowerCase().includes(q) ? '' : 'none';
-    });
+// Las tablas de issues y de épicas se arman desde los datos, no desde el
+// HTML: en el DOM sólo están las filas visibles (más OVERSCAN arriba y abajo)
+// entre dos filas espaciadoras con el alto del resto. Las filas tienen alto
+// fijo y no cortan línea, así la posición de cada una es n * alto. Los
+// buscadores usan el índice de data/search.json (ver SEARCH).
+const ISSUE_ROW_PX = 33;
+const EPIC_ROW_PX = 37;
+const OVERSCAN = 10;
+const TABLES = {};
+const tableQueries = {};
+
+const ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+const esc = (v) => String(v).replace(/[&<>"']/g, c => ESCAPES[c]);
+
+function statusBadge(status) {
+  const cls = status === 'Listo' ? 'badge-done' : status === 'Blocked' ? 'badge-blocked' : 'badge-wip';
+  return `<span class="badge ${cls}">${esc(status)}</span>`;
+}
+
+function keyLink(key, url, pad) {
+  return `<td class="${pad} pr-3 font-mono text-xs"><a href="${esc(url)}" target="_blank" class="underline" style="color:#0053e2">${esc(key)}</a></td>`;
+}
+
+function issueRow([key, url, type, summary, status, service, assignee, ct, lt]) {
+  return `<tr class="border-t border-gray-100 hover:bg-blue-50 cursor-pointer whitespace-nowrap" style="height:${ISSUE_ROW_PX}px" data-url="${esc(url)}">
+    ${keyLink(key, url, 'py-1.5')}
+    <td class="pr-3 text-xs">${esc(type)}</td>
+    <td class="pr-3 text-xs">${esc(summary)}</td>
+    <td class="pr-3">${statusBadge(status)}</td>
+    <td class="pr-3 text-xs">${esc(service)}</td>
+    <td class="pr-3 text-xs">${esc(assignee)}</td>
+    <td class="pr-3 text-xs text-center">${esc(ct)}</td>
+    <td class="pr-3 text-xs text-center">${esc(lt)}</td>
+  </tr>`;
+}
+
+function epicRow([key, url, summary, status, domain, service, assignee, created]) {
+  return `<tr class="border-t border-gray-100 hover:bg-blue-50 cursor-pointer whitespace-nowrap" style="height:${EPIC_ROW_PX}px" data-url="${esc(url)}">
+    ${keyLink(key, url, 'py-2')}
+    <td class="pr-3 max-w-md truncate" title="${esc(summary)}">${esc(summary)}</td>
+    <td class="pr-3">${statusBadge(status)}</td>
+    <td class="pr-3 text-xs">${esc(domain)}</td>
+    <td class="pr-3 text-xs">${esc(service)}</td>
+    <td class="pr-3 text-xs">${esc(assignee)}</td>
+    <td class="pr-3 text-xs">${esc(created)}</td>
+  </tr>`;
+}
+
+// Tabla de épicas de data/general.json (columnar, ver payload.py)
+function epicCells(table) {
+  const col = (c) => table.columns[c] || table.encoded[c].codes.map(code => table.encoded[c].dict[code]);
+  const [k, su, s, d, sv, a, c, ub] = ['k', 'su', 's', 'd', 'sv', 'a', 'c', 'ub'].map(col);
+  return k.map((key, r) => [key, ub[r] + key, su[r], s[r], d[r] || '-', sv[r] || '-', a[r], c[r]]);
+}
+
+// ``kind`` es la sección del índice de búsqueda ('issues' o 'epics') y
+// ``docs`` el documento de cada fila en esa sección (null = la posición)
+function mountTable(id, kind, cells, docs, render, rowPx) {
+  const table = document.getElementById(id);
+  if (!table) return;
+  const view = table.closest('.table-scroll');
+  const all = cells.map((_, n) => n);
+  const t = TABLES[id] = { table, view, kind, cells, docs, all, render, rowPx, shown: all, first: -1 };
+  view.addEventListener('scroll', () => drawRows(t), { passive: true });
+  searchTable(id, tableQueries[id] || '');
+}
+
+function drawRows(t, force = false) {
+  const { view, shown, rowPx } = t;
+  const first = Math.max(Math.floor(view.scrollTop / rowPx) - OVERSCAN, 0);
+  if (!force && first === t.first) return;
+  t.first = first;
+  // Con la pestaña oculta clientHeight es 0: se dibuja al menos una pantalla
+  const count = Math.ceil((view.clientHeight || 600) / rowPx) + 2 * OVERSCAN;
+  const last = Math.min(first + count, shown.length);
+  let html = `<tr style="height:${first * rowPx}px"></tr>`;
+  for (let n = first; n < last; n++) html += t.render(t.cells[shown[n]]);
+  html += `<tr style="height:${(shown.length - last) * rowPx}px"></tr>`;
+  t.table.tBodies[0].innerHTML = html;
+}
+
+function showRows(t, shown) {
+  t.shown = shown;
+  t.view.scrollTop = 0;
+  drawRows(t, true);
+}
+
+// Posiciones de la tabla cuyos documentos están en ``found`` (ambos ordenados)
+function tablePositions(t, found) {
+  if (!t.docs) return found;
+  const out = [];
+  for (let n = 0, i = 0; n < t.docs.length && i < found.length;) {
+    if (t.docs[n] < found[i]) n++;
+    else if (t.docs[n] > found[i]) i++;
+    else { out.push(n); n++; i++; }
+  }
+  return out;
+}
+
+function searchTable(id, q) {
+  tableQueries[id] = q;
+  const t = TABLES[id];
+  if (!t) return;  // se aplica al montar la tabla
+  if (!queryTerms(q).terms.length) { showRows(t, t.all); return; }
+  loadSearch().then(index => {
+    if (tableQueries[id] !== q) return;  // llegó otra tecla mientras cargaba
+    showRows(t, tablePositions(t, search(index[t.kind], q)));
+  }, () => {});
+}
+
+function setupTables() {
+  document.addEventListener('input', (evt) => {
+    const input = evt.target;
+    const q = input.value ?? '';
+    if (input.id === 'searchInput-general') {
+      searchTable('epicTable-general', q);
+    } else if (input.classList?.contains('domain-search')) {
+      searchTable(input.dataset.table, q);
+    }
   });
-  $$('.domain-search').forEach(input => {
-    input.addEventListener('input', function () {
-      const q = this.value.toLowerCase();
-      $$(`#${this.dataset.table} tbody tr`).forEach(r => {
-        r.style.display = r.textContent.toLowerCase().includes(q) ? '' : 'none';
-      });
-    });
+  // Clic en la fila = abrir el issue (el enlace de la key ya abre solo)
+  document.addEventListener('click', (evt) => {
+    const row = evt.target.closest('.table-scroll tr[data-url]');
+    if (row && !evt.target.closest('a')) window.open(row.dataset.url, '_blank');
   });
 }
-setupSearch();
+setupTables();
+
+// ------------------------------------------------------------------ //
+//  SEARCH                                                             //
+// ------------------------------------------------------------------ //
+
+// Índice invertido de data/search.json (search_index.py): por sección, cada
+// término apunta a sus documentos ordenados y con deltas. Se descarga con la
+// primera búsqueda. Los términos completos se buscan tal cual (una lectura
+// del mapa); el último, si se está escribiendo, como prefijo sobre la lista
+// ordenada de términos. Un documento tiene que tener todos los términos.
+let searchLoad = null;
+
+// Igual que search_index.fold: minúsculas y sin tildes
+const fold = (s) => s.toLowerCase().normalize('NFKD').replace(/[\u0300-\u036f]/g, '');
+
+function queryTerms(q) {
+  const folded = fold(q);
+  return { terms: folded.match(/[a-z0-9]+/g) || [], prefix: /[a-z0-9]$/.test(folded) };
+}
+
+function loadSearch() {
+  searchLoad ||= fetchData('search').then(
+    payload => {
+      const index = {};
+      ['issues', 'epics'].forEach(kind => {
+        index[kind] = { postings: payload[kind], terms: Object.keys(payload[kind]).sort(), decoded: new Map() };
+      });
+      return index;
+    },
+    err => { searchLoad = null; throw err; },
+  );
+  return searchLoad;
+}
+
+function postings(section, term) {
+  let docs = section.decoded.get(term);
+  if (!docs) {
+    const deltas = section.postings[term] || [];
+    docs = new Int32Array(deltas.length);
+    deltas.reduce((doc, d, n) => (docs[n] = doc + d), 0);
+    section.decoded.set(term, docs);
+  }
+  return docs;
+}
+
+// Unión de los documentos de todos los términos que empiezan con ``prefix``
+function prefixPostings(section, prefix) {
+  const { terms } = section;
+  let lo = 0, hi = terms.length;
+  while (lo < hi) { const mid = (lo + hi) >> 1; if (terms[mid] < prefix) lo = mid + 1; else hi = mid; }
+  const lists = [];
+  for (let n = lo; n < terms.length && terms[n].startsWith(prefix); n++) lists.push(postings(section, terms[n]));
+  if (lists.length === 1) return lists[0];
+  return Int32Array.from(new Set(lists.flatMap(l => Array.from(l)))).sort();
+}
+
+function contains(sorted, doc) {
+  let lo = 0, hi = sorted.length;
+  while (lo < hi) { const mid = (lo + hi) >> 1; if (sorted[mid] < doc) lo = mid + 1; else hi = mid; }
+  return sorted[lo] === doc;
+}
+
+// Documentos (ordenados) que tienen todos los términos de ``q``
+function search(section, q) {
+  const { terms, prefix } = queryTerms(q);
+  const lists = terms.map((term, n) =>
+    prefix && n === terms.length - 1 ? prefixPostings(section, term) : postings(section, term));
+  lists.sort((a, b) => a.length - b.length);
+  const [smallest, ...rest] = lists;
+  return Array.from(smallest).filter(doc => rest.every(l => contains(l, doc)));
+}
 
 // ------------------------------------------------------------------ //
 //  GANTT                                                              //
@@ -416,6 +614,4 @@ window.setGanttFilter = setGanttFilter;
 //  INIT                                                               //
 // ------------------------------------------------------------------ //
 
-applyFilters('general');
-builtTabs.general = true;
-if (GANTT_DATA.general?.length) buildGantt('general');
+switchTab('general');
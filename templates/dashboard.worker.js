@@ -0,0 +1,260 @@
+/* =========================================================
+   CAMDP Dashboard — Web Worker de filtros y agregaciones
+   ========================================================= */
+
+// Guarda los issues (data/issues.json, columnar) y el cubo de agregados de
+// cada pestaña (payload.py) una sola vez y responde cada consulta de filtros
+// con las series ya agregadas; el hilo de la UI sólo redibuja los gráficos.
+//
+// Semana, servicio y estado son dimensiones del cubo: los conteos y la
+// media/UCL/LCL salen de sumar las celdas que pasan el filtro, y los puntos
+// de los control charts de las listas de filas de esas celdas. Con filtro de
+// épica (que no es dimensión: crecería con el volumen) se agregan sólo los
+// issues de esa épica.
+//
+// Mensajes que recibe:
+//   { type: 'load', url }                 -> { type: 'issues' } o { type: 'issues', error }
+//   { type: 'rows', slug, rows, cube }    filas (null = todas) y cubo de la pestaña
+//   { type: 'query', id, slug, filters }  -> { type: 'agg', id, slug, agg }
+//   { type: 'table', slug }               -> { type: 'table', slug, cells, rows }
+
+// Columnas de todos los issues. Las columnas codificadas (t, s, a, sv, c, u,
+// w, ek, ub) son códigos enteros a ISSUES.dict[col]; k, su, ct y lt van tal
+// cual.
+let ISSUES = null;
+// slug -> { rows, cube, byUpdated, cellPositions, byEpic } (ver setRows)
+const TABS = {};
+
+function decodeIssues(payload) {
+  const cols = { length: payload.length, dict: {}, rank: {} };
+  Object.entries(payload.columns).forEach(([c, values]) => { cols[c] = values; });
+  Object.entries(payload.encoded).forEach(([c, enc]) => {
+    cols[c] = Int32Array.from(enc.codes);
+    cols.dict[c] = enc.dict;
+  });
+  // Orden de 'updated' precalculado sobre el diccionario (localeCompare)
+  const byU = cols.dict.u.map((_, i) => i).sort((a, b) => cols.dict.u[a].localeCompare(cols.dict.u[b]));
+  cols.rank.u = new Int32Array(byU.length);
+  byU.forEach((code, n) => {
+    const prev = byU[n - 1];
+    cols.rank.u[code] = n && !cols.dict.u[prev].localeCompare(cols.dict.u[code]) ? cols.rank.u[prev] : n;
+  });
+  return cols;
+}
+
+function allRows() { return Int32Array.from({ length: ISSUES.length }, (_, i) => i); }
+
+// Orden estable por 'updated' (a igual fecha, el orden de ``rows``)
+function sortByUpdated(rows) {
+  const { u } = ISSUES, uRank = ISSUES.rank.u;
+  return Array.from(rows).sort((a, b) => uRank[u[a]] - uRank[u[b]]);
+}
+
+function cellKey(w, sv, s) {
+  return (w * ISSUES.dict.sv.length + sv) * ISSUES.dict.s.length + s;
+}
+
+// Una vez por pestaña: las filas ordenadas por 'updated', las posiciones en
+// ese orden de las filas de cada celda del cubo y las filas de cada épica
+function setRows(slug, rows, cube) {
+  rows = rows ? Int32Array.from(rows) : allRows();
+  const { w, sv, s, ek } = ISSUES;
+  const byUpdated = Int32Array.from(sortByUpdated(rows));
+  const cellOf = new Map(cube.n.map((_, c) => [cellKey(cube.w[c], cube.sv[c], cube.s[c]), c]));
+  const positions = cube.n.map(() => []);
+  byUpdated.forEach((r, pos) => positions[cellOf.get(cellKey(w[r], sv[r], s[r]))].push(pos));
+  const byEpic = new Map();
+  rows.forEach(r => {
+    if (!byEpic.has(ek[r])) byEpic.set(ek[r], []);
+    byEpic.get(ek[r]).push(r);
+  });
+  TABS[slug] = {
+    rows, cube, byUpdated, byEpic,
+    cellPositions: positions.map(p => Int32Array.from(p)),
+  };
+}
+
+// ------------------------------------------------------------------ //
+//  FILTERING                                                          //
+// ------------------------------------------------------------------ //
+
+// Los filtros se resuelven una vez sobre el diccionario: código buscado por
+// dimensión (null = sin filtro) y, para servicio, qué códigos coinciden
+function filterCodes(f) {
+  const { dict } = ISSUES;
+  return {
+    w: f.week && f.week !== 'all' ? dict.w.indexOf(f.week) : null,
+    s: f.status ? dict.s.indexOf(f.status) : null,
+    sv: f.service ? dict.sv.map(sv => sv === f.service || sv.includes(f.service)) : null,
+  };
+}
+
+// Celdas del cubo que pasan los filtros de semana, servicio y estado
+function filterCells(cube, codes) {
+  const cells = [];
+  for (let c = 0; c < cube.n.length; c++) {
+    if (codes.w !== null && cube.w[c] !== codes.w) continue;
+    if (codes.s !== null && cube.s[c] !== codes.s) continue;
+    if (codes.sv && !codes.sv[cube.sv[c]]) continue;
+    cells.push(c);
+  }
+  return cells;
+}
+
+// Filas de ``rows`` que pasan los mismos filtros (camino de la épica)
+function filterRows(rows, codes) {
+  const { w, s, sv } = ISSUES;
+  return rows.filter(r =>
+    (codes.w === null || w[r] === codes.w)
+    && (codes.s === null || s[r] === codes.s)
+    && (!codes.sv || codes.sv[sv[r]]));
+}
+
+// ------------------------------------------------------------------ //
+//  AGGREGATION                                                        //
+// ------------------------------------------------------------------ //
+
+// {etiqueta: cantidad} de mayor a menor; a igual cantidad, en orden de
+// primera aparición. ``entries`` es [código, primera posición, cantidad].
+function sortedCounts(col, entries) {
+  const dict = ISSUES.dict[col], m = new Map();
+  entries.forEach(([code, first, n]) => {
+    const k = dict[code] || 'Sin dato';
+    const e = m.get(k);
+    if (e) { e[0] = Math.min(e[0], first); e[1] += n; } else m.set(k, [first, n]);
+  });
+  return Object.fromEntries(
+    [...m].sort((a, b) => a[1][0] - b[1][0]).sort((a, b) => b[1][1] - a[1][1])
+      .map(([k, [, n]]) => [k, n]),
+  );
+}
+
+function countBy(rows, col) {
+  const codes = ISSUES[col], first = new Map();
+  rows.forEach((r, pos) => {
+    const e = first.get(codes[r]);
+    if (e) e[2]++; else first.set(codes[r], [codes[r], pos, 1]);
+  });
+  return sortedCounts(col, [...first.values()]);
+}
+
+function countCells(cube, cells, col) {
+  return sortedCounts(col, cells.map(c => [cube[col][c], cube.first[c], cube.n[c]]));
+}
+
+// Media y límites ±2σ a partir de n, suma y suma de cuadrados (la σ se
+// calcula respecto de la media ya redondeada, como se muestra)
+function controlLimits(points, n, sum, sq) {
+  const mean = n ? +(sum / n).toFixed(1) : 0;
+  const std = n < 2 ? 0 : Math.sqrt(Math.max((sq - 2 * mean * sum + n * mean * mean) / n, 0));
+  return {
+    points, mean,
+    ucl: +(mean + 2 * std).toFixed(1),
+    lcl: +Math.max(mean - 2 * std, 0).toFixed(1),
+  };
+}
+
+// Control chart series sorted by UPDATED (so all points are 2026+)
+function controlSeries(sorted) {
+  const { k, u, ct, lt } = ISSUES;
+  const uDict = ISSUES.dict.u;
+  const series = { ct: [], lt: [] };
+  sorted.forEach(r => {
+    if (ct[r] != null) series.ct.push({ x: uDict[u[r]], y: ct[r], key: k[r] });
+    if (lt[r] != null) series.lt.push({ x: uDict[u[r]], y: lt[r], key: k[r] });
+  });
+  return series;
+}
+
+function sums(points) {
+  let sum = 0, sq = 0;
+  points.forEach(p => { sum += p.y; sq += p.y * p.y; });
+  return [points.length, sum, sq];
+}
+
+// Sin filtro de épica: todo sale de las celdas del cubo
+function aggregateCells(tab, cells) {
+  const { cube } = tab;
+  let positions;
+  if (cells.length === cube.n.length) {
+    positions = null;  // todas las celdas: ya está tab.byUpdated
+  } else {
+    const lists = cells.map(c => tab.cellPositions[c]);
+    positions = new Int32Array(lists.reduce((n, l) => n + l.length, 0));
+    lists.reduce((offset, l) => { positions.set(l, offset); return offset + l.length; }, 0);
+    positions.sort();
+  }
+  const sorted = positions ? Array.from(positions, p => tab.byUpdated[p]) : tab.byUpdated;
+  const series = controlSeries(sorted);
+  const total = (m) => cells.reduce((acc, c) => acc + cube[m][c], 0);
+  return {
+    service: countCells(cube, cells, 'sv'),
+    status: countCells(cube, cells, 's'),
+    cycleTime: controlLimits(series.ct, total('ct_n'), total('ct_sum'), total('ct_sq')),
+    leadTime: controlLimits(series.lt, total('lt_n'), total('lt_sum'), total('lt_sq')),
+  };
+}
+
+// Con filtro de épica: sólo los issues de la épica
+function aggregateRows(rows) {
+  const series = controlSeries(sortByUpdated(rows));
+  return {
+    service: countBy(rows, 'sv'),
+    status: countBy(rows, 's'),
+    cycleTime: controlLimits(series.ct, ...sums(series.ct)),
+    leadTime: controlLimits(series.lt, ...sums(series.lt)),
+  };
+}
+
+function query(tab, f) {
+  const codes = filterCodes(f);
+  if (!f.epicKey) return aggregateCells(tab, filterCells(tab.cube, codes));
+  const rows = tab.byEpic.get(ISSUES.dict.ek.indexOf(f.epicKey)) || [];
+  return aggregateRows(filterRows(rows, codes));
+}
+
+// ------------------------------------------------------------------ //
+//  ISSUE TABLE                                                        //
+// ------------------------------------------------------------------ //
+
+// Celdas de la tabla de issues de una pestaña (key, url, tipo, summary,
+// estado, servicio, assignee, cycle, lead) y la fila de issues.json de cada
+// una, para cruzarla con el índice de búsqueda
+function issueTable(slug) {
+  const { k, su, ct, lt, dict } = ISSUES;
+  const { rows } = TABS[slug];
+  const cells = Array.from(rows, r => [
+    k[r], dict.ub[ISSUES.ub[r]] + k[r], dict.t[ISSUES.t[r]], su[r],
+    dict.s[ISSUES.s[r]], dict.sv[ISSUES.sv[r]] || '-', dict.a[ISSUES.a[r]],
+    ct[r] ?? '-', lt[r] ?? '-',
+  ]);
+  return { cells, rows: Array.from(rows) };
+}
+
+// ------------------------------------------------------------------ //
+//  MESSAGES                                                           //
+// ------------------------------------------------------------------ //
+
+async function load(url) {
+  try {
+    const r = await fetch(url);
+    if (!r.ok) throw new Error(`HTTP ${r.status}`);
+    ISSUES = decodeIssues(await r.json());
+    postMessage({ type: 'issues' });
+  } catch (err) {
+    postMessage({ type: 'issues', error: err.message });
+  }
+}
+
+self.onmessage = ({ data }) => {
+  if (data.type === 'load') {
+    load(data.url);
+  } else if (data.type === 'rows') {
+    setRows(data.slug, data.rows, data.cube);
+  } else if (data.type === 'query') {
+    const agg = query(TABS[data.slug], data.filters);
+    postMessage({ type: 'agg', id: data.id, slug: data.slug, agg });
+  } else if (data.type === 'table') {
+    postMessage({ type: 'table', slug: data.slug, ...issueTable(data.slug) });
+  }
+};